@@ -2,8 +2,17 @@ from pathlib import Path
 
 DB_PATH = str((Path(__file__).resolve().parent / "model" / "outputs" / "predictions.sqlite3"))
 
+FEATURE_CACHE_DIR = str((Path(__file__).resolve().parent / "model" / "cache" / "features"))
+
 ALL_POSITIONS = ["QB", "RB", "WR", "TE"]
 
+TARGET_HORIZONS = {
+    "next1": "fantasy_next_1wk_avg",
+    "next2": "fantasy_next_2wk_avg",
+    "next4": "fantasy_next_4wk_avg",
+    "ros": "fantasy_ros_avg",
+}
+
 SEASONS_TO_EXTRACT = ["2025", "2024", "2023", "2022", "2021", "2020", "2019"]
 
 TEAM_NAME_TO_ABBR = {
@@ -78,7 +87,10 @@ qb_calculated_stats = [
     "fantasy_3wk_avg",
     "fantasy_trend_3v7",
     "fantasy_prev_5wk_avg",
+    "fantasy_next_1wk_avg",
+    "fantasy_next_2wk_avg",
     "fantasy_next_4wk_avg",
+    "fantasy_ros_avg",
 
     "is_rookie",
     "is_second_year",
@@ -105,7 +117,10 @@ rb_calculated_stats = [
     "fantasy_3wk_avg",
     "fantasy_trend_3v7",
     "fantasy_prev_5wk_avg",
+    "fantasy_next_1wk_avg",
+    "fantasy_next_2wk_avg",
     "fantasy_next_4wk_avg",
+    "fantasy_ros_avg",
     "tds_3wk_avg",
     "tds_trend_3v7",
 
@@ -164,7 +179,10 @@ wr_calculated_stats = [
     "fantasy_ppr_3wk_avg",
     "fantasy_ppr_trend_3v7",
     "fantasy_prev_5wk_avg",
+    "fantasy_next_1wk_avg",
+    "fantasy_next_2wk_avg",
     "fantasy_next_4wk_avg",
+    "fantasy_ros_avg",
     "tds_3wk_avg",
     "tds_trend_3v7",
     "gadget_usage_3wk_avg",
@@ -222,7 +240,10 @@ te_calculated_stats = [
     "fantasy_ppr_3wk_avg",
     "fantasy_ppr_trend_3v7",
     "fantasy_prev_5wk_avg",
+    "fantasy_next_1wk_avg",
+    "fantasy_next_2wk_avg",
     "fantasy_next_4wk_avg",
+    "fantasy_ros_avg",
     "tds_3wk_avg",
     "tds_trend_3v7",
     "gadget_usage_3wk_avg",
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+
+def add_forward_targets(df: pd.DataFrame) -> pd.DataFrame:
+    # Forward fantasy averages over the games a player actually plays later in the same season. A horizon is NaN
+    # when no later game falls inside it, so the horizons of a row can be labelled independently of each other.
+    points_by_player = df.groupby(["gsis_id", "season"], sort=False)["fantasy_points"]
+    s1 = points_by_player.shift(-1)
+    s2 = points_by_player.shift(-2)
+    s3 = points_by_player.shift(-3)
+    s4 = points_by_player.shift(-4)
+    sum_2 = s1.fillna(0) + s2.fillna(0)
+    cnt_2 = s1.notna().astype(int) + s2.notna().astype(int)
+    sum_ = sum_2 + s3.fillna(0) + s4.fillna(0)
+    cnt = cnt_2 + s3.notna().astype(int) + s4.notna().astype(int)
+    df["fantasy_next_1wk_avg"] = s1
+    df["fantasy_next_2wk_avg"] = sum_2 / cnt_2.replace(0, np.nan)
+    df["fantasy_next_4wk_avg"] = sum_ / cnt.replace(0, np.nan)
+    points = df["fantasy_points"].fillna(0)
+    season_groups = [df["gsis_id"], df["season"]]
+    played = df["fantasy_points"].notna().astype(int)
+    ros_sum = points.groupby(season_groups, sort=False).transform("sum") - points.groupby(season_groups, sort=False).cumsum()
+    ros_cnt = played.groupby(season_groups, sort=False).transform("sum") - played.groupby(season_groups, sort=False).cumsum()
+    df["fantasy_ros_avg"] = ros_sum / ros_cnt.replace(0, np.nan)
+    return df
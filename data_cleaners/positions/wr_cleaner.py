@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from constants import wr_calculated_stats
+from data_cleaners.positions.targets import add_forward_targets
 
 def _safe_div(numer, denom):
     denom = denom.replace(0, np.nan)
@@ -103,13 +104,7 @@ class WRCleaner:
             .mean()
             .reset_index(level=[0, 1], drop=True)
         )
-        s1 = fantasy_points_col.shift(-1)
-        s2 = fantasy_points_col.shift(-2)
-        s3 = fantasy_points_col.shift(-3)
-        s4 = fantasy_points_col.shift(-4)
-        sum_ = s1.fillna(0) + s2.fillna(0) + s3.fillna(0) + s4.fillna(0)
-        cnt  = s1.notna().astype(int) + s2.notna().astype(int) + s3.notna().astype(int) + s4.notna().astype(int)
-        df_sorted["fantasy_next_4wk_avg"] = sum_ / cnt.replace(0, np.nan)
+        add_forward_targets(df_sorted)
 
         df_sorted["tds_3wk_avg"] = grouped_player_df["total_touchdowns"].rolling(window=3, min_periods=1).mean().reset_index(level=[0, 1], drop=True)
         df_sorted["tds_7wk_avg"] = grouped_player_df["total_touchdowns"].rolling(window=7, min_periods=1).mean().reset_index(level=[0, 1], drop=True)
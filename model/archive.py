@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+# Column kind (as in database.PREDICTION_FIELDS) -> Arrow type.
+ARROW_KINDS = {"text": "string", "int": "int64", "int01": "int64", "float": "float64"}
+ARCHIVE_ROW_GROUP_ROWS = 50_000
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet  # noqa: F401
+
+        return pa
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            "pyarrow is not installed. Install it with `pip install -r model/requirements.txt`."
+        ) from e
+
+
+def archive_available() -> bool:
+    try:
+        _require_pyarrow()
+    except ModuleNotFoundError:
+        return False
+    return True
+
+
+def write_parquet(path: Path, columns: Sequence[tuple[str, str]], chunks: Iterable[Sequence[tuple]]) -> int:
+    # Writes (name, kind) columns from chunks of row tuples and returns the row count. The file only appears at
+    # `path` once it is complete, so a crash mid-write never leaves a truncated archive behind.
+    pa = _require_pyarrow()
+    schema = pa.schema([(name, ARROW_KINDS[kind]) for name, kind in columns])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    rows = 0
+    with pa.parquet.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            arrays = [pa.array(values, field.type) for values, field in zip(zip(*chunk), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=ARCHIVE_ROW_GROUP_ROWS)
+            rows += len(chunk)
+    os.replace(tmp_path, path)
+    return rows
+
+
+def iter_parquet(
+    path: Path,
+    columns: Sequence[str],
+    *,
+    where: tuple[str, Any] | None = None,
+    chunk_size: int,
+) -> Iterator[list[tuple[Any, ...]]]:
+    # Reads `columns` as row tuples a record batch at a time, in file order, keeping the rows whose
+    # `where = (column, value)` matches.
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+
+    read_columns = list(dict.fromkeys([*columns, *([] if where is None else [where[0]])]))
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=read_columns):
+        if where is not None:
+            column, value = where
+            batch = batch.filter(pc.equal(batch.column(column), pa.scalar(value, batch.schema.field(column).type)))
+        if batch.num_rows:
+            yield list(zip(*(batch.column(name).to_pylist() for name in columns)))
+
+
+def read_parquet(path: Path, columns: Sequence[str], *, where: tuple[str, Any] | None = None) -> list[tuple[Any, ...]]:
+    chunks = iter_parquet(path, columns, where=where, chunk_size=ARCHIVE_ROW_GROUP_ROWS)
+    return [row for chunk in chunks for row in chunk]
+
+
+def read_parquet_page(
+    path: Path,
+    columns: Sequence[str],
+    *,
+    equal: Mapping[str, Any] | None = None,
+    isin: Mapping[str, Sequence[Any]] | None = None,
+    ranges: Mapping[str, tuple[float | None, float | None]] | None = None,
+    sort: str,
+    tiebreak: str,
+    descending: bool,
+    after: tuple[Any, Any] | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    # One sorted page of rows as dicts. Filters, the keyset bound (rows strictly after `after = (sort value,
+    # tiebreak value)`), the sort and the limit all run in Arrow: the scan skips row groups the filter rules out and
+    # only the page's rows become Python objects. NULLs sort first ascending and last descending, as in SQLite.
+    _require_pyarrow()
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    conditions = [pc.field(column) == value for column, value in (equal or {}).items()]
+    conditions += [pc.field(column).isin(list(values)) for column, values in (isin or {}).items()]
+    for column, (low, high) in (ranges or {}).items():
+        if low is not None:
+            conditions.append(pc.field(column) >= float(low))
+        if high is not None:
+            conditions.append(pc.field(column) <= float(high))
+    if after is not None:
+        value, tie = after
+        key, tied = pc.field(sort), pc.field(tiebreak)
+        if descending:
+            conditions.append(
+                key.is_null() & (tied < tie)
+                if value is None
+                else (key < value) | ((key == value) & (tied < tie)) | key.is_null()
+            )
+        else:
+            conditions.append(
+                (key.is_null() & (tied > tie)) | key.is_valid()
+                if value is None
+                else (key > value) | ((key == value) & (tied > tie))
+            )
+    condition = None
+    for part in conditions:
+        condition = part if condition is None else condition & part
+
+    table = ds.dataset(path, format="parquet").to_table(columns=list(columns), filter=condition)
+    # Ordering on "has a value" first places the NULLs without null_placement, whose form differs across pyarrow
+    # versions.
+    order = "descending" if descending else "ascending"
+    keyed = table.append_column("__has_value", pc.is_valid(table.column(sort)))
+    indices = pc.sort_indices(keyed, sort_keys=[("__has_value", order), (sort, order), (tiebreak, order)])
+    if limit is not None:
+        indices = indices[:limit]
+    return table.take(indices).to_pylist()
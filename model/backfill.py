@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from constants import DB_PATH
+from model.database import PredictionStore
+from model.gbt_regression import (
+    ScoringEngine,
+    ScoringPipeline,
+    load_final_dataset,
+    load_scoring_pipeline,
+    score_candidates,
+)
+from model.predict import model_metadata
+
+BACKFILL_SOURCE = "backfill"
+
+
+def _parse_positions(value: str) -> list[str]:
+    return [p.strip().upper() for p in value.split(",") if p.strip()]
+
+
+def score_history(
+    pipeline: ScoringPipeline,
+    df: pd.DataFrame,
+    position: str,
+    *,
+    skip: set[tuple[int, int]] | None = None,
+) -> pd.DataFrame:
+    season = pd.to_numeric(df["season"], errors="coerce")
+    week = pd.to_numeric(df["week"], errors="coerce")
+    mask = season.notna() & week.notna()
+    if skip:
+        slices = pd.MultiIndex.from_arrays([season.fillna(-1).astype(int), week.fillna(-1).astype(int)])
+        mask &= ~slices.isin(list(skip))
+    history = df[mask].copy()
+    history["season"] = season[mask].astype(int)
+    history["week"] = week[mask].astype(int)
+    if history.empty:
+        return history
+
+    for name, preds in pipeline.predict_outputs(history).items():
+        history[f"pred_{name}"] = preds
+    return score_candidates(history, position)
+
+
+def backfill_position(
+    store: PredictionStore,
+    position: str,
+    *,
+    data_dir: str | Path,
+    model_dir: str | Path,
+    engine: ScoringEngine = "xgboost",
+    batch_uuid: str | None = None,
+    batch_positions: Sequence[str] | None = None,
+) -> tuple[str | None, dict[str, object]]:
+    pipeline = load_scoring_pipeline(model_dir, position, engine=engine)
+    model_version = pipeline.model_version
+    stored = store.get_stored_slices(position=position, model_version=model_version, source=BACKFILL_SOURCE)
+    scored = score_history(pipeline, load_final_dataset(data_dir, position), position, skip=stored)
+
+    summary: dict[str, object] = {
+        "position": position,
+        "model_version": model_version,
+        "skipped_slices": len(stored),
+        "scored_slices": 0,
+        "rows": int(len(scored)),
+    }
+    if scored.empty:
+        return batch_uuid, summary
+
+    if batch_uuid is None:
+        batch_uuid = store.create_batch(
+            positions=list(batch_positions or [position]),
+            data_dir=str(data_dir),
+            model_dir=str(model_dir),
+            source=BACKFILL_SOURCE,
+        )
+    meta = {**model_metadata(position, pipeline), "backfill": True}
+    # One transaction per slice: an interrupted backfill leaves only complete slices, which the next run skips.
+    for (season, week), rows in scored.groupby(["season", "week"], sort=True):
+        store.save_run(
+            batch_uuid=batch_uuid,
+            position=position,
+            season=int(season),
+            week=int(week),
+            rows=rows,
+            data_dir=str(data_dir),
+            model_dir=str(model_dir),
+            meta=meta,
+            model_version=model_version,
+            source=BACKFILL_SOURCE,
+        )
+        summary["scored_slices"] = int(summary["scored_slices"]) + 1
+    return batch_uuid, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Score every (season, week) slice with the current models and store them as prediction runs."
+    )
+    parser.add_argument("--positions", default="QB,RB,WR,TE", help="Comma-separated: QB,RB,WR,TE")
+    parser.add_argument("--data-dir", default="pipeline_data/final", help="Path to finalized CSVs")
+    parser.add_argument("--model-dir", default="model/artifacts", help="Where models/metadata live")
+    parser.add_argument("--db-path", default=DB_PATH, help="SQLite database to write runs into")
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "numpy", "xgboost"],
+        default="xgboost",
+        help="Scoring engine; xgboost's threaded predictor is fastest for full-history batches",
+    )
+    args = parser.parse_args()
+
+    store = PredictionStore(args.db_path)
+    store.ensure_schema()
+
+    positions = _parse_positions(args.positions)
+    # Resume the batch of a backfill that was interrupted before completing, so its stored slices and the rest of
+    # the history end up in one finished batch instead of an open one that never completes.
+    batch_uuid = store.get_open_batch(source=BACKFILL_SOURCE)
+    if batch_uuid is not None:
+        print(f"Resuming open backfill batch {batch_uuid}")
+    for position in positions:
+        batch_uuid, summary = backfill_position(
+            store,
+            position,
+            data_dir=args.data_dir,
+            model_dir=args.model_dir,
+            engine=args.engine,
+            batch_uuid=batch_uuid,
+            batch_positions=positions,
+        )
+        print(
+            f"[{position}] model={str(summary['model_version'])[:12]} scored {summary['scored_slices']} slices "
+            f"({summary['rows']} rows), skipped {summary['skipped_slices']} already stored"
+        )
+    if batch_uuid is not None:
+        store.complete_batch(batch_uuid)
+
+
+if __name__ == "__main__":
+    main()
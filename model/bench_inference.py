@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from model.gbt_regression import NUMPY_ENGINE_MAX_ROWS, load_final_dataset, load_scoring_pipeline, load_trained_xgb
+
+BATCH_SIZES = [1, 2, 4, 8, 10, 100, 1_000, 10_000]
+
+
+def _parse_positions(value: str) -> list[str]:
+    return [p.strip().upper() for p in value.split(",") if p.strip()]
+
+
+def _best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_position(
+    position: str, *, data_dir: str, model_dir: str, repeats: int, tolerance: float, seed: int
+) -> tuple[float, list[dict[str, object]]]:
+    df = load_final_dataset(data_dir, position)
+    numpy_pipeline = load_scoring_pipeline(model_dir, position, engine="numpy")
+    xgb_pipeline = load_scoring_pipeline(model_dir, position, engine="xgboost")
+    auto_pipeline = load_scoring_pipeline(model_dir, position, engine="auto")
+    model, _ = load_trained_xgb(model_dir, position)
+
+    x_all = numpy_pipeline.preprocessor.transform(df)
+    reference = model.predict(pd.DataFrame(x_all, columns=numpy_pipeline.preprocessor.feature_cols))
+    max_abs_diff = float(np.max(np.abs(numpy_pipeline.predict_matrix(x_all.copy()) - reference)))
+    if max_abs_diff > tolerance:
+        raise AssertionError(f"[{position}] numpy engine diverges from model.predict: max |diff| = {max_abs_diff:.3g}")
+
+    rng = np.random.default_rng(seed)
+    rows: list[dict[str, object]] = []
+    for batch_size in BATCH_SIZES:
+        x = x_all[rng.integers(0, len(x_all), size=batch_size)]
+        frame = pd.DataFrame(x, columns=numpy_pipeline.preprocessor.feature_cols)
+        rows.append(
+            {
+                "pos": position,
+                "batch": batch_size,
+                "xgb_sklearn_ms": 1e3 * _best_of(lambda: model.predict(frame), repeats),
+                "xgb_booster_ms": 1e3 * _best_of(lambda: xgb_pipeline.predict_matrix(x.copy()), repeats),
+                "numpy_ms": 1e3 * _best_of(lambda: numpy_pipeline.predict_matrix(x.copy()), repeats),
+                "auto_ms": 1e3 * _best_of(lambda: auto_pipeline.predict_matrix(x.copy()), repeats),
+            }
+        )
+    return max_abs_diff, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check numpy tree-table parity with model.predict and benchmark scoring latency."
+    )
+    parser.add_argument("--positions", default="QB,RB,WR,TE", help="Comma-separated: QB,RB,WR,TE")
+    parser.add_argument("--data-dir", default="pipeline_data/final", help="Path to finalized CSVs")
+    parser.add_argument("--model-dir", default="model/artifacts", help="Where models/metadata live")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repeats per batch size (best is reported)")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Max allowed |numpy - model.predict|")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rows: list[dict[str, object]] = []
+    for position in _parse_positions(args.positions):
+        try:
+            max_abs_diff, position_rows = bench_position(
+                position,
+                data_dir=args.data_dir,
+                model_dir=args.model_dir,
+                repeats=args.repeats,
+                tolerance=args.tolerance,
+                seed=args.seed,
+            )
+        except AssertionError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        print(f"[{position}] parity ok: max |numpy - model.predict| = {max_abs_diff:.3g}")
+        rows.extend(position_rows)
+
+    frame = pd.DataFrame(rows)
+    print()
+    print(frame.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    # engine="auto" scores below NUMPY_ENGINE_MAX_ROWS rows with NumPy; compare with this machine's crossover.
+    slower = frame[frame["numpy_ms"] > frame["xgb_booster_ms"]]
+    crossover = int(slower["batch"].min()) if not slower.empty else None
+    print(f"\nNumPy engine slower than the booster from {crossover or '-'} rows (auto switches at {NUMPY_ENGINE_MAX_ROWS})")
+
+
+if __name__ == "__main__":
+    main()
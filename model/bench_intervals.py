@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+import constants
+from model.feature_matrix import FeatureMatrixCache
+from model.gbt_regression import (
+    DEFAULT_QUANTILES,
+    PRIMARY_HORIZON,
+    XGBHyperParams,
+    _require_xgboost,
+    fit_booster,
+    load_final_dataset,
+    make_feature_set,
+    resolve_horizons,
+)
+
+
+def _parse_positions(value: str) -> list[str]:
+    return [p.strip().upper() for p in value.split(",") if p.strip()]
+
+
+def _parse_quantiles(value: str) -> list[float]:
+    return sorted(float(q) for q in value.split(",") if q.strip())
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_position(
+    position: str, *, data_dir: str, val_season: int, quantiles: list[float], random_state: int
+) -> dict[str, object]:
+    xgb = _require_xgboost()
+    params = XGBHyperParams()
+    df = load_final_dataset(data_dir, position)
+    feature_cols, _ = make_feature_set(position)
+    horizons = resolve_horizons(df)
+    primary = horizons.index(PRIMARY_HORIZON)
+    cache = FeatureMatrixCache(cache_dir=None)
+
+    def full_run() -> None:
+        split = cache.split(position, df, feature_cols, [constants.TARGET_HORIZONS[h] for h in horizons], val_season)
+        dtrain, dval = cache.quantile_dmatrices(split)
+        fit_booster(params, dtrain, dval, random_state=random_state, label_masks=split.label_masks)
+
+    full_s = _timed(full_run)
+    split = cache.split(position, df, feature_cols, [constants.TARGET_HORIZONS[h] for h in horizons], val_season)
+
+    def shared_intervals() -> None:
+        q_dtrain, q_dval = cache.quantile_dmatrices(split, target=primary)
+        fit_booster(params, q_dtrain, q_dval, random_state=random_state, quantiles=quantiles)
+
+    def separate_intervals() -> None:
+        train_rows, val_rows = split.target_rows(primary)
+        for q in quantiles:
+            dtrain = xgb.QuantileDMatrix(split.x_train[train_rows], label=split.y_train[train_rows, primary])
+            dval = xgb.QuantileDMatrix(split.x_val[val_rows], label=split.y_val[val_rows, primary], ref=dtrain)
+            fit_booster(params, dtrain, dval, random_state=random_state, quantiles=[q])
+
+    shared_s = _timed(shared_intervals)
+    separate_s = _timed(separate_intervals)
+    return {
+        "pos": position,
+        "full_train_s": full_s,
+        "intervals_s": shared_s,
+        "separate_quantiles_s": separate_s,
+        "intervals_per_full_train": shared_s / full_s,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure what training quantile intervals on the shared feature matrix adds to a full training run."
+    )
+    parser.add_argument("--positions", default="QB,RB,WR,TE", help="Comma-separated: QB,RB,WR,TE")
+    parser.add_argument("--data-dir", default="pipeline_data/final", help="Path to finalized CSVs")
+    parser.add_argument("--val-season", type=int, required=True, help="Season to use as validation")
+    parser.add_argument("--quantiles", default=",".join(str(q) for q in DEFAULT_QUANTILES))
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=3.0,
+        help="Fail if interval training costs this many full training runs or more",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rows = [
+        bench_position(
+            position,
+            data_dir=args.data_dir,
+            val_season=args.val_season,
+            quantiles=_parse_quantiles(args.quantiles),
+            random_state=args.seed,
+        )
+        for position in _parse_positions(args.positions)
+    ]
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    worst = float(table["intervals_per_full_train"].max())
+    if worst >= args.max_ratio:
+        print(f"Interval training costs {worst:.2f} full training runs (limit {args.max_ratio}).", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
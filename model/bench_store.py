@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from model.database import PREDICTION_FIELDS, PredictionStore
+
+
+def _parse_sizes(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def synthetic_scored_frame(n_rows: int, *, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    players = rng.integers(0, 2_000, size=n_rows)
+    df = pd.DataFrame(
+        {
+            "team": rng.choice(["KC", "BUF", "SF", "DAL", None], size=n_rows),
+            "position": rng.choice(["QB", "RB", "WR", "TE"], size=n_rows),
+            "full_name": pd.Series(players).map(lambda p: f"Player {p}"),
+            "gsis_id": pd.Series(players).map(lambda p: f"00-{p:07d}"),
+            "season": rng.integers(2015, 2026, size=n_rows),
+            "week": rng.integers(1, 19, size=n_rows),
+            "years_exp": rng.integers(0, 15, size=n_rows).astype(float),
+            "draft_number": rng.integers(1, 260, size=n_rows).astype(float),
+            "is_rookie": rng.random(n_rows) < 0.1,
+            "is_second_year": rng.random(n_rows) < 0.1,
+            "is_undrafted": rng.integers(0, 2, size=n_rows),
+            "percent_rostered": rng.uniform(0, 100, size=n_rows),
+            "fantasy_prev_5wk_avg": rng.normal(10, 5, size=n_rows),
+        }
+    )
+    for col in ["pred_next1", "pred_next2", "pred_next4", "pred_ros", "pred_next4_p10", "pred_next4_p50", "pred_next4_p90"]:
+        df[col] = rng.normal(10, 4, size=n_rows).astype(np.float32)
+    df["delta"] = df["pred_next4"] - df["fantasy_prev_5wk_avg"]
+    for col in ["years_exp", "draft_number", "percent_rostered", "fantasy_prev_5wk_avg"]:
+        df.loc[rng.random(n_rows) < 0.05, col] = np.nan
+    return df
+
+
+def _timed_insert(db_path: Path, rows) -> tuple[float, list[tuple]]:
+    store = PredictionStore(db_path)
+    store.ensure_schema()
+    batch_uuid = store.create_batch(positions=["ALL"])
+    run_uuid = store.create_run(batch_uuid=batch_uuid, position="ALL", season=None, week=None)
+    start = time.perf_counter()
+    if callable(rows):
+        rows = rows()
+    store.save_predictions(run_uuid, batch_uuid, rows)
+    elapsed = time.perf_counter() - start
+    with store._connect() as conn:
+        stored = conn.execute(
+            f"SELECT {', '.join(name for name, _, _ in PREDICTION_FIELDS)} FROM predictions ORDER BY prediction_id"
+        ).fetchall()
+    store.close()
+    return elapsed, [tuple(r) for r in stored]
+
+
+def bench_size(n_rows: int, *, seed: int, check: bool) -> dict[str, object]:
+    df = synthetic_scored_frame(n_rows, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        records_s, records_rows = _timed_insert(Path(tmp) / "records.sqlite3", lambda: df.to_dict(orient="records"))
+        columnar_s, columnar_rows = _timed_insert(Path(tmp) / "columnar.sqlite3", df)
+    if check and records_rows != columnar_rows:
+        raise AssertionError(f"Columnar insert stored different rows than the per-record path at {n_rows} rows.")
+    return {
+        "rows": n_rows,
+        "records_s": records_s,
+        "columnar_s": columnar_s,
+        "speedup": records_s / columnar_s,
+        "columnar_rows_per_s": n_rows / columnar_s,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark PredictionStore.save_predictions: per-record conversion vs the columnar fast path."
+    )
+    parser.add_argument("--sizes", default="10000,1000000", help="Comma-separated row counts")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-check", action="store_true", help="Skip comparing the rows stored by both paths")
+    args = parser.parse_args()
+
+    rows = []
+    for n_rows in _parse_sizes(args.sizes):
+        try:
+            rows.append(bench_size(n_rows, seed=args.seed, check=not args.no_check))
+        except AssertionError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
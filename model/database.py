@@ -1,29 +1,54 @@
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
+import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache, partial, wraps
+from itertools import repeat
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Iterator, Mapping, Sequence
+from typing import Any, Awaitable, Callable, Concatenate, Iterator, Mapping, ParamSpec, Sequence, TypeVar
 from uuid import uuid4
 
+from model.archive import iter_parquet, read_parquet, read_parquet_page, write_parquet
+
+
+CONTRIBUTIONS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS prediction_contributions (
+    prediction_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    feature TEXT NOT NULL,
+    contribution REAL NOT NULL,
+    PRIMARY KEY (prediction_id, rank),
+    FOREIGN KEY (prediction_id) REFERENCES prediction_facts(prediction_id) ON DELETE CASCADE
+) WITHOUT ROWID
+"""
 
 SCHEMA_SQL = """
 PRAGMA foreign_keys = ON;
 
 CREATE TABLE IF NOT EXISTS prediction_batches (
     batch_uuid TEXT PRIMARY KEY,
+    batch_id INTEGER,
     created_at TEXT NOT NULL,
     positions TEXT,
     val_season INTEGER,
     data_dir TEXT,
-    model_dir TEXT
+    model_dir TEXT,
+    source TEXT,
+    completed_at TEXT,
+    pinned INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS prediction_runs (
     run_uuid TEXT PRIMARY KEY,
+    run_id INTEGER,
     batch_uuid TEXT NOT NULL,
     created_at TEXT NOT NULL,
     position TEXT NOT NULL,
@@ -32,39 +57,225 @@ CREATE TABLE IF NOT EXISTS prediction_runs (
     data_dir TEXT,
     model_dir TEXT,
     meta_json TEXT,
+    model_version TEXT,
+    source TEXT,
     FOREIGN KEY (batch_uuid) REFERENCES prediction_batches(batch_uuid) ON DELETE CASCADE
 );
 
-CREATE TABLE IF NOT EXISTS predictions (
-    prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    run_uuid TEXT NOT NULL,
-    batch_uuid TEXT NOT NULL,
-    team TEXT,
-    position TEXT,
-    full_name TEXT,
+-- High-water marks of the integer ids of uuid-keyed tables (batch_id, run_id); see _next_id.
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    team TEXT NOT NULL UNIQUE
+);
+
+-- One row per distinct player profile: a player gets a new row when their team or experience changes.
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    profile_key TEXT NOT NULL UNIQUE,
     gsis_id TEXT,
-    season INTEGER,
-    week INTEGER,
+    full_name TEXT,
+    position TEXT,
+    team_id INTEGER REFERENCES teams(team_id),
     years_exp REAL,
     years_exp_filled REAL,
     draft_number INTEGER,
     draft_number_filled INTEGER,
     is_rookie INTEGER,
     is_second_year INTEGER,
-    is_undrafted INTEGER,
+    is_undrafted INTEGER
+);
+
+-- Predictions keep integer keys and the numeric outputs; the `predictions` view joins the text back in.
+-- `position` stays on the fact so the per-position keyset index can serve filtered batch pages.
+CREATE TABLE IF NOT EXISTS prediction_facts (
+    prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    batch_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    position TEXT,
+    season INTEGER,
+    week INTEGER,
     percent_rostered REAL,
     fantasy_prev_5wk_avg REAL,
     pred_next4 REAL,
+    pred_next1 REAL,
+    pred_next2 REAL,
+    pred_ros REAL,
+    pred_next4_p10 REAL,
+    pred_next4_p50 REAL,
+    pred_next4_p90 REAL,
     delta REAL,
-    FOREIGN KEY (run_uuid) REFERENCES prediction_runs(run_uuid) ON DELETE CASCADE,
-    FOREIGN KEY (batch_uuid) REFERENCES prediction_batches(batch_uuid) ON DELETE CASCADE
+    FOREIGN KEY (run_id) REFERENCES prediction_runs(run_id) ON DELETE CASCADE,
+    FOREIGN KEY (batch_id) REFERENCES prediction_batches(batch_id) ON DELETE CASCADE,
+    FOREIGN KEY (player_id) REFERENCES players(player_id)
+);
+""" + CONTRIBUTIONS_TABLE_SQL + """;
+
+
+-- Newest non-backfill run per position, kept current by every run insert (and rebuilt after deletes), so the
+-- latest-run and top-prediction reads start from a primary-key lookup.
+CREATE TABLE IF NOT EXISTS latest_runs (
+    position TEXT PRIMARY KEY,
+    run_uuid TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (run_uuid) REFERENCES prediction_runs(run_uuid) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Batches moved out by the retention policy: their predictions (and contributions) live in Parquet files
+-- under the store's archive directory, and these rows keep them listable and queryable.
+CREATE TABLE IF NOT EXISTS archived_batches (
+    batch_uuid TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    positions TEXT,
+    val_season INTEGER,
+    data_dir TEXT,
+    model_dir TEXT,
+    source TEXT,
+    completed_at TEXT,
+    archived_at TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    contributions_file_name TEXT,
+    row_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS archived_runs (
+    run_uuid TEXT PRIMARY KEY,
+    batch_uuid TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    position TEXT NOT NULL,
+    season INTEGER,
+    week INTEGER,
+    data_dir TEXT,
+    model_dir TEXT,
+    meta_json TEXT,
+    model_version TEXT,
+    source TEXT,
+    FOREIGN KEY (batch_uuid) REFERENCES archived_batches(batch_uuid) ON DELETE CASCADE
+);
+
+-- Typed copy of each trained run's validation metrics and hyperparameters (meta_json keeps the full record), so
+-- runs can be ranked by quality with an index. Rows outlive archiving, so archived runs stay on the leaderboard.
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_uuid TEXT PRIMARY KEY,
+    batch_uuid TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    position TEXT NOT NULL,
+    model_version TEXT,
+    mae REAL,
+    rmse REAL,
+    r2 REAL,
+    spearman REAL,
+    best_iteration INTEGER,
+    n_estimators INTEGER,
+    learning_rate REAL,
+    max_depth INTEGER,
+    min_child_weight REAL,
+    subsample REAL,
+    colsample_bytree REAL,
+    reg_lambda REAL,
+    reg_alpha REAL,
+    early_stopping_rounds INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS training_jobs (
+    job_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload_json TEXT NOT NULL,
+    progress_json TEXT,
+    batch_uuid TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_predictions_run_uuid ON predictions(run_uuid);
-CREATE INDEX IF NOT EXISTS idx_predictions_position_season_week ON predictions(position, season, week);
 CREATE INDEX IF NOT EXISTS idx_prediction_runs_batch_uuid ON prediction_runs(batch_uuid);
+CREATE INDEX IF NOT EXISTS idx_archived_batches_created_at ON archived_batches(created_at);
+CREATE INDEX IF NOT EXISTS idx_archived_runs_batch_uuid ON archived_runs(batch_uuid);
+CREATE INDEX IF NOT EXISTS idx_archived_runs_created_at ON archived_runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_training_jobs_created_at ON training_jobs(created_at);
 """
 
+# Same columns, in the same order, as the wide `predictions` table this replaced.
+PREDICTIONS_VIEW_SQL = """
+CREATE VIEW IF NOT EXISTS predictions AS
+SELECT
+    f.prediction_id, r.run_uuid, b.batch_uuid, t.team, f.position, p.full_name, p.gsis_id, f.season, f.week,
+    p.years_exp, p.years_exp_filled, p.draft_number, p.draft_number_filled, p.is_rookie, p.is_second_year,
+    p.is_undrafted, f.percent_rostered, f.fantasy_prev_5wk_avg, f.pred_next4, f.pred_next1, f.pred_next2,
+    f.pred_ros, f.pred_next4_p10, f.pred_next4_p50, f.pred_next4_p90, f.delta
+FROM prediction_facts f
+JOIN prediction_runs r ON r.run_id = f.run_id
+JOIN prediction_batches b ON b.batch_id = f.batch_id
+JOIN players p ON p.player_id = f.player_id
+LEFT JOIN teams t ON t.team_id = p.team_id;
+"""
+
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_prediction_runs_position_model_version
+    ON prediction_runs(position, model_version, season, week);
+CREATE INDEX IF NOT EXISTS idx_prediction_facts_batch_pred_next4 ON prediction_facts(batch_id, pred_next4);
+CREATE INDEX IF NOT EXISTS idx_prediction_facts_batch_position_pred_next4
+    ON prediction_facts(batch_id, position, pred_next4);
+CREATE INDEX IF NOT EXISTS idx_prediction_facts_run_pred_next4 ON prediction_facts(run_id, pred_next4);
+CREATE INDEX IF NOT EXISTS idx_prediction_facts_position_season_week ON prediction_facts(position, season, week);
+CREATE INDEX IF NOT EXISTS idx_prediction_facts_player_season_week ON prediction_facts(player_id, season, week);
+CREATE INDEX IF NOT EXISTS idx_players_gsis_id ON players(gsis_id);
+CREATE INDEX IF NOT EXISTS idx_players_full_name ON players(full_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_training_jobs_fingerprint ON training_jobs(fingerprint, status);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_position_mae ON run_metrics(position, mae);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_position_rmse ON run_metrics(position, rmse);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_position_r2 ON run_metrics(position, r2);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_position_spearman ON run_metrics(position, spearman);
+CREATE INDEX IF NOT EXISTS idx_prediction_runs_position_created_at
+    ON prediction_runs(position, created_at, run_uuid) WHERE source IS NOT 'backfill';
+CREATE INDEX IF NOT EXISTS idx_prediction_runs_created_at
+    ON prediction_runs(created_at) WHERE source IS NOT 'backfill';
+CREATE INDEX IF NOT EXISTS idx_prediction_runs_position_season_week_created_at
+    ON prediction_runs(position, season, week, created_at, run_uuid) WHERE source IS NOT 'backfill';
+"""
+
+# Trigram index over player names for /players/search. It is external-content (only the index is stored; the
+# names stay in `players`), and the triggers keep it in step with the player dimension.
+PLAYER_SEARCH_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS player_names USING fts5(
+    full_name, content='players', content_rowid='player_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS players_names_insert AFTER INSERT ON players BEGIN
+    INSERT INTO player_names (rowid, full_name) VALUES (new.player_id, new.full_name);
+END;
+CREATE TRIGGER IF NOT EXISTS players_names_delete AFTER DELETE ON players BEGIN
+    INSERT INTO player_names (player_names, rowid, full_name) VALUES ('delete', old.player_id, old.full_name);
+END;
+CREATE TRIGGER IF NOT EXISTS players_names_update AFTER UPDATE OF full_name ON players BEGIN
+    INSERT INTO player_names (player_names, rowid, full_name) VALUES ('delete', old.player_id, old.full_name);
+    INSERT INTO player_names (rowid, full_name) VALUES (new.player_id, new.full_name);
+END;
+"""
+PLAYER_SEARCH_TRIGGERS = ("players_names_insert", "players_names_delete", "players_names_update")
+# Trigram matching needs at least 3 characters; shorter queries are name prefixes, served by idx_players_full_name.
+PLAYER_SEARCH_MIN_MATCH = 3
+
+SQLITE_CACHE_SIZE_KIB = 64 * 1024
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_BUSY_TIMEOUT_MS = 5000
+SQLITE_CACHED_STATEMENTS = 256
+SQLITE_WORKER_THREADS = min(8, (os.cpu_count() or 1) + 4)
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -129,6 +340,146 @@ def _ensure_columns(conn: sqlite3.Connection, table: str, columns: Mapping[str,
         conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
 
 
+def _ensure_id_column(conn: sqlite3.Connection, table: str, column: str) -> None:
+    # Integer surrogate key for a table keyed by a uuid; existing rows are numbered in insertion order. The
+    # unique index comes first: prediction_facts references the column, and SQLite needs it for any FK check.
+    added = column not in _existing_columns(conn, table)
+    if added:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER")
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})")
+    if added:
+        conn.execute(f"UPDATE {table} SET {column} = rowid")
+
+
+def _next_id(conn: sqlite3.Connection, column: str) -> int:
+    # AUTOINCREMENT semantics for the surrogate keys: the counter only moves forward, so the id of a deleted or
+    # archived batch or run is never handed to a new one. The UPDATE opens the write transaction, so the read
+    # that follows sees this writer's value.
+    conn.execute("UPDATE id_sequences SET value = value + 1 WHERE name = ?", (column,))
+    return int(conn.execute("SELECT value FROM id_sequences WHERE name = ?", (column,)).fetchone()[0])
+
+
+def _seed_id_sequence(conn: sqlite3.Connection, table: str, column: str) -> None:
+    conn.execute(
+        f"INSERT OR IGNORE INTO id_sequences (name, value) SELECT ?, IFNULL(MAX({column}), 0) FROM {table}",
+        (column,),
+    )
+
+
+def _delete_unreferenced_profiles(conn: sqlite3.Connection, player_ids: Sequence[int]) -> None:
+    # Profiles left without a live prediction once a batch is deleted, and teams left without a profile.
+    conn.executemany(
+        """
+        DELETE FROM players
+        WHERE player_id = ? AND NOT EXISTS (SELECT 1 FROM prediction_facts f WHERE f.player_id = players.player_id)
+        """,
+        [(player_id,) for player_id in player_ids],
+    )
+    conn.execute(
+        "DELETE FROM teams WHERE team_id NOT IN (SELECT team_id FROM players WHERE team_id IS NOT NULL)"
+    )
+
+
+def _previous_run(
+    conn: sqlite3.Connection, where: list[str], params: list[Any], *, before: sqlite3.Row | None = None
+) -> sqlite3.Row | None:
+    # The newest run matching `where` (older than `before`, if given), read backwards through one of the
+    # (position, ..., created_at, run_uuid) indexes.
+    if before is not None:
+        where = [*where, "(created_at, run_uuid) < (?, ?)"]
+        params = [*params, before["created_at"], before["run_uuid"]]
+    return conn.execute(
+        f"""
+        SELECT run_uuid, created_at
+        FROM prediction_runs
+        WHERE {" AND ".join(where)}
+        ORDER BY created_at DESC, run_uuid DESC
+        LIMIT 1
+        """,
+        params,
+    ).fetchone()
+
+
+def _object_type(conn: sqlite3.Connection, name: str) -> str | None:
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return None if row is None else str(row[0])
+
+
+@lru_cache(maxsize=1)
+def _has_trigram_search() -> bool:
+    # The trigram tokenizer arrived in SQLite 3.34, and FTS5 itself is a compile-time option.
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(name, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+    return True
+
+
+WIDE_PREDICTION_COLUMNS = {
+    "years_exp": "REAL",
+    "years_exp_filled": "REAL",
+    "draft_number": "INTEGER",
+    "draft_number_filled": "INTEGER",
+    "is_rookie": "INTEGER",
+    "is_second_year": "INTEGER",
+    "is_undrafted": "INTEGER",
+    "percent_rostered": "REAL",
+    "fantasy_prev_5wk_avg": "REAL",
+    "pred_next1": "REAL",
+    "pred_next2": "REAL",
+    "pred_ros": "REAL",
+    "pred_next4_p10": "REAL",
+    "pred_next4_p50": "REAL",
+    "pred_next4_p90": "REAL",
+}
+
+
+def _migrate_wide_predictions(conn: sqlite3.Connection) -> None:
+    # Databases from before the player dimension store every prediction as one wide row. Split them into teams,
+    # players and prediction_facts (keeping prediction ids, so contributions still line up), repoint
+    # prediction_contributions at the facts and drop the wide table so the view can take its name.
+    _ensure_columns(conn, "predictions", WIDE_PREDICTION_COLUMNS)
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.create_function("player_profile_key", len(PLAYER_FIELDS), _profile_key, deterministic=True)
+        conn.execute("INSERT OR IGNORE INTO teams (team) SELECT DISTINCT team FROM predictions WHERE team IS NOT NULL")
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO players (profile_key, {", ".join(PLAYER_COLUMNS)})
+            SELECT player_profile_key({", ".join(f"d.{f}" for f in PLAYER_FIELDS)}),
+                   {", ".join(_player_value_sql(f, f"d.{f}") for f in PLAYER_FIELDS)}
+            FROM (SELECT DISTINCT {", ".join(PLAYER_FIELDS)} FROM predictions) d
+            """
+        )
+        conn.execute(
+            f"""
+            INSERT INTO prediction_facts (prediction_id, run_id, batch_id, player_id, {", ".join(FACT_FIELDS)})
+            SELECT o.prediction_id, r.run_id, b.batch_id, p.player_id, {", ".join(f"o.{f}" for f in FACT_FIELDS)}
+            FROM predictions o
+            JOIN prediction_runs r ON r.run_uuid = o.run_uuid
+            JOIN prediction_batches b ON b.batch_uuid = o.batch_uuid
+            JOIN players p ON p.profile_key = player_profile_key({", ".join(f"o.{f}" for f in PLAYER_FIELDS)})
+            ORDER BY o.prediction_id
+            """
+        )
+        conn.execute("ALTER TABLE prediction_contributions RENAME TO prediction_contributions_wide")
+        conn.execute(CONTRIBUTIONS_TABLE_SQL)
+        conn.execute("INSERT INTO prediction_contributions SELECT * FROM prediction_contributions_wide")
+        conn.execute("DROP TABLE prediction_contributions_wide")
+        conn.execute("DROP TABLE predictions")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
 def _to_int01(value: Any) -> int | None:
     if _is_nullish(value):
         return None
@@ -170,6 +521,466 @@ def _to_int(value: Any) -> int | None:
         return None
 
 
+def _insert_run(
+    conn: sqlite3.Connection,
+    *,
+    batch_uuid: str,
+    position: str,
+    season: int | None,
+    week: int | None,
+    data_dir: str | None,
+    model_dir: str | None,
+    meta: Mapping[str, Any] | None,
+    model_version: str | None,
+    source: str | None,
+) -> str:
+    run_uuid = uuid4().hex
+    conn.execute(
+        """
+        INSERT INTO prediction_runs (
+          run_uuid, run_id, batch_uuid, created_at, position, season, week, data_dir, model_dir, meta_json,
+          model_version, source
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            run_uuid,
+            _next_id(conn, "run_id"),
+            batch_uuid,
+            _utc_now_iso(),
+            position,
+            season,
+            week,
+            data_dir,
+            model_dir,
+            json.dumps(_jsonable(dict(meta or {}))),
+            model_version,
+            source,
+        ),
+    )
+    if source != "backfill":
+        conn.execute(
+            """
+            INSERT INTO latest_runs (position, run_uuid, created_at)
+            SELECT position, run_uuid, created_at FROM prediction_runs WHERE run_uuid = ?
+            ON CONFLICT(position) DO UPDATE SET run_uuid = excluded.run_uuid, created_at = excluded.created_at
+            WHERE excluded.created_at >= latest_runs.created_at
+            """,
+            (run_uuid,),
+        )
+    _insert_run_metrics(conn, "prediction_runs", "run_uuid = ?", (run_uuid,))
+    return run_uuid
+
+
+def _rebuild_latest_runs(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM latest_runs")
+    conn.execute(
+        """
+        INSERT INTO latest_runs (position, run_uuid, created_at)
+        SELECT position, run_uuid, MAX(created_at)
+        FROM prediction_runs
+        WHERE source IS NOT 'backfill'
+        GROUP BY position
+        """
+    )
+
+
+# Leaderboard metrics (from meta_json's validation_metrics) and the order that ranks a run better.
+RUN_METRIC_ORDER = {"mae": "ASC", "rmse": "ASC", "r2": "DESC", "spearman": "DESC"}
+# XGBHyperParams fields, from meta_json's train_params.
+RUN_METRIC_PARAMS = (
+    "n_estimators",
+    "learning_rate",
+    "max_depth",
+    "min_child_weight",
+    "subsample",
+    "colsample_bytree",
+    "reg_lambda",
+    "reg_alpha",
+    "early_stopping_rounds",
+)
+
+
+def _insert_run_metrics(
+    conn: sqlite3.Connection, runs_table: str, where: str = "1", params: Sequence[Any] = ()
+) -> None:
+    # run_metrics rows for the matching runs of `runs_table`, read out of meta_json. Backfill runs re-score an
+    # already trained model, so only the runs that carry their own validation metrics get a row.
+    conn.execute(
+        f"""
+        INSERT OR REPLACE INTO run_metrics (
+          run_uuid, batch_uuid, created_at, position, model_version, {", ".join(RUN_METRIC_ORDER)}, best_iteration,
+          {", ".join(RUN_METRIC_PARAMS)}
+        )
+        SELECT
+          run_uuid, batch_uuid, created_at, position, model_version,
+          {", ".join(f"json_extract(meta_json, '$.validation_metrics.{m}')" for m in RUN_METRIC_ORDER)},
+          json_extract(meta_json, '$.best_iteration'),
+          {", ".join(f"json_extract(meta_json, '$.train_params.{p}')" for p in RUN_METRIC_PARAMS)}
+        FROM {runs_table}
+        WHERE source IS NOT 'backfill'
+          AND json_valid(meta_json)
+          AND json_type(meta_json, '$.validation_metrics') = 'object'
+          AND {where}
+        """,
+        params,
+    )
+
+
+def _to_text(value: Any) -> str | None:
+    return None if _is_nullish(value) else str(value)
+
+
+# (column, converter, source keys): the first source key present in the scored rows feeds the column.
+PREDICTION_FIELDS: list[tuple[str, str, tuple[str, ...]]] = [
+    ("team", "text", ("team",)),
+    ("position", "text", ("position",)),
+    ("full_name", "text", ("full_name",)),
+    ("gsis_id", "text", ("gsis_id",)),
+    ("season", "int", ("season",)),
+    ("week", "int", ("week",)),
+    ("years_exp", "float", ("years_exp_filled", "years_exp")),
+    ("years_exp_filled", "float", ("years_exp_filled",)),
+    ("draft_number", "int", ("draft_number_filled", "draft_number")),
+    ("draft_number_filled", "int", ("draft_number_filled",)),
+    ("is_rookie", "int01", ("is_rookie",)),
+    ("is_second_year", "int01", ("is_second_year",)),
+    ("is_undrafted", "int01", ("is_undrafted",)),
+    ("percent_rostered", "float", ("percent_rostered",)),
+    ("fantasy_prev_5wk_avg", "float", ("fantasy_prev_5wk_avg",)),
+    ("pred_next4", "float", ("pred_next4",)),
+    ("pred_next1", "float", ("pred_next1",)),
+    ("pred_next2", "float", ("pred_next2",)),
+    ("pred_ros", "float", ("pred_ros",)),
+    ("pred_next4_p10", "float", ("pred_next4_p10",)),
+    ("pred_next4_p50", "float", ("pred_next4_p50",)),
+    ("pred_next4_p90", "float", ("pred_next4_p90",)),
+    ("delta", "float", ("delta",)),
+]
+
+# PREDICTION_FIELDS stored once per player profile (`team` as `team_id`) and once per prediction.
+PLAYER_FIELDS = (
+    "gsis_id",
+    "full_name",
+    "position",
+    "team",
+    "years_exp",
+    "years_exp_filled",
+    "draft_number",
+    "draft_number_filled",
+    "is_rookie",
+    "is_second_year",
+    "is_undrafted",
+)
+PLAYER_COLUMNS = tuple("team_id" if f == "team" else f for f in PLAYER_FIELDS)
+FACT_FIELDS = tuple(name for name, _, _ in PREDICTION_FIELDS if name not in PLAYER_FIELDS or name == "position")
+
+_PLAYER_INDEXES = [[name for name, _, _ in PREDICTION_FIELDS].index(f) for f in PLAYER_FIELDS]
+_FACT_INDEXES = [[name for name, _, _ in PREDICTION_FIELDS].index(f) for f in FACT_FIELDS]
+PLAYER_LOOKUP_CHUNK = 500
+
+
+def _player_value_sql(field: str, ref: str) -> str:
+    return f"(SELECT team_id FROM teams WHERE team = {ref})" if field == "team" else ref
+
+
+_PROFILE_KEY_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _profile_key(*values: Any) -> str:
+    # Same text for the same profile whether the values come from Python or from SQLite (REAL stays float).
+    return _PROFILE_KEY_ENCODER.encode(values)
+
+
+INSERT_PLAYER_SQL = f"""
+INSERT OR IGNORE INTO players (profile_key, {", ".join(PLAYER_COLUMNS)})
+VALUES (?, {", ".join(_player_value_sql(f, "?") for f in PLAYER_FIELDS)})
+"""
+
+INSERT_PREDICTIONS_SQL = f"""
+INSERT INTO prediction_facts (run_id, batch_id, player_id, {", ".join(FACT_FIELDS)})
+VALUES (?, ?, ?, {", ".join("?" for _ in FACT_FIELDS)})
+"""
+
+_RECORD_CONVERTERS = {"text": _to_text, "int": _to_int, "float": _to_float, "int01": _to_int01}
+
+
+def _prediction_columns_from_records(records: Sequence[Mapping[str, Any]]) -> list[Sequence[Any]]:
+    columns: list[Sequence[Any]] = []
+    for _, kind, sources in PREDICTION_FIELDS:
+        convert = _RECORD_CONVERTERS[kind]
+        values = []
+        for rec in records:
+            key = next((k for k in sources if k in rec), None)
+            values.append(None if key is None else convert(rec[key]))
+        columns.append(values)
+    return columns
+
+
+def _column_values(series: Any, kind: str) -> Any:
+    import numpy as np
+    import pandas as pd
+
+    if kind == "text":
+        out = series.astype(str).to_numpy(dtype=object)
+        out[series.isna().to_numpy()] = None
+        return out
+
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    if kind == "float":
+        out = values.astype(object)
+        out[np.isnan(values)] = None
+        return out
+
+    out = np.full(len(values), None, dtype=object)
+    valid = np.isfinite(values)
+    if kind == "int01":
+        out[valid] = (values[valid] != 0).astype(np.int64)
+    else:
+        out[valid] = np.trunc(values[valid]).astype(np.int64)
+    return out
+
+
+def _prediction_columns_from_frame(df: Any) -> list[Sequence[Any]]:
+    columns: list[Sequence[Any]] = []
+    for _, kind, sources in PREDICTION_FIELDS:
+        key = next((k for k in sources if k in df.columns), None)
+        columns.append([None] * len(df) if key is None else _column_values(df[key], kind))
+    return columns
+
+
+def _is_frame(rows: Any) -> bool:
+    try:
+        import pandas as pd
+    except ModuleNotFoundError:
+        return False
+    return isinstance(rows, pd.DataFrame)
+
+
+def _lookup_player_ids(conn: sqlite3.Connection, keys: Sequence[str]) -> dict[str, int]:
+    ids: dict[str, int] = {}
+    for start in range(0, len(keys), PLAYER_LOOKUP_CHUNK):
+        chunk = keys[start : start + PLAYER_LOOKUP_CHUNK]
+        ids.update(
+            conn.execute(
+                f"SELECT profile_key, player_id FROM players WHERE profile_key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+        )
+    return ids
+
+
+def _player_ids(conn: sqlite3.Connection, profiles: Sequence[tuple[Any, ...]]) -> list[int]:
+    # Rows whose player, team and experience are unchanged since an earlier run reuse its player_id, so a
+    # weekly run is usually one lookup; only new profiles (and teams) are inserted.
+    keys = {profile: _profile_key(*profile) for profile in dict.fromkeys(profiles)}
+    ids = _lookup_player_ids(conn, list(keys.values()))
+    missing = [(key, *profile) for profile, key in keys.items() if key not in ids]
+    if missing:
+        team_index = 1 + PLAYER_FIELDS.index("team")
+        teams = {row[team_index] for row in missing if row[team_index] is not None}
+        conn.executemany("INSERT OR IGNORE INTO teams (team) VALUES (?)", ((team,) for team in teams))
+        conn.executemany(INSERT_PLAYER_SQL, missing)
+        ids.update(_lookup_player_ids(conn, [row[0] for row in missing]))
+    return [ids[keys[profile]] for profile in profiles]
+
+
+def _insert_predictions(
+    conn: sqlite3.Connection, run_uuid: str, batch_uuid: str, rows: Any, contributions: Any | None = None
+) -> int:
+    run = conn.execute(
+        """
+        SELECT r.run_id, b.batch_id
+        FROM prediction_runs r
+        JOIN prediction_batches b ON b.batch_uuid = ?
+        WHERE r.run_uuid = ?
+        """,
+        (batch_uuid, run_uuid),
+    ).fetchone()
+    if run is None:
+        raise ValueError(f"Unknown run {run_uuid!r} or batch {batch_uuid!r}.")
+
+    columns = _prediction_columns_from_frame(rows) if _is_frame(rows) else _prediction_columns_from_records(
+        _to_records(rows)
+    )
+    player_ids = _player_ids(conn, list(zip(*(columns[i] for i in _PLAYER_INDEXES))))
+    cur = conn.executemany(
+        INSERT_PREDICTIONS_SQL,
+        zip(repeat(run[0]), repeat(run[1]), player_ids, *(columns[i] for i in _FACT_INDEXES)),
+    )
+    inserted = int(cur.rowcount or 0)
+
+    if contributions is not None and inserted:
+        # The write lock is held for the whole transaction, so this batch got consecutive ids.
+        last_id = int(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
+        first_id = last_id - inserted + 1
+        if _is_frame(contributions):
+            contribution_rows = zip(
+                (contributions["row"].to_numpy(dtype="int64") + first_id).tolist(),
+                contributions["rank"].to_numpy(dtype="int64").tolist(),
+                contributions["feature"].astype(str).tolist(),
+                contributions["contribution"].to_numpy(dtype="float64").tolist(),
+            )
+        else:
+            contribution_rows = (
+                (first_id + int(rec["row"]), int(rec["rank"]), str(rec["feature"]), float(rec["contribution"]))
+                for rec in _to_records(contributions)
+            )
+        conn.executemany(
+            """
+            INSERT INTO prediction_contributions (prediction_id, rank, feature, contribution)
+            VALUES (?, ?, ?, ?)
+            """,
+            contribution_rows,
+        )
+    return inserted
+
+
+PREDICTION_LIST_COLUMNS = """
+    prediction_id, team, position, full_name, gsis_id, season, week,
+    years_exp, years_exp_filled, draft_number, draft_number_filled, is_rookie, is_second_year, is_undrafted,
+    percent_rostered, fantasy_prev_5wk_avg, pred_next1, pred_next2, pred_next4, pred_ros,
+    pred_next4_p10, pred_next4_p50, pred_next4_p90, delta
+"""
+
+# Column name and kind (as in PREDICTION_FIELDS) of each exported prediction field.
+PREDICTION_EXPORT_COLUMNS: list[tuple[str, str]] = [
+    ("prediction_id", "int"),
+    *((name, kind) for name, kind, _ in PREDICTION_FIELDS),
+]
+EXPORT_CHUNK_ROWS = 5000
+
+SORTABLE_PREDICTION_COLUMNS = (
+    "pred_next4",
+    "pred_next1",
+    "pred_next2",
+    "pred_ros",
+    "pred_next4_p10",
+    "pred_next4_p50",
+    "pred_next4_p90",
+    "delta",
+    "fantasy_prev_5wk_avg",
+    "percent_rostered",
+)
+
+
+def _encode_cursor(sort: str, direction: str, value: Any, prediction_id: int) -> str:
+    payload = json.dumps([sort, direction, value, int(prediction_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str, direction: str) -> tuple[float | None, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_direction, value, prediction_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as exc:
+        raise ValueError("Malformed pagination cursor.") from exc
+    if (cursor_sort, cursor_direction) != (sort, direction):
+        raise ValueError("Pagination cursor was issued for a different sort order.")
+    if not isinstance(prediction_id, int) or not (value is None or isinstance(value, (int, float))):
+        raise ValueError("Malformed pagination cursor.")
+    return value, prediction_id
+
+
+def _keyset_segments(
+    column: str, direction: str, value: float | None, prediction_id: int
+) -> list[tuple[str, list[Any]]]:
+    # SQLite sorts NULLs first, so they trail a descending scan and lead an ascending one. Each segment is a
+    # single index range; OR-ing them together would force a scan from the start of the batch.
+    if direction == "desc":
+        if value is None:
+            return [(f"{column} IS NULL AND prediction_id < ?", [prediction_id])]
+        return [(f"({column}, prediction_id) < (?, ?)", [value, prediction_id]), (f"{column} IS NULL", [])]
+    if value is None:
+        return [(f"{column} IS NULL AND prediction_id > ?", [prediction_id]), (f"{column} IS NOT NULL", [])]
+    return [(f"({column}, prediction_id) > (?, ?)", [value, prediction_id])]
+
+
+# Archive files hold every exported prediction field plus the run it belongs to, in export order.
+ARCHIVE_COLUMNS: list[tuple[str, str]] = [("run_uuid", "text"), *PREDICTION_EXPORT_COLUMNS]
+ARCHIVE_CONTRIBUTION_COLUMNS: list[tuple[str, str]] = [
+    ("prediction_id", "int"),
+    ("rank", "int"),
+    ("feature", "text"),
+    ("contribution", "float"),
+]
+PREDICTION_LIST_FIELDS = [name.strip() for name in PREDICTION_LIST_COLUMNS.split(",")]
+
+
+def _archived_batch(
+    conn: sqlite3.Connection, *, batch_uuid: str | None = None, run_uuid: str | None = None
+) -> sqlite3.Row | None:
+    if run_uuid is not None:
+        return conn.execute(
+            """
+            SELECT b.batch_uuid, b.file_name, b.contributions_file_name
+            FROM archived_runs r
+            JOIN archived_batches b ON b.batch_uuid = r.batch_uuid
+            WHERE r.run_uuid = ?
+            """,
+            (run_uuid,),
+        ).fetchone()
+    return conn.execute(
+        "SELECT batch_uuid, file_name, contributions_file_name FROM archived_batches WHERE batch_uuid = ?",
+        (batch_uuid,),
+    ).fetchone()
+
+
+def _archived_prediction_rows(
+    path: Path,
+    *,
+    run_uuid: str | None,
+    positions: Sequence[str] | None,
+    ranges: Mapping[str, tuple[float | None, float | None]],
+    sort: str,
+    direction: str,
+    after: tuple[float | None, int] | None,
+    wanted: int | None,
+) -> list[dict[str, Any]]:
+    # The archived counterpart of query_predictions' SQL: same filters, same order (NULLs first ascending, last
+    # descending, ties by prediction_id) and the same keyset cursors, so a batch pages identically before and
+    # after it is archived. Arrow does the filtering, ordering and limit.
+    return read_parquet_page(
+        path,
+        PREDICTION_LIST_FIELDS,
+        equal=None if run_uuid is None else {"run_uuid": run_uuid},
+        isin={"position": list(positions)} if positions else None,
+        ranges=ranges,
+        sort=sort,
+        tiebreak="prediction_id",
+        descending=direction == "desc",
+        after=after,
+        limit=wanted,
+    )
+
+
+def _insert_training_job(conn: sqlite3.Connection, payload: Mapping[str, Any], fingerprint: str) -> str:
+    job_id = uuid4().hex
+    now = _utc_now_iso()
+    conn.execute(
+        """
+        INSERT INTO training_jobs (job_id, created_at, updated_at, status, payload_json, fingerprint)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (job_id, now, now, JOB_QUEUED, json.dumps(_jsonable(dict(payload)), sort_keys=True), fingerprint),
+    )
+    return job_id
+
+
+def _training_job(row: sqlite3.Row) -> dict[str, Any]:
+    job = dict(row)
+    job["payload"] = json.loads(job.pop("payload_json") or "{}")
+    job["progress"] = json.loads(job.pop("progress_json") or "null")
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    return job
+
+
+@dataclass(frozen=True)
+class PredictionPage:
+    rows: list[dict[str, Any]]
+    next_cursor: str | None
+
+
 @dataclass(frozen=True)
 class PredictionRun:
     run_uuid: str
@@ -183,43 +994,118 @@ class PredictionRun:
 
 
 class PredictionStore:
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(self, db_path: str | Path, *, archive_dir: str | Path | None = None) -> None:
         self.db_path = Path(db_path)
+        # Parquet files of batches archived by the retention policy; next to the database unless given.
+        self.archive_dir = Path(archive_dir) if archive_dir is not None else self.db_path.parent / "archive"
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
 
-    @contextmanager
-    def _connect(self) -> Iterator[sqlite3.Connection]:
+    def _open_connection(self, *, shared: bool = True) -> sqlite3.Connection:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KIB};")
+        conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE};")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        if shared:
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread (and per process, so forked workers never share a parent's handle).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _connect(self, *, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
         try:
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON;")
+            if immediate:
+                # Take the write lock up front so bulk writes never fail halfway on a lock upgrade.
+                conn.execute("BEGIN IMMEDIATE")
             yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+        self._local = threading.local()
 
     def ensure_schema(self) -> None:
         with self._connect() as conn:
+            # Incremental auto-vacuum lets retention hand archived batches' pages back without rewriting the
+            # whole file. An existing database only switches over with one full VACUUM, done below.
+            switch_auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0] != SQLITE_AUTO_VACUUM_INCREMENTAL
+            if switch_auto_vacuum:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            backfill_run_metrics = _object_type(conn, "run_metrics") is None
             conn.executescript(SCHEMA_SQL)
+            _ensure_id_column(conn, "prediction_batches", "batch_id")
+            _ensure_id_column(conn, "prediction_runs", "run_id")
+            _seed_id_sequence(conn, "prediction_batches", "batch_id")
+            _seed_id_sequence(conn, "prediction_runs", "run_id")
             _ensure_columns(
                 conn,
-                "predictions",
+                "prediction_batches",
                 {
-                    "years_exp": "REAL",
-                    "years_exp_filled": "REAL",
-                    "draft_number": "INTEGER",
-                    "draft_number_filled": "INTEGER",
-                    "is_rookie": "INTEGER",
-                    "is_second_year": "INTEGER",
-                    "is_undrafted": "INTEGER",
-                    "percent_rostered": "REAL",
-                    "fantasy_prev_5wk_avg": "REAL",
+                    "positions": "TEXT",
+                    "val_season": "INTEGER",
+                    "source": "TEXT",
+                    "pinned": "INTEGER NOT NULL DEFAULT 0",
                 },
             )
-            _ensure_columns(
-                conn, "prediction_batches", {"positions": "TEXT", "val_season": "INTEGER"}
-            )
-
+            if "completed_at" not in _existing_columns(conn, "prediction_batches"):
+                # Batches from before completion was recorded are all finished writing.
+                conn.execute("ALTER TABLE prediction_batches ADD COLUMN completed_at TEXT")
+                conn.execute("UPDATE prediction_batches SET completed_at = created_at")
+            _ensure_columns(conn, "prediction_runs", {"model_version": "TEXT", "source": "TEXT"})
+            _ensure_columns(conn, "training_jobs", {"fingerprint": "TEXT"})
+            if backfill_run_metrics:
+                # Runs recorded before run_metrics existed, archived ones included.
+                _insert_run_metrics(conn, "prediction_runs")
+                _insert_run_metrics(conn, "archived_runs")
+            migrated = _object_type(conn, "predictions") == "table"
+            if migrated:
+                # Before INDEX_SQL, so the fact indexes are built once over the copied rows.
+                _migrate_wide_predictions(conn)
+            conn.executescript(INDEX_SQL + PREDICTIONS_VIEW_SQL)
+            if _has_trigram_search():
+                index_player_names = _object_type(conn, PLAYER_SEARCH_TRIGGERS[0]) is None
+                conn.executescript(PLAYER_SEARCH_SQL)
+                if index_player_names:
+                    # Players stored before the search index existed, or while a SQLite without trigrams ran.
+                    conn.execute("INSERT INTO player_names (player_names) VALUES ('rebuild')")
+            else:
+                # search_players falls back to LIKE; triggers left by a newer SQLite would fail every player write.
+                for trigger in PLAYER_SEARCH_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            _rebuild_latest_runs(conn)
+        if migrated or switch_auto_vacuum:
+            # After a migration the wide table's pages are free; give them back to the filesystem once.
+            self._connection().execute("VACUUM")
 
     def create_run(
         self,
@@ -231,21 +1117,83 @@ class PredictionStore:
         data_dir: str | None = None,
         model_dir: str | None = None,
         meta: Mapping[str, Any] | None = None,
+        model_version: str | None = None,
+        source: str | None = None,
     ) -> str:
-        run_uuid = uuid4().hex
-        created_at = _utc_now_iso()
-        meta_json = json.dumps(_jsonable(dict(meta or {})))
+        with self._connect() as conn:
+            return _insert_run(
+                conn,
+                batch_uuid=batch_uuid,
+                position=position,
+                season=season,
+                week=week,
+                data_dir=data_dir,
+                model_dir=model_dir,
+                meta=meta,
+                model_version=model_version,
+                source=source,
+            )
+
+    def save_run(
+        self,
+        *,
+        batch_uuid: str,
+        position: str,
+        season: int | None,
+        week: int | None,
+        rows: Any,
+        data_dir: str | None = None,
+        model_dir: str | None = None,
+        meta: Mapping[str, Any] | None = None,
+        model_version: str | None = None,
+        source: str | None = None,
+        contributions: Any | None = None,
+    ) -> str:
+        with self._connect(immediate=True) as conn:
+            run_uuid = _insert_run(
+                conn,
+                batch_uuid=batch_uuid,
+                position=position,
+                season=season,
+                week=week,
+                data_dir=data_dir,
+                model_dir=model_dir,
+                meta=meta,
+                model_version=model_version,
+                source=source,
+            )
+            _insert_predictions(conn, run_uuid, batch_uuid, rows, contributions)
+        return run_uuid
 
+    def get_stored_slices(self, *, position: str, model_version: str, source: str) -> set[tuple[int, int]]:
+        # Only runs written by `source` count: a weekly run of the same model does not fill the backfill history.
         with self._connect() as conn:
-            conn.execute(
+            rows = conn.execute(
                 """
-                INSERT INTO prediction_runs (run_uuid, batch_uuid, created_at, position, season, week, data_dir, model_dir, meta_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT DISTINCT season, week
+                FROM prediction_runs
+                WHERE position = ? AND model_version = ? AND source = ? AND season IS NOT NULL AND week IS NOT NULL
                 """,
-                (run_uuid, batch_uuid, created_at, position, season, week, data_dir, model_dir, meta_json),
-            )
-        return run_uuid
-    
+                (position, model_version, source),
+            ).fetchall()
+
+        return {(int(r["season"]), int(r["week"])) for r in rows}
+
+    def get_open_batch(self, *, source: str) -> str | None:
+        # Newest batch from `source` that never reached complete_batch, e.g. a backfill that crashed part-way.
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT batch_uuid
+                FROM prediction_batches
+                WHERE source = ? AND completed_at IS NULL
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                (source,),
+            ).fetchone()
+        return None if row is None else str(row["batch_uuid"])
+
     def create_batch(
         self,
         *,
@@ -253,6 +1201,7 @@ class PredictionStore:
         val_season: int | None = None,
         data_dir: str | None = None,
         model_dir: str | None = None,
+        source: str | None = None,
     ):
         batch_uuid = uuid4().hex
         created_at = _utc_now_iso()
@@ -261,106 +1210,245 @@ class PredictionStore:
         with self._connect() as conn:
             conn.execute(
                 """
-                INSERT INTO prediction_batches (batch_uuid, created_at, positions, val_season, data_dir, model_dir)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO prediction_batches (
+                  batch_uuid, batch_id, created_at, positions, val_season, data_dir, model_dir, source
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (batch_uuid, created_at, positions_json, val_season, data_dir, model_dir),
-            )
-        
-        return batch_uuid
-
-    def save_predictions(
-        self,
-        run_uuid: str,
-        batch_uuid: str,
-        rows: Any,
-        *,
-        payload_cols: Sequence[str] | None = None,
-    ) -> int:
-        records = _to_records(rows)
-
-        to_insert: list[tuple[Any, ...]] = []
-        for rec in records:
-            team = rec.get("team")
-            position = rec.get("position")
-            full_name = rec.get("full_name")
-            gsis_id = rec.get("gsis_id")
-            season = rec.get("season")
-            week = rec.get("week")
-            years_exp = rec.get("years_exp_filled", rec.get("years_exp"))
-            years_exp_filled = rec.get("years_exp_filled")
-            draft_number = rec.get("draft_number_filled", rec.get("draft_number"))
-            draft_number_filled = rec.get("draft_number_filled")
-            is_rookie = rec.get("is_rookie")
-            is_second_year = rec.get("is_second_year")
-            is_undrafted = rec.get("is_undrafted")
-            percent_rostered = rec.get("percent_rostered")
-            fantasy_prev_5wk_avg = rec.get("fantasy_prev_5wk_avg")
-            pred_next4 = rec.get("pred_next4")
-            delta = rec.get("delta")
-
-            to_insert.append(
                 (
-                    run_uuid,
                     batch_uuid,
-                    None if _is_nullish(team) else str(team),
-                    None if _is_nullish(position) else str(position),
-                    None if _is_nullish(full_name) else str(full_name),
-                    None if _is_nullish(gsis_id) else str(gsis_id),
-                    _to_int(season),
-                    _to_int(week),
-                    _to_float(years_exp),
-                    _to_float(years_exp_filled),
-                    _to_int(draft_number),
-                    _to_int(draft_number_filled),
-                    _to_int01(is_rookie),
-                    _to_int01(is_second_year),
-                    _to_int01(is_undrafted),
-                    _to_float(percent_rostered),
-                    _to_float(fantasy_prev_5wk_avg),
-                    _to_float(pred_next4),
-                    _to_float(delta),
-                )
+                    _next_id(conn, "batch_id"),
+                    created_at,
+                    positions_json,
+                    val_season,
+                    data_dir,
+                    model_dir,
+                    source,
+                ),
             )
+        
+        return batch_uuid
 
+    def complete_batch(self, batch_uuid: str) -> None:
+        # Marks the batch (and its runs) as finished writing; from here on its results never change.
         with self._connect() as conn:
-            cur = conn.executemany(
-                """
-                INSERT INTO predictions (
-                  run_uuid, batch_uuid, team, position, full_name, gsis_id, season, week,
-                  years_exp, years_exp_filled, draft_number, draft_number_filled, is_rookie, is_second_year, is_undrafted,
-                  percent_rostered, fantasy_prev_5wk_avg, pred_next4, delta
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?, ?, ?)
-                """,
-                to_insert,
+            conn.execute(
+                "UPDATE prediction_batches SET completed_at = ? WHERE batch_uuid = ? AND completed_at IS NULL",
+                (_utc_now_iso(), batch_uuid),
             )
-            return int(cur.rowcount or 0)
 
-    def get_latest_run(self, *, position: str | None = None) -> PredictionRun | None:
+    def is_batch_complete(self, *, batch_uuid: str | None = None, run_uuid: str | None = None) -> bool:
         with self._connect() as conn:
-            if position:
+            if run_uuid is not None:
                 row = conn.execute(
                     """
-                    SELECT run_uuid, created_at, position, season, week, data_dir, model_dir, meta_json
-                    FROM prediction_runs
-                    WHERE position = ?
-                    ORDER BY created_at DESC
-                    LIMIT 1
+                    SELECT b.completed_at
+                    FROM prediction_runs r
+                    JOIN prediction_batches b ON b.batch_uuid = r.batch_uuid
+                    WHERE r.run_uuid = ?
                     """,
-                    (position,),
+                    (run_uuid,),
                 ).fetchone()
             else:
                 row = conn.execute(
-                    """
-                    SELECT run_uuid, created_at, position, season, week, data_dir, model_dir, meta_json
-                    FROM prediction_runs
+                    "SELECT completed_at FROM prediction_batches WHERE batch_uuid = ?", (batch_uuid,)
+                ).fetchone()
+            if row is None:
+                # Only finished batches are archived.
+                return _archived_batch(conn, batch_uuid=batch_uuid, run_uuid=run_uuid) is not None
+        return row["completed_at"] is not None
+
+    def result_exists(self, *, batch_uuid: str | None = None, run_uuid: str | None = None) -> bool:
+        table, column, key = (
+            ("prediction_runs", "run_uuid", run_uuid)
+            if run_uuid is not None
+            else ("prediction_batches", "batch_uuid", batch_uuid)
+        )
+        with self._connect() as conn:
+            if conn.execute(f"SELECT 1 FROM {table} WHERE {column} = ?", (key,)).fetchone() is not None:
+                return True
+            return _archived_batch(conn, batch_uuid=batch_uuid, run_uuid=run_uuid) is not None
+
+    def pin_batch(self, batch_uuid: str, *, pinned: bool = True) -> bool:
+        # Pinned batches are never archived by the retention policy. Returns False for an unknown (or already
+        # archived) batch.
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE prediction_batches SET pinned = ? WHERE batch_uuid = ?", (int(pinned), batch_uuid)
+            )
+        return cur.rowcount > 0
+
+    def expired_batches(self, *, keep_batches: int | None = None, keep_days: float | None = None) -> list[str]:
+        # A finished batch is kept while it is one of the newest `keep_batches`, or younger than `keep_days`, or
+        # pinned, or holds a position's latest run; the rest have expired, oldest first. Backfill batches are
+        # never expired: they are the stored history of every slice.
+        if keep_batches is None and keep_days is None:
+            raise ValueError("Pass keep_batches and/or keep_days.")
+        cutoff = datetime.now(timezone.utc) - timedelta(days=keep_days or 0)
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT b.batch_uuid
+                FROM prediction_batches b
+                WHERE b.completed_at IS NOT NULL AND b.pinned = 0 AND b.source IS NOT 'backfill'
+                  AND b.created_at < ?
+                  AND b.batch_uuid NOT IN (
+                    SELECT batch_uuid FROM prediction_batches
+                    WHERE source IS NOT 'backfill'
                     ORDER BY created_at DESC
-                    LIMIT 1
+                    LIMIT ?
+                  )
+                  AND NOT EXISTS (
+                    SELECT 1 FROM latest_runs l
+                    JOIN prediction_runs r ON r.run_uuid = l.run_uuid
+                    WHERE r.batch_uuid = b.batch_uuid
+                  )
+                ORDER BY b.created_at
+                """,
+                (cutoff.isoformat(), int(keep_batches or 0)),
+            ).fetchall()
+        return [r["batch_uuid"] for r in rows]
+
+    def archive_batch(self, batch_uuid: str) -> int:
+        # Writes a finished batch's predictions (and contributions) to Parquet under archive_dir, then swaps its
+        # live rows for archive records in one transaction; the files are complete before anything is deleted.
+        # Returns the number of predictions archived.
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT completed_at FROM prediction_batches WHERE batch_uuid = ?", (batch_uuid,)
+            ).fetchone()
+        if row is None or row["completed_at"] is None:
+            raise ValueError(f"Batch {batch_uuid!r} is not a finished live batch.")
+
+        file_name = f"{batch_uuid}.parquet"
+        contributions_file_name: str | None = f"{batch_uuid}.contributions.parquet"
+        conn = self._open_connection(shared=False)
+        conn.row_factory = None
+        try:
+            cur = conn.execute(
+                f"""
+                SELECT {", ".join(name for name, _ in ARCHIVE_COLUMNS)}
+                FROM predictions
+                WHERE batch_uuid = ?
+                ORDER BY pred_next4 DESC, prediction_id DESC
+                """,
+                (batch_uuid,),
+            )
+            row_count = write_parquet(
+                self.archive_dir / file_name, ARCHIVE_COLUMNS, iter(lambda: cur.fetchmany(EXPORT_CHUNK_ROWS), [])
+            )
+            cur = conn.execute(
+                """
+                SELECT c.prediction_id, c.rank, c.feature, c.contribution
+                FROM prediction_batches b
+                JOIN prediction_facts f ON f.batch_id = b.batch_id
+                JOIN prediction_contributions c ON c.prediction_id = f.prediction_id
+                WHERE b.batch_uuid = ?
+                """,
+                (batch_uuid,),
+            )
+            contributions_path = self.archive_dir / contributions_file_name
+            if not write_parquet(
+                contributions_path, ARCHIVE_CONTRIBUTION_COLUMNS, iter(lambda: cur.fetchmany(EXPORT_CHUNK_ROWS), [])
+            ):
+                contributions_path.unlink()
+                contributions_file_name = None
+        finally:
+            conn.close()
+
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                """
+                INSERT INTO archived_batches (
+                  batch_uuid, created_at, positions, val_season, data_dir, model_dir, source, completed_at,
+                  archived_at, file_name, contributions_file_name, row_count
+                )
+                SELECT
+                  batch_uuid, created_at, positions, val_season, data_dir, model_dir, source, completed_at, ?, ?, ?, ?
+                FROM prediction_batches
+                WHERE batch_uuid = ?
+                """,
+                (_utc_now_iso(), file_name, contributions_file_name, row_count, batch_uuid),
+            )
+            conn.execute(
+                """
+                INSERT INTO archived_runs (
+                  run_uuid, batch_uuid, created_at, position, season, week, data_dir, model_dir, meta_json,
+                  model_version, source
+                )
+                SELECT
+                  run_uuid, batch_uuid, created_at, position, season, week, data_dir, model_dir, meta_json,
+                  model_version, source
+                FROM prediction_runs
+                WHERE batch_uuid = ?
+                """,
+                (batch_uuid,),
+            )
+            conn.execute("DELETE FROM prediction_batches WHERE batch_uuid = ?", (batch_uuid,))
+            _rebuild_latest_runs(conn)
+        return row_count
+
+    def apply_retention(self, *, keep_batches: int | None = None, keep_days: float | None = None) -> list[str]:
+        # Archives every expired batch, then returns the freed pages to the filesystem. Returns the archived ids.
+        expired = self.expired_batches(keep_batches=keep_batches, keep_days=keep_days)
+        for batch_uuid in expired:
+            self.archive_batch(batch_uuid)
+        if expired:
+            self.compact()
+        return expired
+
+    def compact(self) -> None:
+        # Incremental vacuum moves the free pages to the end of the file and truncates them; in WAL mode the
+        # file only shrinks once the checkpoint has copied the result back. It frees one page per step, and
+        # execute() only steps once, so it goes through executescript.
+        conn = self._connection()
+        conn.executescript("PRAGMA incremental_vacuum;")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    def delete_batch(self, batch_uuid: str) -> None:
+        with self._connect() as conn:
+            player_ids = [
+                int(row[0])
+                for row in conn.execute(
                     """
-                ).fetchone()
+                    SELECT DISTINCT f.player_id
+                    FROM prediction_batches b
+                    JOIN prediction_facts f ON f.batch_id = b.batch_id
+                    WHERE b.batch_uuid = ?
+                    """,
+                    (batch_uuid,),
+                )
+            ]
+            conn.execute("DELETE FROM run_metrics WHERE batch_uuid = ?", (batch_uuid,))
+            conn.execute("DELETE FROM prediction_batches WHERE batch_uuid = ?", (batch_uuid,))
+            _delete_unreferenced_profiles(conn, player_ids)
+            _rebuild_latest_runs(conn)
+
+    def save_predictions(
+        self,
+        run_uuid: str,
+        batch_uuid: str,
+        rows: Any,
+        *,
+        payload_cols: Sequence[str] | None = None,
+        contributions: Any | None = None,
+    ) -> int:
+        with self._connect(immediate=True) as conn:
+            return _insert_predictions(conn, run_uuid, batch_uuid, rows, contributions)
+
+    def get_latest_run(self, *, position: str | None = None) -> PredictionRun | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT r.run_uuid, r.created_at, r.position, r.season, r.week, r.data_dir, r.model_dir, r.meta_json
+                FROM latest_runs l
+                JOIN prediction_runs r ON r.run_uuid = l.run_uuid
+                {"WHERE l.position = ?" if position else ""}
+                ORDER BY l.created_at DESC
+                LIMIT 1
+                """,
+                (position,) if position else (),
+            ).fetchone()
 
         if row is None:
             return None
@@ -381,53 +1469,236 @@ class PredictionStore:
         )
     
     def get_past_runs_for_history_list(self, *, limit: int = 15):
+        # meta_json stays for existing clients; the typed metrics come from run_metrics.
         with self._connect() as conn:
             rows = conn.execute(
-                """
-                SELECT run_uuid, created_at, position, season, meta_json
-                FROM prediction_runs
-                ORDER BY created_at DESC
-                LIMIT :limit
+                f"""
+                SELECT r.*, {", ".join(f"m.{m}" for m in RUN_METRIC_ORDER)}, m.best_iteration
+                FROM (
+                  SELECT run_uuid, created_at, position, season, meta_json
+                  FROM prediction_runs
+                  WHERE source IS NOT 'backfill'
+                  UNION ALL
+                  SELECT run_uuid, created_at, position, season, meta_json
+                  FROM archived_runs
+                  WHERE source IS NOT 'backfill'
+                  ORDER BY created_at DESC
+                  LIMIT :limit
+                ) r
+                LEFT JOIN run_metrics m ON m.run_uuid = r.run_uuid
+                ORDER BY r.created_at DESC
                 """,
                 {"limit": int(limit)},
             ).fetchall()
 
         return [dict(r) for r in rows]
-        
 
-    def get_predictions(self, *, run_uuid: str, limit: int | None = None) -> list[dict[str, Any]]:
-        limit_sql = "" if limit is None else "LIMIT ?"
-        params: tuple[Any, ...] = (run_uuid,) if limit is None else (run_uuid, int(limit))
+    def get_model_leaderboard(
+        self,
+        *,
+        position: str | None = None,
+        metric: str = "mae",
+        limit: int = 20,
+        best_per_position: bool = False,
+    ) -> list[dict[str, Any]]:
+        # Trained runs (live or archived) ranked by a validation metric, best first, with every metric and
+        # hyperparameter. For one position this walks idx_run_metrics_position_<metric> and stops at `limit`;
+        # `best_per_position` keeps each position's best run in one pass over that index.
+        if metric not in RUN_METRIC_ORDER:
+            raise ValueError(f"Cannot rank runs by {metric!r}.")
+        order = RUN_METRIC_ORDER[metric]
+        where = [f"{metric} IS NOT NULL"]
+        params: list[Any] = []
+        if position is not None:
+            where.append("position = ?")
+            params.append(position)
+        # With GROUP BY, SQLite fills the other columns from the row holding the MIN/MAX.
+        ranked = f"{'MIN' if order == 'ASC' else 'MAX'}({metric}) AS {metric}" if best_per_position else metric
+        columns = [
+            "run_uuid",
+            "batch_uuid",
+            "created_at",
+            "position",
+            "model_version",
+            *(ranked if m == metric else m for m in RUN_METRIC_ORDER),
+            "best_iteration",
+            *RUN_METRIC_PARAMS,
+        ]
+        source_sql = f"SELECT {', '.join(columns)} FROM run_metrics WHERE {' AND '.join(where)}"
+        if best_per_position:
+            source_sql += " GROUP BY position"
 
         with self._connect() as conn:
             rows = conn.execute(
                 f"""
-                SELECT
-                  team, position, full_name, gsis_id, season, week,
-                  years_exp, years_exp_filled, draft_number, draft_number_filled, is_rookie, is_second_year, is_undrafted,
-                  percent_rostered, fantasy_prev_5wk_avg, pred_next4, delta
-                FROM predictions
-                WHERE run_uuid = ?
-                ORDER BY pred_next4 DESC
-                {limit_sql}
+                SELECT * FROM ({source_sql})
+                ORDER BY {metric} {order}, created_at DESC
+                LIMIT ?
                 """,
-                params,
+                [*params, int(limit)],
             ).fetchall()
 
         return [dict(r) for r in rows]
+        
+
+    def query_predictions(
+        self,
+        *,
+        batch_uuid: str | None = None,
+        run_uuid: str | None = None,
+        positions: Sequence[str] | None = None,
+        ranges: Mapping[str, tuple[float | None, float | None]] | None = None,
+        sort: str = "pred_next4",
+        direction: str = "desc",
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> PredictionPage:
+        if (batch_uuid is None) == (run_uuid is None):
+            raise ValueError("Pass exactly one of batch_uuid or run_uuid.")
+        if sort not in SORTABLE_PREDICTION_COLUMNS:
+            raise ValueError(f"Cannot sort predictions by {sort!r}.")
+        direction = direction.lower()
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Sort direction must be 'asc' or 'desc', got {direction!r}.")
+
+        where = ["batch_uuid = ?" if batch_uuid is not None else "run_uuid = ?"]
+        params: list[Any] = [batch_uuid if batch_uuid is not None else run_uuid]
+        if positions:
+            where.append(f"position IN ({', '.join('?' for _ in positions)})")
+            params.extend(positions)
+        for column, (low, high) in (ranges or {}).items():
+            if column not in SORTABLE_PREDICTION_COLUMNS:
+                raise ValueError(f"Cannot filter predictions on {column!r}.")
+            if low is not None:
+                where.append(f"{column} >= ?")
+                params.append(float(low))
+            if high is not None:
+                where.append(f"{column} <= ?")
+                params.append(float(high))
+
+        after = _decode_cursor(cursor, sort, direction) if cursor else None
+        segments: list[tuple[str, list[Any]]] = [("", [])]
+        if after is not None:
+            segments = [
+                (f"AND {clause}", clause_params) for clause, clause_params in _keyset_segments(sort, direction, *after)
+            ]
+
+        # Fetch one extra row to learn whether another page follows.
+        wanted = None if limit is None else int(limit) + 1
+        order = direction.upper()
+        rows: list[Any] = []
+        with self._connect() as conn:
+            archived = _archived_batch(conn, batch_uuid=batch_uuid, run_uuid=run_uuid)
+            for clause, segment_params in segments if archived is None else []:
+                limit_sql, limit_params = ("", []) if wanted is None else ("LIMIT ?", [wanted - len(rows)])
+                rows.extend(
+                    conn.execute(
+                        f"""
+                        SELECT {PREDICTION_LIST_COLUMNS}
+                        FROM predictions
+                        WHERE {" AND ".join(where)} {clause}
+                        ORDER BY {sort} {order}, prediction_id {order}
+                        {limit_sql}
+                        """,
+                        [*params, *segment_params, *limit_params],
+                    ).fetchall()
+                )
+                if wanted is not None and len(rows) >= wanted:
+                    break
+        if archived is not None:
+            rows = _archived_prediction_rows(
+                self.archive_dir / archived["file_name"],
+                run_uuid=run_uuid,
+                positions=positions,
+                ranges=ranges or {},
+                sort=sort,
+                direction=direction,
+                after=after,
+                wanted=wanted,
+            )
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(sort, direction, last[sort], last["prediction_id"])
+        return PredictionPage(rows=[dict(r) for r in rows], next_cursor=next_cursor)
+
+    def get_predictions(self, *, run_uuid: str, limit: int | None = None) -> list[dict[str, Any]]:
+        return self.query_predictions(run_uuid=run_uuid, limit=limit).rows
     
+    def iter_prediction_chunks(
+        self,
+        *,
+        batch_uuids: Sequence[str] = (),
+        run_uuid: str | None = None,
+        chunk_size: int = EXPORT_CHUNK_ROWS,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        # Streams PREDICTION_EXPORT_COLUMNS tuples a chunk at a time, so an export of any size holds one chunk in
+        # memory. Each batch (or the run) is read in index order, pred_next4 descending, with no sort step. Every
+        # chunk is its own keyset query that runs to completion, so no read transaction stays open while the
+        # client downloads and the WAL can checkpoint; finished batches never change, so the chunks still add up
+        # to one consistent copy. The generator keeps its own connection and may be resumed from any thread.
+        # Archived batches stream from their Parquet file, which was written in the same order.
+        scopes = [("run_uuid", run_uuid)] if run_uuid is not None else [("batch_uuid", b) for b in batch_uuids]
+        names = [name for name, _ in PREDICTION_EXPORT_COLUMNS]
+        sort_index, id_index = names.index("pred_next4"), names.index("prediction_id")
+        conn = self._open_connection(shared=False)
+        conn.row_factory = None
+        try:
+            for column, key in scopes:
+                archived = _archived_batch(conn, **{column: key})
+                if archived is not None:
+                    yield from iter_parquet(
+                        self.archive_dir / archived[1],
+                        names,
+                        where=(column, key) if column == "run_uuid" else None,
+                        chunk_size=chunk_size,
+                    )
+                    continue
+                after: tuple[float | None, int] | None = None
+                while True:
+                    segments = [("", [])]
+                    if after is not None:
+                        segments = [(f"AND {c}", p) for c, p in _keyset_segments("pred_next4", "desc", *after)]
+                    chunk: list[tuple[Any, ...]] = []
+                    for clause, params in segments:
+                        chunk.extend(
+                            conn.execute(
+                                f"""
+                                SELECT {", ".join(names)}
+                                FROM predictions
+                                WHERE {column} = ? {clause}
+                                ORDER BY pred_next4 DESC, prediction_id DESC
+                                LIMIT ?
+                                """,
+                                (key, *params, chunk_size - len(chunk)),
+                            ).fetchall()
+                        )
+                        if len(chunk) >= chunk_size:
+                            break
+                    if chunk:
+                        yield chunk
+                    if len(chunk) < chunk_size:
+                        break
+                    after = (chunk[-1][sort_index], chunk[-1][id_index])
+        finally:
+            conn.close()
+
     def get_past_batch_predictions(self, limit: int = 30) -> list[dict[str, Any]]:
         with self._connect() as conn:
             rows = conn.execute(
                 """
                 SELECT 
-                    team, position, full_name, gsis_id, season, week,
+                    prediction_id, team, position, full_name, gsis_id, season, week,
                     years_exp, years_exp_filled, draft_number, draft_number_filled, is_rookie, is_second_year, is_undrafted,
-                    percent_rostered, fantasy_prev_5wk_avg, pred_next4, delta
+                    percent_rostered, fantasy_prev_5wk_avg, pred_next1, pred_next2, pred_next4, pred_ros,
+                    pred_next4_p10, pred_next4_p50, pred_next4_p90, delta
                 FROM predictions p
                 WHERE batch_uuid IN (
                     SELECT batch_uuid
                     FROM prediction_batches
+                    WHERE source IS NOT 'backfill'
                     ORDER BY created_at DESC
                     LIMIT ?
                     )
@@ -443,8 +1714,14 @@ class PredictionStore:
             rows = conn.execute(
                 """
                 SELECT
-                    batch_uuid, created_at, positions, val_season, data_dir, model_dir
+                    batch_uuid, created_at, positions, val_season, data_dir, model_dir, pinned, 0 AS archived
                 FROM prediction_batches
+                WHERE source IS NOT 'backfill'
+                UNION ALL
+                SELECT
+                    batch_uuid, created_at, positions, val_season, data_dir, model_dir, 0 AS pinned, 1 AS archived
+                FROM archived_batches
+                WHERE source IS NOT 'backfill'
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
@@ -454,21 +1731,7 @@ class PredictionStore:
         return [dict(r) for r in rows]
 
     def get_batch_prediction(self, batch_uuid: str) -> list[dict[str, Any]]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT 
-                    team, position, full_name, gsis_id, season, week,
-                    years_exp, years_exp_filled, draft_number, draft_number_filled, is_rookie, is_second_year, is_undrafted,
-                    percent_rostered, fantasy_prev_5wk_avg, pred_next4, delta
-                FROM predictions p
-                WHERE batch_uuid = ?
-                ORDER BY pred_next4 DESC
-                """,
-                (batch_uuid,),
-            ).fetchall()
-
-            return [dict(r) for r in rows]
+        return self.query_predictions(batch_uuid=batch_uuid).rows
 
     def get_top_predictions(
         self,
@@ -478,30 +1741,469 @@ class PredictionStore:
         week: int | None = None,
         limit: int = 25,
     ) -> list[dict[str, Any]]:
+        # Newest run first, best pred_next4 first within a run. Starts at the position's latest_runs entry and
+        # reads each run top-down through (run_uuid, pred_next4), stepping back to the previous run only while
+        # fewer than `limit` rows have been found, so the cost follows `limit`, not the number of stored runs.
+        # A season/week filter is applied to the runs as well, so each step lands on a run of that slice.
+        where = ["p.run_uuid = ?", "p.position = ?"]
+        params: list[Any] = [position]
+        run_where = ["position = ?", "source IS NOT 'backfill'"]
+        run_params: list[Any] = [position]
+        for column, value in (("season", season), ("week", week)):
+            if value is not None:
+                where.append(f"p.{column} = ?")
+                params.append(int(value))
+                run_where.append(f"{column} = ?")
+                run_params.append(int(value))
+
+        rows: list[sqlite3.Row] = []
+        with self._connect() as conn:
+            if season is None and week is None:
+                run = conn.execute(
+                    "SELECT run_uuid, created_at FROM latest_runs WHERE position = ?", (position,)
+                ).fetchone()
+            else:
+                run = _previous_run(conn, run_where, run_params)
+            while run is not None and len(rows) < limit:
+                rows.extend(
+                    conn.execute(
+                        f"""
+                        SELECT
+                          ? AS created_at, p.run_uuid,
+                          p.prediction_id, p.team, p.position, p.full_name, p.gsis_id, p.season, p.week,
+                          p.years_exp, p.draft_number, p.is_rookie, p.is_second_year, p.is_undrafted,
+                          p.percent_rostered, p.pred_next1, p.pred_next2, p.pred_next4, p.pred_ros,
+                          p.pred_next4_p10, p.pred_next4_p50, p.pred_next4_p90, p.delta
+                        FROM predictions p
+                        WHERE {" AND ".join(where)}
+                        ORDER BY p.pred_next4 DESC
+                        LIMIT ?
+                        """,
+                        (run["created_at"], run["run_uuid"], *params, int(limit) - len(rows)),
+                    ).fetchall()
+                )
+                if len(rows) >= limit:
+                    break
+                run = _previous_run(conn, run_where, run_params, before=run)
+
+        return [dict(r) for r in rows]
+
+    def get_player_history(
+        self,
+        gsis_id: str,
+        *,
+        season: int | None = None,
+        include_backfill: bool = True,
+        max_points: int | None = None,
+    ) -> list[dict[str, Any]]:
+        # One player's predictions across every live run, oldest slice first (runs of the same slice by creation
+        # time). The player's profile rows come from idx_players_gsis_id and their facts from
+        # (player_id, season, week), so the cost follows the player's history, not the table. With `max_points`,
+        # a longer series is thinned to every k-th point counted back from the newest, which is always kept.
+        where = ["p.gsis_id = ?"]
+        params: list[Any] = [gsis_id]
+        if season is not None:
+            where.append("f.season = ?")
+            params.append(int(season))
+        if not include_backfill:
+            where.append("r.source IS NOT 'backfill'")
+        stride_sql = "1" if max_points is None else "((total + ? - 1) / ?)"
+        stride_params = [] if max_points is None else [int(max_points)] * 2
+
         with self._connect() as conn:
-            where = ["p.position = ?"]
-            params: list[Any] = [position]
-            if season is not None:
-                where.append("p.season = ?")
-                params.append(int(season))
-            if week is not None:
-                where.append("p.week = ?")
-                params.append(int(week))
+            rows = conn.execute(
+                f"""
+                SELECT
+                  prediction_id, run_uuid, batch_uuid, created_at, source, team, position, season, week,
+                  pred_next1, pred_next2, pred_next4, pred_ros, pred_next4_p10, pred_next4_p50, pred_next4_p90, delta
+                FROM (
+                  SELECT
+                    f.prediction_id, r.run_uuid, b.batch_uuid, r.created_at, r.source, t.team, f.position, f.season,
+                    f.week, f.pred_next1, f.pred_next2, f.pred_next4, f.pred_ros, f.pred_next4_p10, f.pred_next4_p50,
+                    f.pred_next4_p90, f.delta,
+                    ROW_NUMBER() OVER (ORDER BY f.season, f.week, r.created_at, f.prediction_id) AS n,
+                    COUNT(*) OVER () AS total
+                  FROM players p
+                  JOIN prediction_facts f ON f.player_id = p.player_id
+                  JOIN prediction_runs r ON r.run_id = f.run_id
+                  JOIN prediction_batches b ON b.batch_id = f.batch_id
+                  LEFT JOIN teams t ON t.team_id = p.team_id
+                  WHERE {" AND ".join(where)}
+                )
+                WHERE (total - n) % {stride_sql} = 0
+                ORDER BY n
+                """,
+                [*params, *stride_params],
+            ).fetchall()
+
+        return [dict(r) for r in rows]
 
+    def search_players(
+        self,
+        q: str,
+        *,
+        positions: Sequence[str] | None = None,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        # Players whose name contains `q` (case-insensitive), names starting with it first, each with their
+        # latest prediction: the newest (season, week) slice, newest run first. Matches come from the player_names
+        # trigram index and each player's latest fact from (player_id, season, week), so neither the name lookup
+        # nor the prediction lookup scans a table. Players whose predictions are all archived have no prediction.
+        # Without trigram support, longer queries scan the names with LIKE instead.
+        q = " ".join(q.split()).replace("%", "").replace("_", "")
+        if not q:
+            return []
+        if len(q) >= PLAYER_SEARCH_MIN_MATCH and _has_trigram_search():
+            from_sql = "player_names JOIN players p ON p.player_id = player_names.rowid"
+            where, params = ["player_names MATCH ?"], ['"' + q.replace('"', '""') + '"']
+        elif len(q) >= PLAYER_SEARCH_MIN_MATCH:
+            from_sql = "players p"
+            where, params = ["p.full_name LIKE ?"], ["%" + q + "%"]
+        else:
+            from_sql = "players p"
+            where, params = ["p.full_name LIKE ?"], [q + "%"]
+        where.append("p.gsis_id IS NOT NULL")
+        if positions:
+            where.append(f"p.position IN ({', '.join('?' for _ in positions)})")
+            params.extend(positions)
+
+        with self._connect() as conn:
             rows = conn.execute(
                 f"""
+                WITH matches AS (
+                  SELECT p.gsis_id, MAX(p.full_name LIKE ? || '%') AS prefix, MIN(p.full_name) AS full_name
+                  FROM {from_sql}
+                  WHERE {" AND ".join(where)}
+                  GROUP BY p.gsis_id
+                  ORDER BY prefix DESC, full_name, p.gsis_id
+                  LIMIT ?
+                )
                 SELECT
-                  r.created_at, r.run_uuid,
-                  p.team, p.position, p.full_name, p.gsis_id, p.season, p.week,
-                  p.years_exp, p.draft_number, p.is_rookie, p.is_second_year, p.is_undrafted, p.percent_rostered,
-                  p.pred_next4, p.delta
+                  m.gsis_id, COALESCE(p.full_name, m.full_name) AS full_name, p.position, t.team, r.run_uuid,
+                  b.batch_uuid, r.created_at, f.season, f.week, f.pred_next1, f.pred_next2, f.pred_next4, f.pred_ros,
+                  f.pred_next4_p10, f.pred_next4_p50, f.pred_next4_p90, f.delta
+                FROM matches m
+                LEFT JOIN prediction_facts f ON f.prediction_id = (
+                  SELECT lf.prediction_id
+                  FROM players lp
+                  JOIN prediction_facts lf ON lf.player_id = lp.player_id
+                  WHERE lp.gsis_id = m.gsis_id
+                  ORDER BY lf.season DESC, lf.week DESC, lf.prediction_id DESC
+                  LIMIT 1
+                )
+                LEFT JOIN players p ON p.player_id = f.player_id
+                LEFT JOIN teams t ON t.team_id = p.team_id
+                LEFT JOIN prediction_runs r ON r.run_id = f.run_id
+                LEFT JOIN prediction_batches b ON b.batch_id = f.batch_id
+                ORDER BY m.prefix DESC, m.full_name, m.gsis_id
+                """,
+                [q, *params, int(limit)],
+            ).fetchall()
+
+        return [dict(r) for r in rows]
+
+    def _load_diff_side(self, conn: sqlite3.Connection, batch_uuid: str, table: str) -> None:
+        # One batch's rows for diff_batches, from the live tables or the batch's archive. A backfill or multi-week
+        # batch holds a player once per (season, week); the upsert keeps each (gsis_id, position)'s newest slice.
+        columns = ["gsis_id", "position", "season", "week", "prediction_id", "full_name", "team", "pred_next4", "delta"]
+        conn.execute(f"CREATE TEMP TABLE {table} ({', '.join(columns)}, PRIMARY KEY (gsis_id, position))")
+        upsert = f"""
+            ON CONFLICT (gsis_id, position) DO UPDATE SET {", ".join(f"{c} = excluded.{c}" for c in columns[2:])}
+            WHERE (excluded.season, excluded.week, excluded.prediction_id) > (season, week, prediction_id)
+        """
+        archived = _archived_batch(conn, batch_uuid=batch_uuid)
+        if archived is not None:
+            conn.executemany(
+                f"INSERT INTO temp.{table} VALUES ({', '.join('?' for _ in columns)}) {upsert}",
+                read_parquet(self.archive_dir / archived["file_name"], columns),
+            )
+            return
+        conn.execute(
+            f"""
+            INSERT INTO temp.{table}
+            SELECT p.gsis_id, f.position, f.season, f.week, f.prediction_id, p.full_name, t.team, f.pred_next4, f.delta
+            FROM prediction_batches bt
+            JOIN prediction_facts f ON f.batch_id = bt.batch_id
+            JOIN players p ON p.player_id = f.player_id
+            LEFT JOIN teams t ON t.team_id = p.team_id
+            WHERE bt.batch_uuid = ?
+            {upsert}
+            """,
+            (batch_uuid,),
+        )
+
+    def diff_batches(
+        self,
+        batch_a: str,
+        batch_b: str,
+        *,
+        metric: str = "pred_next4",
+        threshold: float = 0.0,
+        positions: Sequence[str] | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        # Per-player change from batch a to batch b: each batch's newest row per player is copied once into a temp
+        # table keyed on (gsis_id, position), and one join returns the players whose `metric` moved by more than
+        # `threshold`, largest move first. Players in only one of the batches are left out. (SQLite builds no
+        # automatic index for a join of two CTEs and falls back to a nested scan, ~100x slower on full batches.)
+        if metric not in ("pred_next4", "delta"):
+            raise ValueError(f"Cannot diff batches on {metric!r}.")
+        where = [f"ABS(b.{metric} - a.{metric}) > ?"]
+        params: list[Any] = [float(threshold)]
+        if positions:
+            where.append(f"a.position IN ({', '.join('?' for _ in positions)})")
+            params.extend(positions)
+        limit_sql, limit_params = ("", []) if limit is None else ("LIMIT ?", [int(limit)])
+
+        with self._connect() as conn:
+            try:
+                self._load_diff_side(conn, batch_a, "diff_a")
+                self._load_diff_side(conn, batch_b, "diff_b")
+                rows = conn.execute(
+                    f"""
+                    SELECT
+                      a.gsis_id, a.position, b.full_name, a.season AS season_a, a.week AS week_a,
+                      b.season AS season_b, b.week AS week_b, a.team AS team_a, b.team AS team_b,
+                      a.pred_next4 AS pred_next4_a, b.pred_next4 AS pred_next4_b,
+                      b.pred_next4 - a.pred_next4 AS pred_next4_change,
+                      a.delta AS delta_a, b.delta AS delta_b, b.delta - a.delta AS delta_change
+                    FROM temp.diff_a a
+                    JOIN temp.diff_b b ON b.gsis_id = a.gsis_id AND b.position = a.position
+                    WHERE {" AND ".join(where)}
+                    ORDER BY ABS(b.{metric} - a.{metric}) DESC, a.gsis_id
+                    {limit_sql}
+                    """,
+                    [*params, *limit_params],
+                ).fetchall()
+            finally:
+                conn.execute("DROP TABLE IF EXISTS temp.diff_a")
+                conn.execute("DROP TABLE IF EXISTS temp.diff_b")
+
+        return [dict(r) for r in rows]
+
+    def get_prediction_contributions(self, prediction_id: int) -> list[dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT prediction_id, rank, feature, contribution
+                FROM prediction_contributions
+                WHERE prediction_id = ?
+                ORDER BY rank
+                """,
+                (int(prediction_id),),
+            ).fetchall()
+
+        return [dict(r) for r in rows]
+
+    def get_run_contributions(self, run_uuid: str) -> list[dict[str, Any]]:
+        with self._connect() as conn:
+            archived = _archived_batch(conn, run_uuid=run_uuid)
+            if archived is not None:
+                return self._archived_run_contributions(archived, run_uuid)
+            rows = conn.execute(
+                """
+                SELECT c.prediction_id, p.gsis_id, c.rank, c.feature, c.contribution
                 FROM predictions p
-                JOIN prediction_runs r ON r.run_uuid = p.run_uuid
-                WHERE {" AND ".join(where)}
-                ORDER BY r.created_at DESC, p.pred_next4 DESC
-                LIMIT ?
+                JOIN prediction_contributions c ON c.prediction_id = p.prediction_id
+                WHERE p.run_uuid = ?
+                ORDER BY c.prediction_id, c.rank
                 """,
-                (*params, int(limit)),
+                (run_uuid,),
             ).fetchall()
 
         return [dict(r) for r in rows]
+
+    def _archived_run_contributions(self, archived: sqlite3.Row, run_uuid: str) -> list[dict[str, Any]]:
+        if archived["contributions_file_name"] is None:
+            return []
+        gsis_ids = dict(
+            read_parquet(
+                self.archive_dir / archived["file_name"], ["prediction_id", "gsis_id"], where=("run_uuid", run_uuid)
+            )
+        )
+        names = [name for name, _ in ARCHIVE_CONTRIBUTION_COLUMNS]
+        rows = [
+            dict(zip(names, row))
+            for row in read_parquet(self.archive_dir / archived["contributions_file_name"], names)
+            if row[0] in gsis_ids
+        ]
+        rows.sort(key=lambda row: (row["prediction_id"], row["rank"]))
+        return [
+            {"prediction_id": row["prediction_id"], "gsis_id": gsis_ids[row["prediction_id"]], **row} for row in rows
+        ]
+
+    def find_or_create_training_job(self, payload: Mapping[str, Any], *, fingerprint: str) -> tuple[str, bool]:
+        # Single flight: the lookup and the insert share one write transaction, so identical requests arriving
+        # together get one job. An identical job that is still active, or that succeeded and whose batch still
+        # exists (live or archived), is returned instead of training again. Returns (job_id, created).
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                f"""
+                SELECT job_id FROM training_jobs
+                WHERE fingerprint = ? AND status IN ({", ".join("?" for _ in ACTIVE_JOB_STATUSES)})
+                  AND cancel_requested = 0
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                (fingerprint, *ACTIVE_JOB_STATUSES),
+            ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    """
+                    SELECT j.job_id FROM training_jobs j
+                    WHERE j.fingerprint = ? AND j.status = ?
+                      AND (
+                        EXISTS (SELECT 1 FROM prediction_batches b WHERE b.batch_uuid = j.batch_uuid)
+                        OR EXISTS (SELECT 1 FROM archived_batches a WHERE a.batch_uuid = j.batch_uuid)
+                      )
+                    ORDER BY j.created_at DESC
+                    LIMIT 1
+                    """,
+                    (fingerprint, JOB_SUCCEEDED),
+                ).fetchone()
+            if row is not None:
+                return row["job_id"], False
+            return _insert_training_job(conn, payload, fingerprint), True
+
+    def update_training_job(
+        self,
+        job_id: str,
+        *,
+        status: str | None = None,
+        progress: Mapping[str, Any] | None = None,
+        batch_uuid: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        fields: dict[str, Any] = {"updated_at": _utc_now_iso()}
+        if status is not None:
+            fields["status"] = status
+        if progress is not None:
+            fields["progress_json"] = json.dumps(_jsonable(dict(progress)))
+        if batch_uuid is not None:
+            fields["batch_uuid"] = batch_uuid
+        if error is not None:
+            fields["error"] = error
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE training_jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE job_id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def update_training_job_position(self, job_id: str, position: str, progress: Mapping[str, Any]) -> None:
+        # Positions train in separate processes; json_set updates one position's entry in a single statement.
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE training_jobs
+                SET progress_json = json_set(COALESCE(progress_json, '{}'), '$.positions.' || ?, json(?)),
+                    updated_at = ?
+                WHERE job_id = ?
+                """,
+                (position, json.dumps(_jsonable(dict(progress))), _utc_now_iso(), job_id),
+            )
+
+    def get_training_job(self, job_id: str) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT job_id, created_at, updated_at, status, payload_json, progress_json, batch_uuid, error,
+                       cancel_requested, fingerprint
+                FROM training_jobs
+                WHERE job_id = ?
+                """,
+                (job_id,),
+            ).fetchone()
+        return None if row is None else _training_job(row)
+
+    def list_training_jobs(self, limit: int = 20) -> list[dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT job_id, created_at, updated_at, status, payload_json, progress_json, batch_uuid, error,
+                       cancel_requested, fingerprint
+                FROM training_jobs
+                ORDER BY created_at DESC
+                LIMIT ?
+                """,
+                (int(limit),),
+            ).fetchall()
+        return [_training_job(r) for r in rows]
+
+    def request_training_job_cancel(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"""
+                UPDATE training_jobs SET cancel_requested = 1, updated_at = ?
+                WHERE job_id = ? AND status IN ({", ".join("?" for _ in ACTIVE_JOB_STATUSES)})
+                """,
+                (_utc_now_iso(), job_id, *ACTIVE_JOB_STATUSES),
+            )
+        return cur.rowcount > 0
+
+    def training_job_cancel_requested(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM training_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def fail_interrupted_training_jobs(self) -> int:
+        # Jobs only run inside the API process's worker pool, so any still active at startup were lost with it.
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"""
+                UPDATE training_jobs SET status = ?, error = ?, updated_at = ?
+                WHERE status IN ({", ".join("?" for _ in ACTIVE_JOB_STATUSES)})
+                """,
+                (JOB_FAILED, "Interrupted by a server restart.", _utc_now_iso(), *ACTIVE_JOB_STATUSES),
+            )
+        return int(cur.rowcount or 0)
+
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+def _off_thread(
+    method: Callable[Concatenate[PredictionStore, _P], _R],
+) -> Callable[Concatenate[AsyncPredictionStore, _P], Awaitable[_R]]:
+    # Async twin of a PredictionStore method with the same parameters, run on the store's worker threads.
+    @wraps(method)
+    async def call(self: AsyncPredictionStore, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        return await self.run(method, self.store, *args, **kwargs)
+
+    return call
+
+
+# Awaitable view of a PredictionStore: the methods the API awaits run on a bounded worker pool instead of the event
+# loop. Each worker keeps its own SQLite connection, so the pool size also bounds the open connections.
+class AsyncPredictionStore:
+    def __init__(self, store: PredictionStore, *, max_workers: int = SQLITE_WORKER_THREADS) -> None:
+        self.store = store
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prediction-store")
+
+    async def run(self, fn: Callable[_P, _R], /, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    is_batch_complete = _off_thread(PredictionStore.is_batch_complete)
+    result_exists = _off_thread(PredictionStore.result_exists)
+    query_predictions = _off_thread(PredictionStore.query_predictions)
+    get_predictions = _off_thread(PredictionStore.get_predictions)
+    get_top_predictions = _off_thread(PredictionStore.get_top_predictions)
+    get_latest_run = _off_thread(PredictionStore.get_latest_run)
+    get_past_runs_for_history_list = _off_thread(PredictionStore.get_past_runs_for_history_list)
+    get_past_batches = _off_thread(PredictionStore.get_past_batches)
+    get_model_leaderboard = _off_thread(PredictionStore.get_model_leaderboard)
+    get_run_contributions = _off_thread(PredictionStore.get_run_contributions)
+    get_prediction_contributions = _off_thread(PredictionStore.get_prediction_contributions)
+    diff_batches = _off_thread(PredictionStore.diff_batches)
+    pin_batch = _off_thread(PredictionStore.pin_batch)
+    search_players = _off_thread(PredictionStore.search_players)
+    get_player_history = _off_thread(PredictionStore.get_player_history)
+    find_or_create_training_job = _off_thread(PredictionStore.find_or_create_training_job)
+    get_training_job = _off_thread(PredictionStore.get_training_job)
+    list_training_jobs = _off_thread(PredictionStore.list_training_jobs)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.store.close()
@@ -8,21 +8,17 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from model.feature_matrix import FeatureMatrixCache, default_feature_cache
 from model.gbt_regression import (
-    apply_median_imputer,
+    PRIMARY_HORIZON,
     load_final_dataset,
-    load_trained_xgb,
+    load_scoring_pipeline,
     regression_metrics,
+    spearman_correlation,
     time_split_by_season,
-    _to_numeric_frame,
 )
 
 
-try:
-    from scipy.stats import spearmanr  # type: ignore[import-not-found]
-except Exception:  # pragma: no cover
-    spearmanr = None
-
 try:
     from sklearn.metrics import roc_auc_score  # type: ignore[import-not-found]
 except Exception:  # pragma: no cover
@@ -30,25 +26,13 @@ except Exception:  # pragma: no cover
 
 
 TOPK_BY_POSITION: dict[str, int] = {"QB": 12, "RB": 24, "WR": 24, "TE": 12}
+DEFAULT_BREAKOUT_THRESHOLD = 3.0
 
 
 def _parse_positions(value: str) -> list[str]:
     return [p.strip().upper() for p in value.split(",") if p.strip()]
 
 
-def _spearman(a: np.ndarray, b: np.ndarray) -> float:
-    a = np.asarray(a, dtype=float)
-    b = np.asarray(b, dtype=float)
-    mask = ~np.isnan(a) & ~np.isnan(b)
-    a = a[mask]
-    b = b[mask]
-    if a.size < 3:
-        return float("nan")
-    if spearmanr is not None:
-        return float(spearmanr(a, b).correlation)
-    return float(pd.Series(a).rank().corr(pd.Series(b).rank()))
-
-
 def _precision_at_k_weekly(df: pd.DataFrame, *, y_col: str, pred_col: str, k: int) -> tuple[float, int]:
     if "week" not in df.columns:
         return float("nan"), 0
@@ -95,30 +79,33 @@ def evaluate_position(
     model_dir: str | Path,
     val_season: int | None,
     breakout_threshold: float,
+    cache: FeatureMatrixCache | None = None,
+    df: pd.DataFrame | None = None,
 ) -> EvalResult:
-    model, meta = load_trained_xgb(model_dir, position)
-    feature_cols = list(meta["feature_cols"])
-    medians = dict(meta["medians"])
+    cache = cache or default_feature_cache()
+    pipeline = load_scoring_pipeline(model_dir, position)
+    meta = pipeline.metadata
+    feature_cols = pipeline.preprocessor.feature_cols
     target_col = str(meta["target_col"])
+    # The model's full target set, so the season's cached label matrix is the one training already wrote.
+    target_cols = [str(c) for c in meta.get("target_cols", [target_col])]
+    target = target_cols.index(target_col)
     meta_val_season = int(meta["val_season"])
     val_season = meta_val_season if val_season is None else int(val_season)
 
-    df = load_final_dataset(data_dir, position)
+    df = load_final_dataset(data_dir, position) if df is None else df
     _, val_df, _ = time_split_by_season(df, val_season=val_season)
 
-    y = pd.to_numeric(val_df[target_col], errors="coerce")
-    mask = ~y.isna()
+    x_all, y_all, _ = cache.season_matrix(position, df, feature_cols, target_cols, val_season)
+    mask = ~np.isnan(y_all[:, target])
     val_df = val_df.loc[mask].copy()
-    y = y.loc[mask].astype(float)
+    y = pd.Series(y_all[mask, target], index=val_df.index, dtype=float)
 
-    x = _to_numeric_frame(val_df, feature_cols)
-    x = apply_median_imputer(x, medians)
-    pred = pd.Series(model.predict(x), index=val_df.index, dtype=float)
+    primary = pipeline.horizons.index(PRIMARY_HORIZON)
+    preds = pipeline.predict_matrix(x_all[mask]).reshape(int(mask.sum()), len(pipeline.horizons))
+    pred = pd.Series(preds[:, primary], index=val_df.index, dtype=float)
 
-    model_metrics = {
-        **regression_metrics(y.to_numpy(), pred.to_numpy()),
-        "spearman": _spearman(y.to_numpy(), pred.to_numpy()),
-    }
+    model_metrics = regression_metrics(y.to_numpy(), pred.to_numpy())
 
     baseline_cols = [c for c in ["fantasy_prev_5wk_avg", "fantasy_3wk_avg", "fantasy_ppr_3wk_avg"] if c in val_df.columns]
     baselines: dict[str, dict[str, float]] = {}
@@ -129,7 +116,6 @@ def evaluate_position(
         bb = b.loc[bmask]
         baselines[c] = {
             **regression_metrics(yy.to_numpy(), bb.to_numpy()),
-            "spearman": _spearman(yy.to_numpy(), bb.to_numpy()),
             "n": float(int(bmask.sum())),
         }
 
@@ -145,7 +131,7 @@ def evaluate_position(
         delta_true = (y - prev5).loc[pmask].to_numpy(dtype=float)
         delta_pred = (pred - prev5).loc[pmask].to_numpy(dtype=float)
         delta_vs_prev5 = {
-            "spearman": _spearman(delta_true, delta_pred),
+            "spearman": spearman_correlation(delta_true, delta_pred),
             "pearson": float(pd.Series(delta_true).corr(pd.Series(delta_pred))),
             "n": float(int(pmask.sum())),
         }
@@ -181,7 +167,7 @@ def main() -> None:
     parser.add_argument("--data-dir", default="pipeline_data/final", help="Path to finalized CSVs")
     parser.add_argument("--model-dir", default="model/artifacts", help="Where models/metadata live")
     parser.add_argument("--val-season", type=int, default=None, help="Override val season (default: from metadata)")
-    parser.add_argument("--breakout-threshold", type=float, default=3.0, help="Delta threshold vs prev5 for breakout label")
+    parser.add_argument("--breakout-threshold", type=float, default=DEFAULT_BREAKOUT_THRESHOLD, help="Delta threshold vs prev5 for breakout label")
     parser.add_argument("--out", default=None, help="Optional path to write JSON results")
     args = parser.parse_args()
 
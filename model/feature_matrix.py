@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import warnings
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from constants import FEATURE_CACHE_DIR
+
+
+def to_float32_matrix(df: pd.DataFrame, cols: Sequence[str]) -> np.ndarray:
+    frame = df.loc[:, list(cols)]
+    non_numeric = [
+        c for c, dtype in frame.dtypes.items() if not (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype))
+    ]
+    if non_numeric:
+        frame = frame.assign(**{c: pd.to_numeric(frame[c], errors="coerce") for c in non_numeric})
+    return np.ascontiguousarray(frame.to_numpy(dtype=np.float32, na_value=np.nan))
+
+
+def to_float32_vector(values: Any) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+def labelled_rows(y: np.ndarray) -> np.ndarray:
+    # Rows with at least one target. Missing horizons are masked per target (see `label_masks`), so a row with a
+    # next4 label but no next1 label (the player sat out the following week) still trains the next4 output.
+    missing = np.isnan(y)
+    return ~(missing.all(axis=1) if missing.ndim == 2 else missing)
+
+
+def fully_labelled_rows(y: np.ndarray) -> np.ndarray:
+    missing = np.isnan(y)
+    return ~(missing.any(axis=1) if missing.ndim == 2 else missing)
+
+
+def label_masks(y_train: np.ndarray, y_val: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    # Per-target masks for label matrices with missing horizons; None when every target is present.
+    missing_train, missing_val = np.isnan(y_train), np.isnan(y_val)
+    if not (missing_train.any() or missing_val.any()):
+        return None
+    return ~missing_train, ~missing_val
+
+
+def fill_missing_labels(y: np.ndarray) -> np.ndarray:
+    # XGBoost rejects NaN labels; the placeholders are masked out of the objective and the metric.
+    return np.nan_to_num(y, nan=0.0) if np.isnan(y).any() else y
+
+
+def fit_medians(x: np.ndarray) -> np.ndarray:
+    if x.shape[0] == 0:
+        return np.zeros(x.shape[1], dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        medians = np.nanmedian(x.astype(np.float64, copy=False), axis=0)
+    return np.nan_to_num(medians, nan=0.0)
+
+
+def impute_inplace(x: np.ndarray, medians: np.ndarray) -> np.ndarray:
+    rows, cols = np.nonzero(np.isnan(x))
+    x[rows, cols] = medians[cols]
+    return x
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    # Exclusive lock on `path` across processes: a CLI run and an API job can share the feature cache.
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _frame_digest(df: pd.DataFrame, cols: Sequence[str]) -> str:
+    h = hashlib.sha1("\x1f".join(cols).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df.loc[:, list(cols)], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _remove_stale(cache_dir: Path, patterns: Sequence[str]) -> None:
+    for pattern in patterns:
+        for stale in cache_dir.glob(pattern):
+            try:
+                stale.unlink(missing_ok=True)
+            except OSError:
+                # Still mapped by a reader (Windows); it goes on a later rebuild.
+                pass
+
+
+def _save_npy(path: Path, arr: np.ndarray) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        np.save(handle, arr)
+    tmp_path.replace(path)
+
+
+@dataclass(frozen=True)
+class FeatureSplit:
+    key: str
+    feature_cols: list[str]
+    x_train: np.ndarray
+    y_train: np.ndarray
+    x_val: np.ndarray
+    y_val: np.ndarray
+    medians: np.ndarray
+
+    @property
+    def label_train(self) -> np.ndarray:
+        return self.y_train[:, 0] if self.y_train.shape[1] == 1 else self.y_train
+
+    @property
+    def label_val(self) -> np.ndarray:
+        return self.y_val[:, 0] if self.y_val.shape[1] == 1 else self.y_val
+
+    @property
+    def label_masks(self) -> tuple[np.ndarray, np.ndarray] | None:
+        return label_masks(self.y_train, self.y_val)
+
+    def target_rows(self, target: int) -> tuple[np.ndarray, np.ndarray]:
+        return ~np.isnan(self.y_train[:, target]), ~np.isnan(self.y_val[:, target])
+
+
+class FeatureMatrixCache:
+    def __init__(self, cache_dir: str | Path | None = FEATURE_CACHE_DIR, *, max_in_memory: int = 8) -> None:
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.max_in_memory = max_in_memory
+        self._splits: OrderedDict[str, FeatureSplit] = OrderedDict()
+        self._dmatrices: OrderedDict[tuple[str, int, int | None], tuple[Any, Any]] = OrderedDict()
+
+    def _remember(self, store: OrderedDict, key: Any, value: Any) -> Any:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.max_in_memory:
+            store.popitem(last=False)
+        return value
+
+    def season_matrix(
+        self,
+        position: str,
+        df: pd.DataFrame,
+        feature_cols: Sequence[str],
+        target_cols: Sequence[str],
+        season: int,
+    ) -> tuple[np.ndarray, np.ndarray, str]:
+        season_num = pd.to_numeric(df["season"], errors="coerce")
+        season_df = df[(season_num == int(season)).fillna(False)]
+        x_digest = _frame_digest(season_df, feature_cols)
+        y_digest = _frame_digest(season_df, target_cols)
+        digest = hashlib.sha1(f"{x_digest}|{y_digest}".encode("utf-8")).hexdigest()
+
+        if self.cache_dir is None:
+            return to_float32_matrix(season_df, feature_cols), to_float32_matrix(season_df, target_cols), digest
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{position.lower()}_{int(season)}"
+        # X only depends on the feature columns, so evaluation (one target) and training (every horizon) share it;
+        # labels are kept per target set, and each rebuild only clears files of its own kind and target set.
+        targets_key = hashlib.sha1("\x1f".join(target_cols).encode("utf-8")).hexdigest()[:8]
+        x_path = self.cache_dir / f"{stem}_x_{x_digest[:16]}.npy"
+        y_path = self.cache_dir / f"{stem}_y{targets_key}_{y_digest[:16]}.npy"
+        # The slice's lock covers the write, the stale-file cleanup and opening the maps, so another process never
+        # removes files this one is about to load. Temp files end in .tmp and never match the cleanup globs.
+        with _file_lock(self.cache_dir / f"{stem}.lock"):
+            if not x_path.exists():
+                # `{stem}_{digest}_x.npy`/`_y.npy` are the layout from before X and labels were keyed apart.
+                _remove_stale(self.cache_dir, [f"{stem}_x_*.npy", f"{stem}_*_x.npy", f"{stem}_*_y.npy"])
+                _save_npy(x_path, to_float32_matrix(season_df, feature_cols))
+            if not y_path.exists():
+                _remove_stale(self.cache_dir, [f"{stem}_y{targets_key}_*.npy"])
+                _save_npy(y_path, to_float32_matrix(season_df, target_cols))
+            return np.load(x_path, mmap_mode="r"), np.load(y_path, mmap_mode="r"), digest
+
+    def split(
+        self,
+        position: str,
+        df: pd.DataFrame,
+        feature_cols: Sequence[str],
+        target_cols: Sequence[str],
+        val_season: int,
+    ) -> FeatureSplit:
+        val_season = int(val_season)
+        seasons = sorted(int(s) for s in pd.to_numeric(df["season"], errors="coerce").dropna().unique())
+        if not seasons:
+            raise ValueError("No valid `season` values found for time-based split.")
+        train_seasons = [s for s in seasons if s < val_season]
+        if not train_seasons:
+            raise ValueError(
+                f"Training split is empty (val_season={val_season}). "
+                "Provide more seasons or set a different `val_season`."
+            )
+        if val_season not in seasons:
+            raise ValueError(
+                f"Validation split is empty (val_season={val_season}). "
+                "Provide more seasons or set a different `val_season`."
+            )
+
+        parts = [self.season_matrix(position, df, feature_cols, target_cols, s) for s in train_seasons]
+        x_val_all, y_val_all, val_digest = self.season_matrix(position, df, feature_cols, target_cols, val_season)
+        key = hashlib.sha1(
+            "|".join([position, str(val_season), *(p[2] for p in parts), val_digest]).encode("utf-8")
+        ).hexdigest()
+        if key in self._splits:
+            self._splits.move_to_end(key)
+            return self._splits[key]
+
+        x_train = np.concatenate([p[0] for p in parts])
+        y_train = np.concatenate([p[1] for p in parts])
+        train_mask = labelled_rows(y_train)
+        val_mask = labelled_rows(y_val_all)
+        x_train = x_train[train_mask]
+        medians = fit_medians(x_train)
+
+        split = FeatureSplit(
+            key=key,
+            feature_cols=list(feature_cols),
+            x_train=impute_inplace(x_train, medians),
+            y_train=np.ascontiguousarray(y_train[train_mask]),
+            x_val=impute_inplace(x_val_all[val_mask], medians),
+            y_val=np.ascontiguousarray(y_val_all[val_mask]),
+            medians=medians,
+        )
+        return self._remember(self._splits, key, split)
+
+    def quantile_dmatrices(
+        self, split: FeatureSplit, *, max_bin: int = 256, target: int | None = None
+    ) -> tuple[Any, Any]:
+        from model.gbt_regression import _require_xgboost
+
+        key = (split.key, int(max_bin), target)
+        if key in self._dmatrices:
+            self._dmatrices.move_to_end(key)
+            return self._dmatrices[key]
+
+        xgb = _require_xgboost()
+        if target is None:
+            ref = None
+            x_train, x_val = split.x_train, split.x_val
+            label_train, label_val = fill_missing_labels(split.label_train), fill_missing_labels(split.label_val)
+        else:
+            # Single-target views keep the rows labelled for that target and reuse the quantile cuts already
+            # sketched for the full label matrix.
+            ref = self.quantile_dmatrices(split, max_bin=max_bin)[0]
+            train_rows, val_rows = split.target_rows(target)
+            x_train, x_val = split.x_train[train_rows], split.x_val[val_rows]
+            label_train, label_val = split.y_train[train_rows, target], split.y_val[val_rows, target]
+        dtrain = xgb.QuantileDMatrix(
+            x_train, label=label_train, feature_names=split.feature_cols, ref=ref, max_bin=max_bin
+        )
+        dval = xgb.QuantileDMatrix(
+            x_val, label=label_val, feature_names=split.feature_cols, ref=dtrain, max_bin=max_bin
+        )
+        return self._remember(self._dmatrices, key, (dtrain, dval))
+
+
+def default_feature_cache() -> FeatureMatrixCache:
+    # A fresh cache per training, tuning or evaluation run (train.py hands one to both training and `--evaluate`):
+    # the on-disk season matrices carry over between runs, while the in-memory splits and DMatrices are released
+    # with the run.
+    return FeatureMatrixCache(FEATURE_CACHE_DIR)
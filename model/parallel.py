@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def partition_threads(n_tasks: int, *, cores: int | None = None, max_workers: int | None = None) -> tuple[int, int]:
+    # One process per task up to the core count, each with an equal share of the cores for xgboost's threads
+    # (e.g. 4 positions on 16 cores -> 4 workers x 4 threads).
+    cores = max(1, cores or os.cpu_count() or 1)
+    workers = max(1, min(n_tasks, cores, max_workers or cores))
+    return workers, max(1, cores // workers)
+
+
+def run_partitioned(
+    fn: Callable[[str, int], T],
+    tasks: Sequence[str],
+    *,
+    cores: int | None = None,
+    max_workers: int | None = None,
+) -> dict[str, T]:
+    # `fn(task, n_threads)` must be picklable (a module-level function or a partial of one). Results come back
+    # keyed by task in the order given, whatever order the workers finish in.
+    workers, threads = partition_threads(len(tasks), cores=cores, max_workers=max_workers)
+    if workers == 1:
+        return {task: fn(task, threads) for task in tasks}
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {task: pool.submit(fn, task, threads) for task in tasks}
+        try:
+            return {task: future.result() for task, future in futures.items()}
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
@@ -6,15 +6,24 @@ from uuid import uuid4
 
 import pandas as pd
 
+from constants import TARGET_HORIZONS
 from model.gbt_regression import (
+    DEFAULT_QUANTILES,
     IDENTIFIER_COLS,
-    apply_median_imputer,
+    ScoringEngine,
+    ScoringPipeline,
     load_final_dataset,
-    load_trained_xgb,
+    load_scoring_pipeline,
     latest_week_slice,
+    quantile_output_name,
     score_candidates,
 )
 
+PREDICTION_COLS = [
+    *(f"pred_{h}" for h in TARGET_HORIZONS),
+    *(f"pred_{quantile_output_name(q)}" for q in DEFAULT_QUANTILES),
+]
+
 
 def _parse_positions(value: str) -> list[str]:
     return [p.strip().upper() for p in value.split(",") if p.strip()]
@@ -27,6 +36,7 @@ class PredictionResult:
     week: int
     scored: pd.DataFrame
     model_metadata: dict[str, object]
+    contributions: pd.DataFrame | None = None
 
 
 def predict_position(
@@ -34,33 +44,52 @@ def predict_position(
     *,
     data_dir: str | Path = "pipeline_data/final",
     model_dir: str | Path = "model/artifacts",
+    engine: ScoringEngine = "auto",
+    top_k_contributions: int = 0,
 ) -> PredictionResult:
     df = load_final_dataset(data_dir, position)
     season, week, df_latest = latest_week_slice(df)
 
-    model, metadata = load_trained_xgb(model_dir, position)
-    feature_cols = list(metadata["feature_cols"])
-    medians = dict(metadata["medians"])
+    if top_k_contributions > 0:
+        if engine == "numpy":
+            raise ValueError("Feature contributions need the xgboost engine.")
+        engine = "xgboost"
+    pipeline = load_scoring_pipeline(model_dir, position, engine=engine)
+
+    contributions = None
+    if top_k_contributions > 0:
+        outputs, contributions = pipeline.explain_outputs(df_latest, top_k=top_k_contributions)
+    else:
+        outputs = pipeline.predict_outputs(df_latest)
+    for name, preds in outputs.items():
+        df_latest[f"pred_{name}"] = preds
+    scored = score_candidates(df_latest, position)
 
-    x = df_latest.loc[:, feature_cols].copy()
-    for c in x.columns:
-        x[c] = pd.to_numeric(x[c], errors="coerce")
-    x = apply_median_imputer(x, medians)
+    return PredictionResult(
+        position=position,
+        season=season,
+        week=week,
+        scored=scored,
+        model_metadata={**model_metadata(position, pipeline), "contributions_top_k": int(top_k_contributions)},
+        contributions=contributions,
+    )
 
-    df_latest = df_latest.copy()
-    df_latest["pred_next4"] = model.predict(x)
-    scored = score_candidates(df_latest, position)
 
-    model_metadata = {
+def model_metadata(position: str, pipeline: ScoringPipeline) -> dict[str, object]:
+    metadata = pipeline.metadata
+    return {
         "position": position,
+        "model_version": pipeline.model_version,
         "target_col": metadata.get("target_col"),
+        "horizons": pipeline.horizons,
+        "quantiles": pipeline.quantiles,
         "val_season": metadata.get("val_season"),
         "best_iteration": metadata.get("best_iteration"),
         "validation_metrics": metadata.get("validation_metrics"),
+        "validation_metrics_by_horizon": metadata.get("validation_metrics_by_horizon"),
+        "quantile_metrics": metadata.get("quantile_metrics"),
     }
 
-    return PredictionResult(position=position, season=season, week=week, scored=scored, model_metadata=model_metadata)
-
 
 def _default_output_columns(df: pd.DataFrame) -> list[str]:
     base_cols = [c for c in IDENTIFIER_COLS if c in df.columns]
@@ -75,7 +104,7 @@ def _default_output_columns(df: pd.DataFrame) -> list[str]:
         "percent_rostered",
         "fantasy_prev_5wk_avg",
     ]
-    out_cols = base_cols + [c for c in extras if c in df.columns] + ["pred_next4", "delta"]
+    out_cols = base_cols + [c for c in extras if c in df.columns] + [*PREDICTION_COLS, "delta"]
     return [c for c in out_cols if c in df.columns]
 
 
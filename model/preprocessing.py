@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from model.feature_matrix import to_float32_matrix
+
+PREPROCESSOR_VERSION = 1
+
+
+def file_sha256(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class Preprocessor:
+    feature_cols: list[str]
+    medians: np.ndarray
+    input_dtypes: list[str] = field(default_factory=list)
+    model_sha256: str | None = None
+    version: int = PREPROCESSOR_VERSION
+
+    @classmethod
+    def from_medians(
+        cls,
+        feature_cols: Sequence[str],
+        medians: Sequence[float] | np.ndarray,
+        *,
+        input_dtypes: Sequence[str] | None = None,
+    ) -> Preprocessor:
+        return cls(
+            feature_cols=list(feature_cols),
+            medians=np.asarray(medians, dtype=np.float32).reshape(-1),
+            input_dtypes=list(input_dtypes or []),
+        )
+
+    @classmethod
+    def from_metadata(cls, metadata: dict[str, Any]) -> Preprocessor:
+        feature_cols = list(metadata["feature_cols"])
+        return cls.from_medians(feature_cols, [float(metadata["medians"][c]) for c in feature_cols])
+
+    def impute(self, x: np.ndarray) -> np.ndarray:
+        if not x.flags.writeable:
+            x = np.array(x, dtype=np.float32)
+        np.copyto(x, self.medians, where=np.isnan(x))
+        return x
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        return self.impute(to_float32_matrix(df, self.feature_cols))
+
+    def bind(self, model_path: str | Path) -> Preprocessor:
+        return replace(self, model_sha256=file_sha256(model_path))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "feature_cols": self.feature_cols,
+            "input_dtypes": self.input_dtypes,
+            "dtype": "float32",
+            "medians": [float(m) for m in self.medians],
+            "model_sha256": self.model_sha256,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Preprocessor:
+        version = int(data.get("version", 0))
+        if version != PREPROCESSOR_VERSION:
+            raise ValueError(f"Unsupported preprocessor version {version} (expected {PREPROCESSOR_VERSION}).")
+        return replace(
+            cls.from_medians(data["feature_cols"], data["medians"], input_dtypes=data.get("input_dtypes")),
+            model_sha256=data.get("model_sha256"),
+        )
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> Preprocessor:
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import os
+
+from constants import DB_PATH
+from model.database import PredictionStore
+
+# Default policy, also applied after every finished training job: keep the newest 50 batches and anything from
+# the last 90 days (plus pinned batches and each position's latest run).
+KEEP_BATCHES = 50
+KEEP_DAYS = 90.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Archive expired prediction batches to Parquet and give their space back to the filesystem."
+    )
+    parser.add_argument("--db-path", default=DB_PATH, help="SQLite database to apply the policy to")
+    parser.add_argument("--archive-dir", default=None, help="Where archived batches go (default: next to the db)")
+    parser.add_argument("--keep-batches", type=int, default=KEEP_BATCHES, help="Always keep this many newest batches")
+    parser.add_argument("--keep-days", type=float, default=KEEP_DAYS, help="Always keep batches younger than this")
+    parser.add_argument("--dry-run", action="store_true", help="List the expired batches without archiving them")
+    args = parser.parse_args()
+
+    store = PredictionStore(args.db_path, archive_dir=args.archive_dir)
+    store.ensure_schema()
+
+    if args.dry_run:
+        expired = store.expired_batches(keep_batches=args.keep_batches, keep_days=args.keep_days)
+        print(f"{len(expired)} expired batches: {', '.join(expired) or '-'}")
+        return
+
+    size_before = os.path.getsize(store.db_path)
+    archived = store.apply_retention(keep_batches=args.keep_batches, keep_days=args.keep_days)
+    print(
+        f"archived {len(archived)} batches to {store.archive_dir}; database "
+        f"{size_before / 2**20:.1f} MB -> {os.path.getsize(store.db_path) / 2**20:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import argparse
+from functools import partial
 from pathlib import Path
+from typing import Any, Mapping
 
-from model.gbt_regression import load_final_dataset, train_xgb_regressor
+from model.evaluate import DEFAULT_BREAKOUT_THRESHOLD, evaluate_position
+from model.feature_matrix import default_feature_cache
+from model.gbt_regression import (
+    DEFAULT_QUANTILES,
+    IncrementalParams,
+    load_final_dataset,
+    train_xgb_regressor,
+    warm_start_xgb_regressor,
+)
+from model.parallel import run_partitioned
 
 
 def _parse_positions(value: str) -> list[str]:
@@ -11,21 +22,104 @@ def _parse_positions(value: str) -> list[str]:
     return positions
 
 
+def _train_one(args: Mapping[str, Any], incremental: IncrementalParams, position: str, n_jobs: int) -> str:
+    # One feature cache per position: its split and QuantileDMatrix serve the point and quantile fits, and
+    # `--evaluate` reads the validation season's matrices training just built.
+    cache = default_feature_cache()
+    df = load_final_dataset(args["data_dir"], position)
+    if args["incremental"]:
+        trained = warm_start_xgb_regressor(
+            position,
+            df,
+            args["out_dir"],
+            val_season=args["val_season"],
+            incremental=incremental,
+            cache=cache,
+            n_jobs=n_jobs,
+        )
+    else:
+        trained = train_xgb_regressor(
+            position,
+            df,
+            args["out_dir"],
+            val_season=args["val_season"],
+            quantiles=DEFAULT_QUANTILES if args["intervals"] else None,
+            cache=cache,
+            n_jobs=n_jobs,
+        )
+    saved = f"saved: {trained.model_path} ({trained.metadata_path})"
+    if args["evaluate"]:
+        result = evaluate_position(
+            position,
+            data_dir=args["data_dir"],
+            model_dir=args["out_dir"],
+            val_season=None,
+            breakout_threshold=DEFAULT_BREAKOUT_THRESHOLD,
+            cache=cache,
+            df=df,
+        )
+        saved += f", val mae {result.model['mae']:.3f}, spearman {result.model['spearman']:.3f} (n={result.n})"
+    return saved
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Train per-position XGBoost regression models.")
     parser.add_argument("--positions", default="QB,RB,WR,TE", help="Comma-separated: QB,RB,WR,TE")
     parser.add_argument("--data-dir", default="pipeline_data/final", help="Path to finalized CSVs")
     parser.add_argument("--out-dir", default="model/artifacts", help="Where to save models and metadata")
-    parser.add_argument("--val-season", type=int, required=True, help="Season to use as validation")
+    parser.add_argument("--val-season", type=int, default=None, help="Season to use as validation")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Add trees for rows newer than the saved model instead of retraining from scratch",
+    )
+    parser.add_argument("--max-new-trees", type=int, default=IncrementalParams.max_new_trees)
+    parser.add_argument(
+        "--old-data-weight",
+        type=float,
+        default=IncrementalParams.old_data_weight,
+        help="Sample weight for previously seen training rows (0 = fit new rows only)",
+    )
+    parser.add_argument(
+        "--max-val-degradation",
+        type=float,
+        default=IncrementalParams.max_val_degradation,
+        help="Relative validation MAE increase that triggers a full retrain",
+    )
+    parser.add_argument(
+        "--intervals",
+        action="store_true",
+        help="Also train a quantile model for p10/p50/p90 prediction intervals",
+    )
+    parser.add_argument(
+        "--evaluate",
+        action="store_true",
+        help="Evaluate each new model on its validation season, reusing the training feature cache",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Positions to train at once, each with an equal share of the cores (default: one per position)",
+    )
     args = parser.parse_args()
 
+    if args.val_season is None and not args.incremental:
+        parser.error("--val-season is required unless --incremental is set")
+
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for position in _parse_positions(args.positions):
-        df = load_final_dataset(args.data_dir, position)
-        trained = train_xgb_regressor(position, df, out_dir, val_season=args.val_season)
-        print(f"[{position}] saved: {trained.model_path} ({trained.metadata_path})")
+    incremental = IncrementalParams(
+        max_new_trees=args.max_new_trees,
+        old_data_weight=args.old_data_weight,
+        max_val_degradation=args.max_val_degradation,
+    )
+
+    positions = _parse_positions(args.positions)
+    train_one = partial(_train_one, vars(args), incremental)
+    for position, saved in run_partitioned(train_one, positions, max_workers=args.workers).items():
+        print(f"[{position}] {saved}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+from model.archive import archive_available
+from model.database import (
+    ACTIVE_JOB_STATUSES,
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    PredictionStore,
+)
+from model.gbt_regression import (
+    DEFAULT_QUANTILES,
+    MODEL_VERSIONS_DIR,
+    XGBHyperParams,
+    _require_xgboost,
+    final_dataset_path,
+    load_final_dataset,
+    model_pointer_path,
+    train_xgb_regressor,
+)
+from model.parallel import run_partitioned
+from model.preprocessing import file_sha256
+from model.predict import _default_output_columns, predict_position
+from model.retention import KEEP_BATCHES as RETENTION_KEEP_BATCHES, KEEP_DAYS as RETENTION_KEEP_DAYS
+
+MAX_CONCURRENT_JOBS = 1
+# Concurrent jobs share the machine; each one splits its share between its positions.
+JOB_CORES = max(1, (os.cpu_count() or 1) // MAX_CONCURRENT_JOBS)
+PROGRESS_EVERY_ITERATIONS = 25
+PROGRESS_MIN_INTERVAL_S = 1.0
+
+ProgressFn = Callable[[Mapping[str, Any]], None]
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def hyperparams_from_request(request: Mapping[str, Any]) -> XGBHyperParams:
+    return XGBHyperParams(**{name: request[name] for name in asdict(XGBHyperParams()) if name in request})
+
+
+@lru_cache(maxsize=64)
+def _dataset_sha256(path: str, mtime_ns: int, size: int) -> str:
+    # Keyed by mtime and size so an unchanged CSV is hashed once per process.
+    return file_sha256(path)
+
+
+def request_fingerprint(request: Mapping[str, Any]) -> str:
+    # Identical payloads over identical data train identical models, so the fingerprint covers the payload and the
+    # content of every position's dataset, not just its path.
+    h = hashlib.sha256(json.dumps(dict(request), sort_keys=True, default=str).encode("utf-8"))
+    for position in sorted(str(p) for p in request["positions"]):
+        path = final_dataset_path(str(request["data_dir"]), position)
+        stat = path.stat()
+        h.update(f"\x1f{position}:{_dataset_sha256(str(path.resolve()), stat.st_mtime_ns, stat.st_size)}".encode())
+    return h.hexdigest()
+
+
+def progress_callback(report: ProgressFn, *, every: int = PROGRESS_EVERY_ITERATIONS):
+    xgb = _require_xgboost()
+
+    class _Progress(xgb.callback.TrainingCallback):
+        def after_iteration(self, model, epoch: int, evals_log) -> bool:
+            if epoch % every == 0:
+                metric, values = next(iter(evals_log.get("validation", {}).items()), (None, []))
+                report({"iteration": epoch, "metric": metric, "value": float(values[-1]) if values else None})
+            return False
+
+    return _Progress()
+
+
+class _JobReporter:
+    def __init__(self, store: PredictionStore, job_id: str, position: str) -> None:
+        self.store = store
+        self.job_id = job_id
+        self.position = position
+        self._last_write = 0.0
+
+    def __call__(self, progress: Mapping[str, Any]) -> None:
+        # Progress is written at most once a second (stage changes always); the same round trip checks for a
+        # cancel request, which stops the job between boosting rounds.
+        now = time.monotonic()
+        if "iteration" in progress and now - self._last_write < PROGRESS_MIN_INTERVAL_S:
+            return
+        self._last_write = now
+        if self.store.training_job_cancel_requested(self.job_id):
+            raise JobCancelled(self.job_id)
+        self.store.update_training_job_position(self.job_id, self.position, progress)
+
+
+def _train_position(request: Mapping[str, Any], job: tuple[str, str] | None, position: str, n_jobs: int) -> None:
+    # Runs in a scheduler worker process, so it reports through its own connection to the job's database.
+    report = None if job is None else _JobReporter(PredictionStore(job[0]), job[1], position)
+    if report is not None:
+        report({"stage": "training"})
+    train_xgb_regressor(
+        position,
+        load_final_dataset(str(request["data_dir"]), position),
+        str(request["model_dir"]),
+        val_season=int(request["val_season"]),
+        params=hyperparams_from_request(request),
+        quantiles=DEFAULT_QUANTILES if request.get("intervals") else None,
+        callbacks=None if report is None else [progress_callback(lambda p: report({"stage": "training", **p}))],
+        n_jobs=n_jobs,
+    )
+
+
+def _write_pointer(pointer: Path, version: str) -> None:
+    tmp_path = pointer.with_name(f"{pointer.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(version, encoding="utf-8")
+    tmp_path.replace(pointer)
+
+
+def _promote_models(
+    staging_dir: Path, model_dir: Path, positions: list[str], batch_uuid: str, promoted: dict[str, str | None]
+) -> None:
+    # Each staged model moves (one rename on the same filesystem) to its own version directory, then the
+    # position's pointer is replaced in one step: readers resolve either the previous model or the new one, and
+    # the previous one stays on disk. `promoted` records each replaced pointer as it goes, for _rollback_models.
+    (model_dir / MODEL_VERSIONS_DIR).mkdir(parents=True, exist_ok=True)
+    for position in positions:
+        pointer = model_pointer_path(model_dir, position)
+        version = f"{MODEL_VERSIONS_DIR}/{position.lower()}-{batch_uuid}"
+        (staging_dir / position.lower()).replace(model_dir / version)
+        promoted[position] = pointer.read_text(encoding="utf-8") if pointer.exists() else None
+        _write_pointer(pointer, version)
+
+
+def _rollback_models(model_dir: Path, batch_uuid: str, promoted: dict[str, str | None]) -> None:
+    # Points every promoted position back at the model it replaced (or at `{position}/` if it had no pointer).
+    for position, previous in promoted.items():
+        pointer = model_pointer_path(model_dir, position)
+        if previous is None:
+            pointer.unlink(missing_ok=True)
+        else:
+            _write_pointer(pointer, previous)
+    for position in promoted:
+        shutil.rmtree(model_dir / MODEL_VERSIONS_DIR / f"{position.lower()}-{batch_uuid}", ignore_errors=True)
+
+
+def _prune_model_versions(model_dir: Path, promoted: dict[str, str | None]) -> None:
+    # Keeps each position's live version and the one it replaced, which readers that resolved the old pointer
+    # may still be loading; older versions go.
+    for position, previous in promoted.items():
+        keep = {model_pointer_path(model_dir, position).read_text(encoding="utf-8"), previous}
+        for version in (model_dir / MODEL_VERSIONS_DIR).glob(f"{position.lower()}-*"):
+            if f"{MODEL_VERSIONS_DIR}/{version.name}" not in keep:
+                shutil.rmtree(version, ignore_errors=True)
+
+
+def train_batch(
+    store: PredictionStore,
+    request: Mapping[str, Any],
+    *,
+    job_id: str | None = None,
+    cores: int | None = None,
+) -> str:
+    positions = [str(p) for p in request["positions"]]
+    data_dir = str(request["data_dir"])
+    model_dir = str(request["model_dir"])
+    val_season = int(request["val_season"])
+    params = hyperparams_from_request(request)
+
+    batch_uuid = store.create_batch(positions=positions, data_dir=data_dir, model_dir=model_dir, val_season=val_season)
+    # Models are trained and scored in a staging directory next to the live one and only replace it once every
+    # run is stored, so a failed or cancelled job leaves the previous models in place.
+    staging_dir = Path(model_dir) / f".staging-{batch_uuid}"
+    promoted: dict[str, str | None] = {}
+
+    try:
+        # Positions train concurrently with the cores split between them; scoring and the run records then follow
+        # in request order, exactly as a sequential batch would write them.
+        job = None if job_id is None else (str(store.db_path), job_id)
+        staged_request = {**request, "model_dir": str(staging_dir)}
+        run_partitioned(partial(_train_position, staged_request, job), positions, cores=cores)
+
+        for position in positions:
+            report = None if job_id is None else _JobReporter(store, job_id, position)
+            if report is not None:
+                report({"stage": "scoring"})
+            result = predict_position(
+                position,
+                data_dir=data_dir,
+                model_dir=staging_dir,
+                top_k_contributions=int(request.get("top_k_contributions", 0)),
+            )
+            run_uuid = store.create_run(
+                batch_uuid=batch_uuid,
+                position=position,
+                season=result.season,
+                week=result.week,
+                data_dir=data_dir,
+                model_dir=model_dir,
+                meta={**result.model_metadata, "train_params": asdict(params)},
+                model_version=result.model_metadata.get("model_version"),
+            )
+            store.save_predictions(
+                run_uuid,
+                batch_uuid,
+                result.scored,
+                payload_cols=_default_output_columns(result.scored),
+                contributions=result.contributions,
+            )
+            if report is not None:
+                report({"stage": "done"})
+        _promote_models(staging_dir, Path(model_dir), positions, batch_uuid, promoted)
+        store.complete_batch(batch_uuid)
+    except BaseException:
+        # A cancelled or failed job leaves no half-written batch behind and the previous models live.
+        _rollback_models(Path(model_dir), batch_uuid, promoted)
+        store.delete_batch(batch_uuid)
+        raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    _prune_model_versions(Path(model_dir), promoted)
+
+    return batch_uuid
+
+
+def run_training_job(db_path: str, job_id: str) -> str | None:
+    store = PredictionStore(db_path)
+    job = store.get_training_job(job_id)
+    if job is None:
+        raise KeyError(f"Unknown training job {job_id!r}")
+    if job["cancel_requested"]:
+        store.update_training_job(job_id, status=JOB_CANCELLED)
+        return None
+
+    positions = list(job["payload"]["positions"])
+    store.update_training_job(
+        job_id, status=JOB_RUNNING, progress={"positions_total": len(positions), "positions": {}}
+    )
+    try:
+        batch_uuid = train_batch(store, job["payload"], job_id=job_id, cores=JOB_CORES)
+        store.update_training_job(job_id, status=JOB_SUCCEEDED, batch_uuid=batch_uuid)
+    except JobCancelled:
+        store.update_training_job(job_id, status=JOB_CANCELLED)
+        return None
+    except Exception as exc:
+        store.update_training_job(job_id, status=JOB_FAILED, error=f"{type(exc).__name__}: {exc}")
+        raise
+    else:
+        # Every finished job adds a batch, so this is where the database grows; the new batch is the newest and
+        # always kept. A failed sweep leaves the expired batches live for the next job to retry.
+        if archive_available():
+            store.apply_retention(keep_batches=RETENTION_KEEP_BATCHES, keep_days=RETENTION_KEEP_DAYS)
+        return batch_uuid
+    finally:
+        store.close()
+
+
+class TrainingJobQueue:
+    def __init__(self, db_path: str | Path, *, max_workers: int = MAX_CONCURRENT_JOBS) -> None:
+        self.db_path = str(db_path)
+        self.max_workers = max_workers
+        self.store = PredictionStore(db_path)
+        self._executor = self._new_executor()
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Spawned (not forked) workers: the API process runs thread pools that a fork would copy mid-flight.
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, job_id: str) -> None:
+        with self._lock:
+            try:
+                future = self._executor.submit(run_training_job, self.db_path, job_id)
+            except BrokenProcessPool:
+                self._executor = self._new_executor()
+                future = self._executor.submit(run_training_job, self.db_path, job_id)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finished(job_id, f))
+
+    def _finished(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled() or future.exception() is None:
+            return
+        # The worker records its own failures; this catches the ones it could not (e.g. the process was killed).
+        job = self.store.get_training_job(job_id)
+        if job is not None and job["status"] in ACTIVE_JOB_STATUSES:
+            exc = future.exception()
+            self.store.update_training_job(job_id, status=JOB_FAILED, error=f"{type(exc).__name__}: {exc}")
+
+    def cancel(self, job_id: str) -> bool:
+        if not self.store.request_training_job_cancel(job_id):
+            return False
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.update_training_job(job_id, status=JOB_CANCELLED)
+        return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+IDENTITY_LINK_OBJECTIVES = {
+    "reg:squarederror",
+    "reg:absoluteerror",
+    "reg:pseudohubererror",
+    "reg:quantileerror",
+}
+MAX_ELEMENTS_PER_CHUNK = 1 << 16
+
+
+@dataclass(frozen=True)
+class TreeTables:
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    default_left: np.ndarray
+    leaf: np.ndarray
+    base_score: np.ndarray
+    max_depth: int
+    feature_names: list[str]
+    model_sha256: str | None = None
+    output_names: list[str] = field(default_factory=list)
+
+    @property
+    def n_trees(self) -> int:
+        return int(self.feature.shape[0])
+
+    @property
+    def n_outputs(self) -> int:
+        return int(self.leaf.shape[2])
+
+
+def _parse_vector(value: str) -> np.ndarray:
+    return np.array([float(v) for v in str(value).strip("[]").split(",") if v.strip()], dtype=np.float64)
+
+
+def _tree_depth(left: list[int], right: list[int]) -> int:
+    depth = 0
+    frontier = [(0, 0)]
+    while frontier:
+        node, d = frontier.pop()
+        if left[node] == -1:
+            depth = max(depth, d)
+            continue
+        frontier.append((left[node], d + 1))
+        frontier.append((right[node], d + 1))
+    return depth
+
+
+def export_tree_tables(
+    booster: Any, *, model_sha256: str | None = None, output_names: list[str] | None = None
+) -> TreeTables:
+    best = booster.attr("best_iteration")
+    if best is not None and int(best) + 1 < booster.num_boosted_rounds():
+        booster = booster[: int(best) + 1]
+
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in IDENTITY_LINK_OBJECTIVES:
+        raise ValueError(f"Tree tables only support identity-link objectives, got {objective!r}.")
+    if any(t.get("split_type") and any(t["split_type"]) for t in learner["gradient_booster"]["model"]["trees"]):
+        raise ValueError("Tree tables do not support categorical splits.")
+
+    model = learner["gradient_booster"]["model"]
+    trees = model["trees"]
+    tree_info = [int(g) for g in model["tree_info"]]
+    base_score = _parse_vector(learner["learner_model_param"]["base_score"])
+    n_outputs = max(int(learner["learner_model_param"].get("num_target", 1)), len(base_score), 1)
+    if len(base_score) == 1 and n_outputs > 1:
+        base_score = np.repeat(base_score, n_outputs)
+
+    n_trees = len(trees)
+    max_nodes = max((int(t["tree_param"]["num_nodes"]) for t in trees), default=1)
+    feature = np.zeros((n_trees, max_nodes), dtype=np.int32)
+    threshold = np.zeros((n_trees, max_nodes), dtype=np.float32)
+    left = np.tile(np.arange(max_nodes, dtype=np.int32), (n_trees, 1))
+    right = left.copy()
+    default_left = np.zeros((n_trees, max_nodes), dtype=bool)
+    leaf = np.zeros((n_trees, max_nodes, n_outputs), dtype=np.float32)
+    max_depth = 0
+
+    for i, tree in enumerate(trees):
+        n = int(tree["tree_param"]["num_nodes"])
+        size_leaf_vector = int(tree["tree_param"].get("size_leaf_vector", 1) or 1)
+        lc = np.asarray(tree["left_children"], dtype=np.int32)
+        rc = np.asarray(tree["right_children"], dtype=np.int32)
+        is_leaf = lc == -1
+        internal = ~is_leaf
+
+        feature[i, :n][internal] = np.asarray(tree["split_indices"], dtype=np.int32)[internal]
+        threshold[i, :n][internal] = np.asarray(tree["split_conditions"], dtype=np.float32)[internal]
+        left[i, :n][internal] = lc[internal]
+        right[i, :n][internal] = rc[internal]
+        default_left[i, :n] = np.asarray(tree["default_left"], dtype=bool) & internal
+
+        if size_leaf_vector > 1:
+            values = np.asarray(tree["base_weights"], dtype=np.float32).reshape(n, size_leaf_vector)
+            leaf[i, :n][is_leaf] = values[is_leaf]
+        else:
+            leaf[i, :n, tree_info[i]][is_leaf] = np.asarray(tree["split_conditions"], dtype=np.float32)[is_leaf]
+
+        max_depth = max(max_depth, _tree_depth(lc.tolist(), rc.tolist()))
+
+    return TreeTables(
+        feature=feature,
+        threshold=threshold,
+        left=left,
+        right=right,
+        default_left=default_left,
+        leaf=leaf,
+        base_score=base_score.astype(np.float32),
+        max_depth=max_depth,
+        feature_names=list(booster.feature_names or []),
+        model_sha256=model_sha256,
+        output_names=list(output_names or []),
+    )
+
+
+def merge_tree_tables(first: TreeTables, second: TreeTables) -> TreeTables:
+    if first.feature_names != second.feature_names:
+        raise ValueError("Cannot merge tree tables trained on different features.")
+    max_nodes = max(first.feature.shape[1], second.feature.shape[1])
+    n_outputs = first.n_outputs + second.n_outputs
+
+    def pad(tables: TreeTables, output_offset: int) -> dict[str, np.ndarray]:
+        extra = max_nodes - tables.feature.shape[1]
+        widen = ((0, 0), (0, extra))
+        self_loops = np.arange(tables.feature.shape[1], max_nodes, dtype=np.int32)[None, :]
+        leaf = np.zeros((tables.n_trees, max_nodes, n_outputs), dtype=np.float32)
+        leaf[:, : tables.feature.shape[1], output_offset : output_offset + tables.n_outputs] = tables.leaf
+        return {
+            "feature": np.pad(tables.feature, widen),
+            "threshold": np.pad(tables.threshold, widen),
+            "left": np.concatenate([tables.left, np.repeat(self_loops, tables.n_trees, axis=0)], axis=1),
+            "right": np.concatenate([tables.right, np.repeat(self_loops, tables.n_trees, axis=0)], axis=1),
+            "default_left": np.pad(tables.default_left, widen),
+            "leaf": leaf,
+        }
+
+    a, b = pad(first, 0), pad(second, first.n_outputs)
+    return TreeTables(
+        **{key: np.concatenate([a[key], b[key]]) for key in a},
+        base_score=np.concatenate([first.base_score, second.base_score]),
+        max_depth=max(first.max_depth, second.max_depth),
+        feature_names=list(first.feature_names),
+        model_sha256=first.model_sha256,
+        output_names=[*first.output_names, *second.output_names],
+    )
+
+
+def predict_tree_tables(tables: TreeTables, x: np.ndarray) -> np.ndarray:
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    if x.ndim != 2:
+        raise ValueError(f"Expected a 2D feature matrix, got shape {x.shape}.")
+    n_rows, n_features = x.shape
+    n_trees, max_nodes = tables.feature.shape
+    out = np.empty((n_rows, tables.n_outputs), dtype=np.float32)
+    if n_trees == 0:
+        out[:] = tables.base_score
+        return out[:, 0] if tables.n_outputs == 1 else out
+
+    tree_offset = np.arange(n_trees, dtype=np.intp)[:, None] * max_nodes
+    feature = tables.feature.astype(np.intp).ravel()
+    threshold = tables.threshold.ravel()
+    left = (tables.left + tree_offset).ravel()
+    right = (tables.right + tree_offset).ravel()
+    default_left = tables.default_left.ravel()
+    leaf = tables.leaf.reshape(n_trees * max_nodes, tables.n_outputs)
+    roots = tree_offset.ravel()[None, :]
+
+    # xgboost allocates sibling nodes in pairs, so internal nodes satisfy right == left + 1; a leaf points
+    # at itself with a NaN threshold, which keeps it in place on the dense (NaN-free) path below.
+    is_leaf = tables.left == np.arange(max_nodes, dtype=tables.left.dtype)
+    paired = bool(np.all((tables.right == tables.left + 1) | is_leaf))
+    dense_threshold = np.where(is_leaf, np.float32(np.nan), tables.threshold).ravel()
+
+    chunk = max(1, MAX_ELEMENTS_PER_CHUNK // n_trees)
+    for start in range(0, n_rows, chunk):
+        xb = x[start : start + chunk]
+        x_flat = xb.ravel()
+        row_offset = np.arange(xb.shape[0], dtype=np.intp)[:, None] * n_features
+        node = np.repeat(roots, xb.shape[0], axis=0)
+        if paired and not np.isnan(xb).any():
+            for _ in range(tables.max_depth):
+                value = x_flat[row_offset + feature[node]]
+                node = left[node] + (value >= dense_threshold[node])
+        else:
+            for _ in range(tables.max_depth):
+                value = x_flat[row_offset + feature[node]]
+                go_left = np.where(np.isnan(value), default_left[node], value < threshold[node])
+                node = np.where(go_left, left[node], right[node])
+        out[start : start + chunk] = leaf[node].sum(axis=1, dtype=np.float64) + tables.base_score
+
+    return out[:, 0] if tables.n_outputs == 1 else out
+
+
+def save_tree_tables(tables: TreeTables, path: str | Path) -> Path:
+    path = Path(path)
+    with path.open("wb") as f:
+        np.savez(
+            f,
+            feature=tables.feature,
+            threshold=tables.threshold,
+            left=tables.left,
+            right=tables.right,
+            default_left=tables.default_left,
+            leaf=tables.leaf,
+            base_score=tables.base_score,
+            max_depth=np.int32(tables.max_depth),
+            feature_names=np.array(tables.feature_names, dtype=str),
+            model_sha256=np.array(tables.model_sha256 or "", dtype=str),
+            output_names=np.array(tables.output_names, dtype=str),
+        )
+    return path
+
+
+def load_tree_tables(path: str | Path) -> TreeTables:
+    with np.load(Path(path), allow_pickle=False) as data:
+        return TreeTables(
+            feature=data["feature"],
+            threshold=data["threshold"],
+            left=data["left"],
+            right=data["right"],
+            default_left=data["default_left"],
+            leaf=data["leaf"],
+            base_score=data["base_score"],
+            max_depth=int(data["max_depth"]),
+            feature_names=[str(c) for c in data["feature_names"]],
+            model_sha256=str(data["model_sha256"]) or None,
+            output_names=[str(c) for c in data["output_names"]] if "output_names" in data.files else [],
+        )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from model.feature_matrix import FeatureMatrixCache, default_feature_cache
+from model.gbt_regression import (
+    XGBHyperParams,
+    best_iteration,
+    fit_booster,
+    load_final_dataset,
+    make_feature_set,
+    predict_best,
+    regression_metrics,
+)
+
+
+def _parse_positions(value: str) -> list[str]:
+    return [p.strip().upper() for p in value.split(",") if p.strip()]
+
+
+def sample_hyperparams(n_trials: int, *, base: XGBHyperParams, seed: int) -> list[XGBHyperParams]:
+    rng = np.random.default_rng(seed)
+    return [
+        replace(
+            base,
+            learning_rate=float(10 ** rng.uniform(-2.0, -0.7)),
+            max_depth=int(rng.integers(3, 9)),
+            min_child_weight=float(rng.choice([1.0, 3.0, 5.0, 10.0, 20.0])),
+            subsample=float(rng.uniform(0.6, 1.0)),
+            colsample_bytree=float(rng.uniform(0.5, 1.0)),
+            reg_lambda=float(10 ** rng.uniform(-1.0, 1.0)),
+        )
+        for _ in range(n_trials)
+    ]
+
+
+def tune_xgb_regressor(
+    position: str,
+    df: pd.DataFrame,
+    *,
+    val_season: int,
+    trials: Sequence[XGBHyperParams],
+    random_state: int = 7,
+    cache: FeatureMatrixCache | None = None,
+) -> list[dict[str, object]]:
+    cache = cache or default_feature_cache()
+    feature_cols, target_col = make_feature_set(position)
+    split = cache.split(position, df, feature_cols, [target_col], val_season)
+    dtrain, dval = cache.quantile_dmatrices(split)
+
+    results: list[dict[str, object]] = []
+    for params in trials:
+        start = time.perf_counter()
+        booster = fit_booster(params, dtrain, dval, random_state=random_state)
+        results.append(
+            {
+                "position": position,
+                "params": asdict(params),
+                "validation_metrics": regression_metrics(split.label_val, predict_best(booster, split.x_val)),
+                "best_iteration": best_iteration(booster),
+                "seconds": time.perf_counter() - start,
+            }
+        )
+    return sorted(results, key=lambda r: r["validation_metrics"]["mae"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Random-search XGBoost hyperparameters on a shared cached feature matrix.")
+    parser.add_argument("--positions", default="QB,RB,WR,TE", help="Comma-separated: QB,RB,WR,TE")
+    parser.add_argument("--data-dir", default="pipeline_data/final", help="Path to finalized CSVs")
+    parser.add_argument("--val-season", type=int, required=True, help="Season to use as validation")
+    parser.add_argument("--trials", type=int, default=20, help="Number of random trials per position")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Optional path to write JSON results")
+    args = parser.parse_args()
+
+    trials = sample_hyperparams(args.trials, base=XGBHyperParams(), seed=args.seed)
+    results: list[dict[str, object]] = []
+    for position in _parse_positions(args.positions):
+        df = load_final_dataset(args.data_dir, position)
+        position_results = tune_xgb_regressor(position, df, val_season=args.val_season, trials=trials)
+        best = position_results[0]
+        print(
+            f"[{position}] best mae={best['validation_metrics']['mae']:.3f} "
+            f"iter={best['best_iteration']} params={best['params']}"
+        )
+        results.extend(position_results)
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nWrote: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+
+def _parse_levels(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+async def _timed_get(client: httpx.AsyncClient, url: str, params: dict | None = None) -> float:
+    start = time.perf_counter()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_level(
+    base_url: str,
+    concurrency: int,
+    *,
+    requests_per_client: int,
+    position: str,
+    slow_batch: str | None,
+) -> dict[str, object]:
+    fast_latencies: list[float] = []
+    slow_latencies: list[float] = []
+    done = asyncio.Event()
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def fast_client() -> None:
+            for _ in range(requests_per_client):
+                fast_latencies.append(
+                    await _timed_get(client, "/predictions/top", {"position": position, "limit": 25})
+                )
+
+        async def slow_client() -> None:
+            # Keeps one unpaginated full-batch read in flight for the whole level.
+            while not done.is_set():
+                slow_latencies.append(await _timed_get(client, f"/predictions/batch/{slow_batch}"))
+
+        slow_task = asyncio.create_task(slow_client()) if slow_batch else None
+        start = time.perf_counter()
+        await asyncio.gather(*(fast_client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        if slow_task is not None:
+            await slow_task
+
+    fast = np.array(fast_latencies) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": len(fast),
+        "req_per_s": len(fast) / elapsed,
+        "p50_ms": float(np.percentile(fast, 50)),
+        "p95_ms": float(np.percentile(fast, 95)),
+        "max_ms": float(fast.max()),
+        "slow_reads": len(slow_latencies),
+        "slow_mean_ms": float(np.mean(slow_latencies) * 1000) if slow_latencies else float("nan"),
+    }
+
+
+async def _latest_batch(base_url: str) -> str | None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        response = await client.get("/predictions/batch/past", params={"limit": 1})
+        response.raise_for_status()
+        batches = response.json()
+    return batches[0]["batch_uuid"] if batches else None
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    slow_batch = None if args.no_slow_reader else (args.slow_batch or await _latest_batch(args.base_url))
+    rows = [
+        await run_level(
+            args.base_url,
+            concurrency,
+            requests_per_client=args.requests_per_client,
+            position=args.position,
+            slow_batch=slow_batch,
+        )
+        for concurrency in _parse_levels(args.concurrency)
+    ]
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Load-test a running predictions API: concurrent /predictions/top clients while one client keeps "
+            "reading a full batch, at increasing concurrency."
+        )
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated client counts")
+    parser.add_argument("--requests-per-client", type=int, default=50)
+    parser.add_argument("--position", default="QB")
+    parser.add_argument("--slow-batch", default=None, help="Batch to read unpaginated (default: latest batch)")
+    parser.add_argument("--no-slow-reader", action="store_true", help="Skip the concurrent full-batch reader")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
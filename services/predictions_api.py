@@ -1,24 +1,74 @@
 from __future__ import annotations
-from dataclasses import asdict
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
 from enum import Enum
 from functools import lru_cache
+from typing import AsyncIterator
 import pandas as pd
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from model.database import PredictionStore
-from model.gbt_regression import XGBHyperParams, load_final_dataset, train_xgb_regressor
-from model.predict import _default_output_columns, predict_position
+from model.database import (
+    ACTIVE_JOB_STATUSES,
+    SORTABLE_PREDICTION_COLUMNS,
+    PREDICTION_EXPORT_COLUMNS,
+    AsyncPredictionStore,
+    PredictionPage,
+    PredictionStore,
+)
+from model.gbt_regression import load_final_dataset
+from model.training_jobs import TrainingJobQueue, request_fingerprint
+from services.responses import EXPORT_FORMATS, encode_rows, export_chunks, negotiate_encoding, negotiate_format
 from constants import ALL_POSITIONS, DB_PATH
 
 
+JOB_EVENTS_POLL_S = 0.5
+# Bump whenever the shape of prediction rows changes, so clients drop results cached under the old one.
+RESULTS_SCHEMA_VERSION = 1
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
 class Position(str, Enum):
     QB = "QB"
     RB = "RB"
     WR = "WR"
     TE = "TE"
 
-app = FastAPI(title="FantasyFootball Predictions API")
+
+SortKey = Enum("SortKey", {column: column for column in SORTABLE_PREDICTION_COLUMNS}, type=str)
+
+
+class SortDirection(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Jobs run in this process's worker pool, so any still marked active at startup died with the previous one.
+    store = _store()
+    await store.run(store.store.fail_interrupted_training_jobs)
+    try:
+        yield
+    finally:
+        if _job_queue.cache_info().currsize:
+            _job_queue().shutdown()
+            _job_queue.cache_clear()
+        store.close()
+        _store.cache_clear()
+
+
+app = FastAPI(title="FantasyFootball Predictions API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -27,22 +77,32 @@ app.add_middleware(
         "https://localhost:3000",
     ],
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
 @lru_cache(maxsize=1)
-def _store() -> PredictionStore:
+def _store() -> AsyncPredictionStore:
     db_path = DB_PATH
     store = PredictionStore(db_path)
     store.ensure_schema()
-    return store
+    return AsyncPredictionStore(store)
 
 
-def get_store() -> PredictionStore:
+def get_store() -> AsyncPredictionStore:
     return _store()
 
 
+@lru_cache(maxsize=1)
+def _job_queue() -> TrainingJobQueue:
+    return TrainingJobQueue(DB_PATH)
+
+
+def get_job_queue() -> TrainingJobQueue:
+    return _job_queue()
+
+
 def _positions_from_query(positions: str | None) -> list[Position]:
     all_positions = [Position(value) for value in ALL_POSITIONS]
     if positions is None or not positions.strip():
@@ -121,6 +181,93 @@ def _compute_valid_val_seasons(data_dir: str, positions: list[Position]) -> list
     return sorted(shared_seasons or [])
 
 
+def prediction_page_query(
+    positions: str | None = Query(default=None, description="Comma-separated positions (e.g. QB,RB)"),
+    min_pred: float | None = None,
+    max_pred: float | None = None,
+    min_delta: float | None = None,
+    max_delta: float | None = None,
+    min_prev: float | None = None,
+    max_prev: float | None = None,
+    sort: SortKey = SortKey.pred_next4,
+    direction: SortDirection = SortDirection.DESC,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page"),
+) -> dict[str, object]:
+    return {
+        "positions": None if positions is None else [p.value for p in _positions_from_query(positions)],
+        "ranges": {
+            "pred_next4": (min_pred, max_pred),
+            "delta": (min_delta, max_delta),
+            "fantasy_prev_5wk_avg": (min_prev, max_prev),
+        },
+        "sort": sort.value,
+        "direction": direction.value,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+
+def _negotiate(request: Request) -> tuple[str, str | None]:
+    return (
+        negotiate_format(request.headers.get("accept")),
+        negotiate_encoding(request.headers.get("accept-encoding")),
+    )
+
+
+async def _rows_response(request: Request, rows: list[dict], headers: dict[str, str] | None = None) -> Response:
+    # Rows, one array per column, or Arrow IPC, as the Accept header asks, compressed per Accept-Encoding.
+    # Encoding thousands of rows is CPU work too: it runs on the thread pool (the rows are already JSON-native,
+    # so no jsonable_encoder), not on the event loop.
+    media_type, encoding = _negotiate(request)
+    body, applied = await run_in_threadpool(encode_rows, rows, media_type, encoding)
+    headers = {**(headers or {}), "Vary": "Accept, Accept-Encoding"}
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _results_etag(result_uuid: str, query: dict[str, object], representation: tuple[str, str | None]) -> str:
+    # Strong ETag for one page of a finished batch or run: its id, the rows' schema version, the page query and
+    # the negotiated format and content coding (each representation has its own bytes).
+    key = json.dumps([query, representation], sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return f'"v{RESULTS_SCHEMA_VERSION}-{result_uuid}-{hashlib.sha256(key).hexdigest()[:16]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def _query_page(store: AsyncPredictionStore, request: Request, **query) -> Response:
+    # Finished batches never change, so their pages carry a strong ETag and are cacheable forever. A matching
+    # If-None-Match (or `*`) gets 304 after a single primary-key lookup confirms the batch or run still exists and
+    # is finished; a deleted or unknown id is a 404, never a revalidated cache entry.
+    result_uuid = query.get("batch_uuid") or query.get("run_uuid")
+    scope = {"batch_uuid": query.get("batch_uuid"), "run_uuid": query.get("run_uuid")}
+    # Checked before reading the rows, so a page read while the batch was still being written is never cached.
+    complete = await store.is_batch_complete(**scope)
+    if not complete and not await store.result_exists(**scope):
+        raise HTTPException(status_code=404, detail=f"No batch or run {result_uuid}")
+    etag = _results_etag(result_uuid, query, _negotiate(request))
+    if complete and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept, Accept-Encoding"},
+        )
+
+    try:
+        page: PredictionPage = await store.query_predictions(**query)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL} if complete else {"Cache-Control": "no-cache"}
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return await _rows_response(request, page.rows, headers)
+
+
 class TrainRequest(BaseModel):
     positions: list[Position] = Field(default_factory=lambda: [Position.QB, Position.RB, Position.WR, Position.TE])
     data_dir: str = "pipeline_data/final"
@@ -133,6 +280,10 @@ class TrainRequest(BaseModel):
     colsample_bytree: float = Field(default=0.8, gt=0, le=1)
     reg_lambda: float = Field(default=1.0, ge=0)
     reg_alpha: float = Field(default=0.0, ge=0)
+    intervals: bool = False
+    # Opt-in: contributions need a SHAP pass on the booster engine and a side-table write per prediction.
+    top_k_contributions: int = Field(default=0, ge=0, le=50)
+
 
 @app.get("/train/options/seasons")
 async def get_train_val_season_options(
@@ -140,55 +291,238 @@ async def get_train_val_season_options(
     data_dir: str = Query(default="pipeline_data/final"),
 ):
     selected_positions = _positions_from_query(positions)
-    seasons = _compute_valid_val_seasons(data_dir, selected_positions)
+    seasons = await run_in_threadpool(_compute_valid_val_seasons, data_dir, selected_positions)
     return {"seasons": seasons}
 
 
 @app.get("/predictions/top")
 async def get_top_predictions(
     position: Position,
+    request: Request,
     season: int | None = None,
     week: int | None = None,
     limit: int = Query(default=25, ge=1, le=500),
-    store: PredictionStore = Depends(get_store),
+    store: AsyncPredictionStore = Depends(get_store),
 ):
-    return store.get_top_predictions(position=position.value, season=season, week=week, limit=limit)
+    return await _rows_response(
+        request,
+        await store.get_top_predictions(position=position.value, season=season, week=week, limit=limit),
+    )
 
 
 @app.get("/predictions/runs/list")
 async def get_list_of_runs(
     limit: int = 15,
-    store: PredictionStore = Depends(get_store),
+    store: AsyncPredictionStore = Depends(get_store),
 ):
-    return store.get_past_runs_for_history_list(limit=limit)
+    return await store.get_past_runs_for_history_list(limit=limit)
+
+
+class LeaderboardMetric(str, Enum):
+    MAE = "mae"
+    RMSE = "rmse"
+    R2 = "r2"
+    SPEARMAN = "spearman"
+
+
+@app.get("/models/leaderboard")
+async def get_model_leaderboard(
+    position: Position | None = None,
+    metric: LeaderboardMetric = LeaderboardMetric.MAE,
+    limit: int = Query(default=20, ge=1, le=500),
+    best_per_position: bool = False,
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    return await store.get_model_leaderboard(
+        position=None if position is None else position.value,
+        metric=metric.value,
+        limit=limit,
+        best_per_position=best_per_position,
+    )
 
 
 @app.get("/predictions/runs/{run_uuid}")
-async def get_predictions_for_run(run_uuid: str, store: PredictionStore = Depends(get_store)):
-    return store.get_predictions(run_uuid=run_uuid)
+async def get_predictions_for_run(
+    run_uuid: str,
+    request: Request,
+    query: dict = Depends(prediction_page_query),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    return await _query_page(store, request, run_uuid=run_uuid, **query)
+
+
+@app.get("/predictions/runs/{run_uuid}/contributions")
+async def get_contributions_for_run(
+    run_uuid: str, request: Request, store: AsyncPredictionStore = Depends(get_store)
+):
+    return await _rows_response(request, await store.get_run_contributions(run_uuid))
+
+
+@app.get("/predictions/{prediction_id}/contributions")
+async def get_prediction_contributions(prediction_id: int, store: AsyncPredictionStore = Depends(get_store)):
+    return await store.get_prediction_contributions(prediction_id)
+
+
+def _export_response(store: AsyncPredictionStore, export_format: ExportFormat, name: str, **scope) -> Response:
+    # The chunk generator runs on Starlette's thread pool as the client reads, so memory stays at one chunk.
+    media_type, extension = EXPORT_FORMATS[export_format.value]
+    try:
+        body = export_chunks(
+            export_format.value, PREDICTION_EXPORT_COLUMNS, store.store.iter_prediction_chunks(**scope)
+        )
+    except ModuleNotFoundError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="predictions-{name}.{extension}"'},
+    )
 
 
 @app.get("/predictions/batch/past")
-async def get_past_batch_predictions(limit: int, store: PredictionStore = Depends(get_store)):
-    return store.get_past_batches(limit)
+async def get_past_batch_predictions(limit: int, store: AsyncPredictionStore = Depends(get_store)):
+    return await store.get_past_batches(limit)
+
+
+class DiffMetric(str, Enum):
+    PRED_NEXT4 = "pred_next4"
+    DELTA = "delta"
+
+
+@app.get("/predictions/batch/diff")
+async def diff_batches(
+    a: str,
+    b: str,
+    request: Request,
+    metric: DiffMetric = DiffMetric.PRED_NEXT4,
+    threshold: float = Query(default=0.0, ge=0),
+    positions: str | None = Query(default=None, description="Comma-separated positions (e.g. QB,RB)"),
+    limit: int | None = Query(default=None, ge=1, le=5000),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    # Declared before /predictions/batch/{batch_uuid}, which would otherwise take "diff" as a batch id.
+    for batch_uuid in (a, b):
+        if not await store.result_exists(batch_uuid=batch_uuid):
+            raise HTTPException(status_code=404, detail=f"No batch {batch_uuid}")
+    rows = await store.diff_batches(
+        a,
+        b,
+        metric=metric.value,
+        threshold=threshold,
+        positions=None if positions is None else [p.value for p in _positions_from_query(positions)],
+        limit=limit,
+    )
+    return await _rows_response(request, rows)
+
+
+@app.get("/predictions/batch/past/export")
+async def export_past_batch_predictions(
+    limit: int = Query(default=30, ge=1, le=500),
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    batch_uuids = [batch["batch_uuid"] for batch in await store.get_past_batches(limit)]
+    return _export_response(store, export_format, f"last-{limit}-batches", batch_uuids=batch_uuids)
+
+
+@app.get("/predictions/batch/{batch_uuid}/export")
+async def export_batch_predictions(
+    batch_uuid: str,
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    if not await store.result_exists(batch_uuid=batch_uuid):
+        raise HTTPException(status_code=404, detail=f"No batch {batch_uuid}")
+    return _export_response(store, export_format, batch_uuid, batch_uuids=[batch_uuid])
+
+
+@app.get("/predictions/runs/{run_uuid}/export")
+async def export_run_predictions(
+    run_uuid: str,
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    if not await store.result_exists(run_uuid=run_uuid):
+        raise HTTPException(status_code=404, detail=f"No run {run_uuid}")
+    return _export_response(store, export_format, run_uuid, run_uuid=run_uuid)
+
+
+@app.post("/predictions/batch/{batch_uuid}/pin")
+async def pin_batch(batch_uuid: str, store: AsyncPredictionStore = Depends(get_store)):
+    # Pinned batches are exempt from the retention policy.
+    if not await store.pin_batch(batch_uuid):
+        raise HTTPException(status_code=404, detail=f"No live batch {batch_uuid}")
+    return {"batch_uuid": batch_uuid, "pinned": True}
+
+
+@app.post("/predictions/batch/{batch_uuid}/unpin")
+async def unpin_batch(batch_uuid: str, store: AsyncPredictionStore = Depends(get_store)):
+    if not await store.pin_batch(batch_uuid, pinned=False):
+        raise HTTPException(status_code=404, detail=f"No live batch {batch_uuid}")
+    return {"batch_uuid": batch_uuid, "pinned": False}
 
 
 @app.get("/predictions/batch/{batch_uuid}")
-async def get_batch_prediction(batch_uuid: str, store: PredictionStore = Depends(get_store)):
-    return store.get_batch_prediction(batch_uuid)
+async def get_batch_prediction(
+    batch_uuid: str,
+    request: Request,
+    query: dict = Depends(prediction_page_query),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    return await _query_page(store, request, batch_uuid=batch_uuid, **query)
 
 
 @app.get("/predictions/latest/{position}")
-async def get_latest_predictions(position: Position, store: PredictionStore = Depends(get_store)):
-    run = store.get_latest_run(position=position.value)
+async def get_latest_predictions(
+    position: Position, request: Request, store: AsyncPredictionStore = Depends(get_store)
+):
+    run = await store.get_latest_run(position=position.value)
     if run is None:
         raise HTTPException(status_code=404, detail=f"No runs found for position={position.value}")
-    return store.get_predictions(run_uuid=run.run_uuid)
+    return await _rows_response(request, await store.get_predictions(run_uuid=run.run_uuid))
+
+
+@app.get("/players/search")
+async def search_players(
+    q: str,
+    request: Request,
+    positions: str | None = Query(default=None, description="Comma-separated positions (e.g. QB,RB)"),
+    limit: int = Query(default=20, ge=1, le=200),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    rows = await store.search_players(
+        q,
+        positions=None if positions is None else [p.value for p in _positions_from_query(positions)],
+        limit=limit,
+    )
+    return await _rows_response(request, rows)
 
 
-@app.post("/train")
-async def train_models(payload: TrainRequest, store: PredictionStore = Depends(get_store)):
-    valid_seasons = _compute_valid_val_seasons(payload.data_dir, payload.positions)
+@app.get("/players/{gsis_id}/history")
+async def get_player_history(
+    gsis_id: str,
+    request: Request,
+    season: int | None = None,
+    include_backfill: bool = True,
+    max_points: int | None = Query(default=None, ge=1, le=5000, description="Downsample longer histories"),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    rows = await store.get_player_history(
+        gsis_id, season=season, include_backfill=include_backfill, max_points=max_points
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No predictions for player {gsis_id}")
+    return await _rows_response(request, rows)
+
+
+@app.post("/train", status_code=202)
+async def train_models(
+    payload: TrainRequest,
+    response: Response,
+    store: AsyncPredictionStore = Depends(get_store),
+    jobs: TrainingJobQueue = Depends(get_job_queue),
+):
+    valid_seasons = await run_in_threadpool(_compute_valid_val_seasons, payload.data_dir, payload.positions)
     if payload.val_season not in valid_seasons:
         raise HTTPException(
             status_code=400,
@@ -198,43 +532,68 @@ async def train_models(payload: TrainRequest, store: PredictionStore = Depends(g
             ),
         )
 
-    params = XGBHyperParams(
-        n_estimators=payload.n_estimators,
-        learning_rate=payload.learning_rate,
-        max_depth=payload.max_depth,
-        subsample=payload.subsample,
-        colsample_bytree=payload.colsample_bytree,
-        reg_lambda=payload.reg_lambda,
-        reg_alpha=payload.reg_alpha,
-    )
+    # Training runs in the job queue's worker processes; poll /train/jobs/{job_id} or stream its events.
+    # A request identical to an active or finished job (same payload and dataset content) returns that job.
+    request = payload.model_dump(mode="json")
+    fingerprint = await run_in_threadpool(request_fingerprint, request)
+    job_id, created = await store.find_or_create_training_job(request, fingerprint=fingerprint)
+    if created:
+        jobs.submit(job_id)
+    job = await store.get_training_job(job_id)
+    if job["status"] not in ACTIVE_JOB_STATUSES:
+        response.status_code = 200
+    return job
+
+
+@app.get("/train/jobs")
+async def list_training_jobs(
+    limit: int = Query(default=20, ge=1, le=200),
+    store: AsyncPredictionStore = Depends(get_store),
+):
+    return await store.list_training_jobs(limit)
 
-    batch_uuid = store.create_batch(
-        positions=[p.value for p in payload.positions],
-        data_dir=str(payload.data_dir),
-        model_dir=str(payload.model_dir),
-        val_season=payload.val_season,
-    )
 
-    for position in payload.positions:
-        df = load_final_dataset(payload.data_dir, position.value)
-        train_xgb_regressor(
-            position.value,
-            df,
-            payload.model_dir,
-            val_season=payload.val_season,
-            params=params,
-        )
+async def _training_job_or_404(store: AsyncPredictionStore, job_id: str) -> dict:
+    job = await store.get_training_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No training job {job_id}")
+    return job
 
-        result = predict_position(position.value, data_dir=payload.data_dir, model_dir=payload.model_dir)
-        run_uuid = store.create_run(
-            batch_uuid=batch_uuid,
-            position=position.value,
-            season=result.season,
-            week=result.week,
-            data_dir=str(payload.data_dir),
-            model_dir=str(payload.model_dir),
-            meta={**result.model_metadata, "train_params": asdict(params)},
-        )
-        store.save_predictions(run_uuid, batch_uuid, result.scored, payload_cols=_default_output_columns(result.scored))
-    
-    return store.get_batch_prediction(batch_uuid)
+
+@app.get("/train/jobs/{job_id}")
+async def get_training_job(job_id: str, store: AsyncPredictionStore = Depends(get_store)):
+    return await _training_job_or_404(store, job_id)
+
+
+@app.get("/train/jobs/{job_id}/events")
+async def stream_training_job(job_id: str, store: AsyncPredictionStore = Depends(get_store)):
+    await _training_job_or_404(store, job_id)
+
+    async def events():
+        last_update = None
+        while True:
+            job = await store.get_training_job(job_id)
+            if job is None:
+                # The job row is gone (its database was reset): close with a terminal event rather than an error.
+                yield f"event: gone\ndata: {json.dumps({'job_id': job_id, 'status': 'gone'})}\n\n"
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield f"data: {json.dumps(job)}\n\n"
+            if job["status"] not in ACTIVE_JOB_STATUSES:
+                return
+            await asyncio.sleep(JOB_EVENTS_POLL_S)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/train/jobs/{job_id}/cancel")
+async def cancel_training_job(
+    job_id: str,
+    store: AsyncPredictionStore = Depends(get_store),
+    jobs: TrainingJobQueue = Depends(get_job_queue),
+):
+    job = await _training_job_or_404(store, job_id)
+    if not await store.run(jobs.cancel, job_id):
+        raise HTTPException(status_code=409, detail=f"Training job {job_id} already {job['status']}")
+    return await store.get_training_job(job_id)
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from model.database import PredictionStore
+
+
+def _save_slice(store: PredictionStore, batch_uuid: str, week: int, preds: dict[str, float]) -> None:
+    rows = pd.DataFrame(
+        {
+            "gsis_id": list(preds),
+            "full_name": [f"Player {g}" for g in preds],
+            "team": "KC",
+            "position": "QB",
+            "season": 2024,
+            "week": week,
+            "pred_next4": list(preds.values()),
+        }
+    )
+    store.save_run(batch_uuid=batch_uuid, position="QB", season=2024, week=week, rows=rows)
+
+
+@pytest.mark.parametrize("archive", [False, True])
+def test_multi_slice_batch_is_diffed_on_its_newest_slice(tmp_path, archive):
+    store = PredictionStore(tmp_path / "predictions.db")
+    store.ensure_schema()
+
+    # A backfill batch holds each player once per week; only week 5 is what it predicts now.
+    backfill = store.create_batch(positions=["QB"], source="backfill")
+    _save_slice(store, backfill, 4, {"a": 10.0, "b": 20.0})
+    _save_slice(store, backfill, 5, {"a": 12.0, "b": 20.0, "c": 30.0})
+    store.complete_batch(backfill)
+    if archive:
+        store.archive_batch(backfill)
+
+    weekly = store.create_batch(positions=["QB"])
+    _save_slice(store, weekly, 6, {"a": 15.0, "b": 20.5})
+    store.complete_batch(weekly)
+
+    rows = store.diff_batches(backfill, weekly)
+    assert [(r["gsis_id"], r["week_a"], r["week_b"], r["pred_next4_change"]) for r in rows] == [
+        ("a", 5, 6, 3.0),
+        ("b", 5, 6, 0.5),
+    ]
+    # Going the other way pairs the same rows, once each.
+    assert [(r["gsis_id"], r["pred_next4_change"]) for r in store.diff_batches(weekly, backfill)] == [
+        ("a", -3.0),
+        ("b", -0.5),
+    ]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+import constants
+from model.feature_matrix import FeatureMatrixCache
+
+
+def _season_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(size=(20, 3)), columns=["f0", "f1", "f2"])
+    for i, col in enumerate(constants.TARGET_HORIZONS.values()):
+        frame[col] = i + rng.normal(size=len(frame))
+    frame["season"] = 2023
+    return frame
+
+
+def test_evaluation_and_training_targets_share_the_season_matrix(tmp_path):
+    # Evaluation asks for the primary target, training for every horizon; neither may evict the other's files.
+    df = _season_frame()
+    features = ["f0", "f1", "f2"]
+    all_targets = list(constants.TARGET_HORIZONS.values())
+    cache = FeatureMatrixCache(tmp_path)
+
+    x_one, y_one, _ = cache.season_matrix("QB", df, features, all_targets[:1], 2023)
+    files = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.npy")}
+    x_all, y_all, _ = cache.season_matrix("QB", df, features, all_targets, 2023)
+    cache.season_matrix("QB", df, features, all_targets[:1], 2023)
+
+    assert len(files) == 2 and len(list(tmp_path.glob("*.npy"))) == 3
+    assert all(p.stat().st_mtime_ns == files[p.name] for p in tmp_path.glob("*.npy") if p.name in files)
+    assert np.array_equal(x_one, x_all)
+    assert y_one.shape == (20, 1) and y_all.shape == (20, len(all_targets))
+
+    # A changed season rebuilds its files and clears the superseded ones.
+    df["f0"] += 1.0
+    cache.season_matrix("QB", df, features, all_targets[:1], 2023)
+    assert len(list(tmp_path.glob("*_x_*.npy"))) == 1
@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import constants
+from model.feature_matrix import FeatureMatrixCache
+from model.gbt_regression import (
+    QUANTILE_MODEL_FILE,
+    IncrementalParams,
+    XGBHyperParams,
+    make_feature_set,
+    train_xgb_regressor,
+    warm_start_xgb_regressor,
+)
+from model.preprocessing import file_sha256
+
+pytest.importorskip("xgboost")
+
+PARAMS = XGBHyperParams(n_estimators=40, learning_rate=0.3, early_stopping_rounds=10)
+
+
+def _dataset(position: str, *, through_week: int) -> pd.DataFrame:
+    # Two full seasons and the current one up to `through_week`. Forward targets only exist once the following
+    # week is played, so the newest week is unlabelled, as in the real finalized data.
+    feature_cols, _ = make_feature_set(position)
+    rng = np.random.default_rng(0)
+    frames = []
+    for season, last_week in ((2022, 17), (2023, 17), (2024, through_week)):
+        for week in range(1, last_week + 1):
+            x = rng.normal(size=(30, len(feature_cols)))
+            frame = pd.DataFrame(x, columns=feature_cols)
+            signal = 10.0 + 3.0 * x[:, 0] - 2.0 * x[:, 1]
+            for i, col in enumerate(constants.TARGET_HORIZONS.values()):
+                frame[col] = signal + i + rng.normal(scale=0.5, size=len(frame))
+            if season == 2024 and week == through_week:
+                frame[list(constants.TARGET_HORIZONS.values())] = np.nan
+            frame["season"] = season
+            frame["week"] = week
+            frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_refresh_appends_trees_for_newly_labelled_weeks(tmp_path):
+    cache = FeatureMatrixCache(tmp_path / "cache")
+    train_xgb_regressor(
+        "QB", _dataset("QB", through_week=10), tmp_path, val_season=2023, params=PARAMS, cache=cache, quantiles=[0.1, 0.9]
+    )
+    metadata_path = tmp_path / "qb" / "metadata.json"
+    parent = json.loads(metadata_path.read_text())
+    assert parent["labelled_through"] == {"season": 2024, "week": 9}
+
+    # Two more weeks land: weeks 10 and 11 are now labelled, week 12 is not.
+    incremental = IncrementalParams(max_new_trees=5, max_val_degradation=1.0)
+    warm_start_xgb_regressor("QB", _dataset("QB", through_week=12), tmp_path, params=PARAMS, incremental=incremental)
+
+    metadata = json.loads(metadata_path.read_text())
+    step = metadata["lineage"][-1]
+    assert step["mode"] == "incremental"
+    assert step["new_rows"] == 60
+    assert step["n_trees"] > step["parent_n_trees"]
+    assert metadata["labelled_through"] == {"season": 2024, "week": 11}
+    # The interval bounds are refreshed on the same rows rather than left at the parent's fit.
+    quantile_path = tmp_path / "qb" / QUANTILE_MODEL_FILE
+    assert metadata["quantile_model_sha256"] != parent["quantile_model_sha256"]
+    assert metadata["quantile_model_sha256"] == file_sha256(quantile_path)
+    assert metadata["quantile_best_iteration"] > parent["quantile_best_iteration"]
+
+    # Nothing new is labelled, so a repeat refresh leaves the model alone.
+    warm_start_xgb_regressor("QB", _dataset("QB", through_week=12), tmp_path, params=PARAMS, incremental=incremental)
+    assert len(json.loads(metadata_path.read_text())["lineage"]) == len(metadata["lineage"])
+
+
+def test_rows_missing_a_horizon_still_train_the_others(tmp_path):
+    # A bye or an injury the following week leaves next1 unlabelled while next2/next4/ros are still known.
+    df = _dataset("QB", through_week=10)
+    next1 = constants.TARGET_HORIZONS["next1"]
+    df.loc[df.index % 5 == 0, next1] = np.nan
+    cache = FeatureMatrixCache(tmp_path / "cache")
+    train_xgb_regressor("QB", df, tmp_path, val_season=2023, params=PARAMS, cache=cache)
+
+    metadata = json.loads((tmp_path / "qb" / "metadata.json").read_text())
+    assert metadata["lineage"][0]["train_rows"] == 17 * 30
+    for metrics in metadata["validation_metrics_by_horizon"].values():
+        assert np.isfinite(metrics["mae"]) and metrics["mae"] < 2.0
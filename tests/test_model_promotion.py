@@ -0,0 +1,49 @@
+import pytest
+
+from model.gbt_regression import position_model_dir
+from model.training_jobs import _promote_models, _prune_model_versions, _rollback_models
+
+
+def _stage(model_dir, batch_uuid: str, positions: list[str]):
+    staging_dir = model_dir / f".staging-{batch_uuid}"
+    for position in positions:
+        (staging_dir / position.lower()).mkdir(parents=True)
+        (staging_dir / position.lower() / "metadata.json").write_text(batch_uuid)
+    return staging_dir
+
+
+def _live(model_dir, position: str) -> str:
+    return (position_model_dir(model_dir, position) / "metadata.json").read_text()
+
+
+def test_promotion_switches_pointers_and_rolls_back_a_partial_batch(tmp_path):
+    # A model trained outside a job, in the plain `{position}/` layout.
+    (tmp_path / "qb").mkdir()
+    (tmp_path / "qb" / "metadata.json").write_text("cli")
+
+    promoted = {}
+    _promote_models(_stage(tmp_path, "b1", ["QB", "RB"]), tmp_path, ["QB", "RB"], "b1", promoted)
+    assert promoted == {"QB": None, "RB": None}
+    assert _live(tmp_path, "QB") == "b1" and _live(tmp_path, "RB") == "b1"
+
+    # RB's staged model is missing, so the batch fails after QB was switched: QB goes back to b1.
+    promoted = {}
+    with pytest.raises(OSError):
+        _promote_models(_stage(tmp_path, "b2", ["QB"]), tmp_path, ["QB", "RB"], "b2", promoted)
+    assert _live(tmp_path, "QB") == "b2"
+    _rollback_models(tmp_path, "b2", promoted)
+    assert _live(tmp_path, "QB") == "b1" and _live(tmp_path, "RB") == "b1"
+    assert not (tmp_path / ".versions" / "qb-b2").exists()
+
+    # Rolling back the first promotion falls back to the `{position}/` directory.
+    _rollback_models(tmp_path, "b1", {"QB": None})
+    assert _live(tmp_path, "QB") == "cli"
+
+
+def test_pruning_keeps_the_live_and_the_replaced_version(tmp_path):
+    for batch_uuid in ("b1", "b2", "b3"):
+        promoted = {}
+        _promote_models(_stage(tmp_path, batch_uuid, ["QB"]), tmp_path, ["QB"], batch_uuid, promoted)
+        _prune_model_versions(tmp_path, promoted)
+    assert sorted(p.name for p in (tmp_path / ".versions").iterdir()) == ["qb-b2", "qb-b3"]
+    assert _live(tmp_path, "QB") == "b3"
@@ -0,0 +1,50 @@
+import pandas as pd
+
+import model.database as database
+from model.database import PredictionStore
+
+
+def _save_players(store: PredictionStore, names: dict[str, str]) -> None:
+    batch_uuid = store.create_batch(positions=["QB"])
+    rows = pd.DataFrame(
+        {
+            "gsis_id": list(names),
+            "full_name": list(names.values()),
+            "team": "KC",
+            "position": "QB",
+            "season": 2024,
+            "week": 5,
+            "pred_next4": 10.0,
+        }
+    )
+    store.save_run(batch_uuid=batch_uuid, position="QB", season=2024, week=5, rows=rows)
+    store.complete_batch(batch_uuid)
+
+
+def _search(store: PredictionStore, q: str) -> list[str]:
+    return [r["gsis_id"] for r in store.search_players(q)]
+
+
+def test_search_falls_back_to_like_without_trigram_support(tmp_path, monkeypatch):
+    db_path = tmp_path / "predictions.db"
+    store = PredictionStore(db_path)
+    store.ensure_schema()
+    _save_players(store, {"a": "Patrick Mahomes", "b": "Josh Allen", "c": "Allen Robinson"})
+    assert _search(store, "allen") == ["c", "b"]
+    store.close()
+
+    # The same database opened by a SQLite built without the trigram tokenizer (before 3.34).
+    monkeypatch.setattr(database, "_has_trigram_search", lambda: False)
+    store = PredictionStore(db_path)
+    store.ensure_schema()
+    _save_players(store, {"d": "Kyler Murray"})
+    assert _search(store, "allen") == ["c", "b"]
+    assert _search(store, "MURR") == ["d"]
+    assert _search(store, "al") == ["c"]
+    store.close()
+
+    # Back on a trigram build, the index is rebuilt to take in the players written meanwhile.
+    monkeypatch.undo()
+    store = PredictionStore(db_path)
+    store.ensure_schema()
+    assert _search(store, "murr") == ["d"]
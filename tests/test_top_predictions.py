@@ -0,0 +1,41 @@
+import pandas as pd
+
+from model.database import PredictionStore
+
+
+def _save_run(store: PredictionStore, week: int, base: float) -> None:
+    batch_uuid = store.create_batch(positions=["QB"])
+    rows = pd.DataFrame(
+        {
+            "gsis_id": [f"p{i}" for i in range(5)],
+            "full_name": [f"Player {i}" for i in range(5)],
+            "team": "KC",
+            "position": "QB",
+            "season": 2024,
+            "week": week,
+            "pred_next4": [base + i for i in range(5)],
+        }
+    )
+    store.save_run(batch_uuid=batch_uuid, position="QB", season=2024, week=week, rows=rows)
+    store.complete_batch(batch_uuid)
+
+
+def test_filtered_top_predictions_skip_runs_of_other_slices(tmp_path):
+    store = PredictionStore(tmp_path / "predictions.db")
+    store.ensure_schema()
+    _save_run(store, 4, 100.0)
+    _save_run(store, 4, 200.0)
+    # Many newer runs for the following week sit between the latest run and the week-4 runs.
+    for i in range(40):
+        _save_run(store, 5, float(i))
+
+    statements: list[str] = []
+    store._connection().set_trace_callback(statements.append)
+    rows = store.get_top_predictions(position="QB", season=2024, week=4, limit=8)
+    store._connection().set_trace_callback(None)
+
+    assert [r["pred_next4"] for r in rows] == [204.0, 203.0, 202.0, 201.0, 200.0, 104.0, 103.0, 102.0]
+    # One read per week-4 run and one run lookup per step, however many week-5 runs were stored.
+    assert sum("FROM predictions p" in s for s in statements) == 2
+    assert sum("FROM prediction_runs" in s for s in statements) == 2
+    assert [r["pred_next4"] for r in store.get_top_predictions(position="QB", limit=3)] == [43.0, 42.0, 41.0]
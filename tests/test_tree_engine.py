@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import constants
+from model.feature_matrix import to_float32_matrix
+from model.gbt_regression import (
+    DEFAULT_QUANTILES,
+    QUANTILE_MODEL_FILE,
+    IncrementalParams,
+    XGBHyperParams,
+    load_scoring_pipeline,
+    load_trained_xgb,
+    make_feature_set,
+    predict_best,
+    train_xgb_regressor,
+    warm_start_xgb_regressor,
+)
+from model.tree_engine import load_tree_tables, predict_tree_tables
+
+xgb = pytest.importorskip("xgboost")
+
+PARAMS = XGBHyperParams(n_estimators=40, learning_rate=0.3, early_stopping_rounds=10)
+TOLERANCE = 1e-5
+
+
+def _dataset(position: str, *, through_week: int) -> pd.DataFrame:
+    # Two full seasons and the current one up to `through_week`, with ~10% of the features missing so both the
+    # dense path and the default-direction path of the tree walk are exercised.
+    feature_cols, _ = make_feature_set(position)
+    rng = np.random.default_rng(1)
+    frames = []
+    for season, last_week in ((2022, 17), (2023, 17), (2024, through_week)):
+        for week in range(1, last_week + 1):
+            x = rng.normal(size=(30, len(feature_cols)))
+            frame = pd.DataFrame(x, columns=feature_cols)
+            signal = 10.0 + 3.0 * x[:, 0] - 2.0 * x[:, 1]
+            for i, col in enumerate(constants.TARGET_HORIZONS.values()):
+                frame[col] = signal + i + rng.normal(scale=0.5, size=len(frame))
+            frame = frame.mask(pd.DataFrame(rng.random(frame.shape) < 0.1, columns=frame.columns))
+            if season == 2024 and week == through_week:
+                frame[list(constants.TARGET_HORIZONS.values())] = np.nan
+            frame["season"] = season
+            frame["week"] = week
+            frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _booster_outputs(model_dir, position: str, x: np.ndarray) -> np.ndarray:
+    boosters = []
+    for name in ("xgb_model.json", QUANTILE_MODEL_FILE):
+        booster = xgb.Booster()
+        booster.load_model(model_dir / position.lower() / name)
+        boosters.append(predict_best(booster, x).reshape(len(x), -1))
+    return np.hstack(boosters)
+
+
+def _assert_parity(model_dir, position: str, df: pd.DataFrame) -> None:
+    numpy_pipeline = load_scoring_pipeline(model_dir, position, engine="numpy")
+    xgb_pipeline = load_scoring_pipeline(model_dir, position, engine="xgboost")
+    x_raw = to_float32_matrix(df, numpy_pipeline.preprocessor.feature_cols)
+    assert np.isnan(x_raw).any()
+
+    # The exported tables on raw features (NaNs follow each split's default direction) against the boosters.
+    tables = load_tree_tables(model_dir / position.lower() / "tree_tables.npz")
+    np.testing.assert_allclose(
+        predict_tree_tables(tables, x_raw), _booster_outputs(model_dir, position, x_raw), rtol=0, atol=TOLERANCE
+    )
+
+    # The NumPy pipeline against model.predict and against the booster pipeline, quantiles included.
+    model, _ = load_trained_xgb(model_dir, position)
+    x_imputed = numpy_pipeline.preprocessor.transform(df)
+    reference = model.predict(pd.DataFrame(x_imputed, columns=numpy_pipeline.preprocessor.feature_cols))
+    np.testing.assert_allclose(numpy_pipeline.predict_matrix(x_imputed.copy()), reference, rtol=0, atol=TOLERANCE)
+    numpy_outputs, xgb_outputs = numpy_pipeline.predict_outputs(df), xgb_pipeline.predict_outputs(df)
+    assert list(numpy_outputs) == list(xgb_outputs) and len(numpy_outputs) == 4 + len(DEFAULT_QUANTILES)
+    for name, values in numpy_outputs.items():
+        np.testing.assert_allclose(values, xgb_outputs[name], rtol=0, atol=TOLERANCE, err_msg=name)
+
+
+def test_numpy_engine_matches_the_boosters_after_training_and_warm_start(tmp_path):
+    train_xgb_regressor(
+        "QB", _dataset("QB", through_week=10), tmp_path, val_season=2023, params=PARAMS, quantiles=DEFAULT_QUANTILES
+    )
+    _assert_parity(tmp_path, "QB", _dataset("QB", through_week=10))
+
+    # A warm start appends trees to both boosters and re-exports the merged tables.
+    df = _dataset("QB", through_week=12)
+    incremental = IncrementalParams(max_new_trees=5, max_val_degradation=1.0)
+    warm_start_xgb_regressor("QB", df, tmp_path, params=PARAMS, incremental=incremental)
+    assert json.loads((tmp_path / "qb" / "metadata.json").read_text())["lineage"][-1]["mode"] == "incremental"
+    _assert_parity(tmp_path, "QB", df)
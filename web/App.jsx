@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { ChevronDown, ChevronUp } from "lucide-react";
 import "./css/App.css";
 import NumberFilter from "./NumberFilter.jsx";
@@ -6,12 +6,14 @@ import DropdownFilter from "./DropdownFilter.jsx";
 import HistoryListItem from "./HistoryListItem.jsx";
 import {
   trainModel,
+  waitForTrainJob,
+  cancelTrainJob,
   listBatches,
   getBatchPredictions,
   listValidValSeasons,
 } from "./api/prediction.js";
-import { MODEL_FILTERS, TRAINABLE_POSITIONS } from "./constants.js";
-import { formatOneDecimal, getRowKey } from "./util.js";
+import { MODEL_FILTERS, PREDICTIONS_PAGE_SIZE, TRAINABLE_POSITIONS } from "./constants.js";
+import { describeTrainJob, formatOneDecimal, getRowKey } from "./util.js";
 
 const SIDEBAR_SECTIONS_STORAGE_KEY = "ff.sidebar.sections.v1";
 const DEFAULT_SIDEBAR_SECTIONS = {
@@ -19,6 +21,18 @@ const DEFAULT_SIDEBAR_SECTIONS = {
   training: true,
   history: true,
 };
+const DEFAULT_MIN_PRED = "0";
+const DEFAULT_MIN_DELTA = "-30";
+
+// A threshold left at its default (or blank) is not sent: the server's range filters drop rows whose value is
+// NULL, so a default bound would hide predictions without a delta or a forecast.
+const rangeFilterValue = (value, defaultValue) => {
+  if (value === defaultValue) {
+    return undefined;
+  }
+  const parsed = Number.parseFloat(value);
+  return Number.isNaN(parsed) ? undefined : parsed;
+};
 
 export default function App() {
   const [params, setParams] = useState({
@@ -32,12 +46,17 @@ export default function App() {
   });
   const [isTraining, setIsTraining] = useState(false);
   const [trainError, setTrainError] = useState("");
+  const [trainJob, setTrainJob] = useState(null);
   const [listBatchPredictions, setListBatchPredictions] = useState([]);
   const [viewMode, setViewMode] = useState("list");
   const [positionFilter, setPositionFilter] = useState("All");
-  const [minPred, setMinPred] = useState("0");
-  const [minDelta, setMinDelta] = useState("-30");
+  const [minPred, setMinPred] = useState(DEFAULT_MIN_PRED);
+  const [minDelta, setMinDelta] = useState(DEFAULT_MIN_DELTA);
   const [modelOutputs, setModelOutputs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingPage, setIsLoadingPage] = useState(false);
+  const [pageError, setPageError] = useState("");
+  const pageRequestId = useRef(0);
   const [selectedBatchId, setSelectedBatchId] = useState(null);
   const [sortConfig, setSortConfig] = useState({ key: null, direction: null });
   const [selectedTrainPositions, setSelectedTrainPositions] = useState(TRAINABLE_POSITIONS);
@@ -109,15 +128,9 @@ export default function App() {
     window.localStorage.setItem(SIDEBAR_SECTIONS_STORAGE_KEY, JSON.stringify(sidebarSections));
   }, [sidebarSections]);
 
-  const handleHistoryListItemClick = async (batch_uuid) => {
-    try {
-      setSelectedBatchId(batch_uuid);
-      const playerData = await getBatchPredictions(batch_uuid);
-      setModelOutputs(playerData)
-    } catch (e) {
-      throw new Error(`Error when clicking history list item: ${e.message}`);
-    }
-  }
+  const handleHistoryListItemClick = (batch_uuid) => {
+    setSelectedBatchId(batch_uuid);
+  };
 
   const handleParamChange = (name, rawValue) => {
     setParams((prev) => ({ ...prev, [name]: rawValue }));
@@ -156,62 +169,134 @@ export default function App() {
       reg_alpha: Number(params.reg_alpha),
     };
     try {
-      await trainModel(payload);
-      const batches = await listBatches(15);
-      setListBatchPredictions(batches);
+      const job = await trainModel(payload);
+      setTrainJob(job);
+      const finished = await waitForTrainJob(job.job_id, setTrainJob);
+      if (finished.status === "succeeded") {
+        const batches = await listBatches(15);
+        setListBatchPredictions(batches);
+        setSelectedBatchId(finished.batch_uuid);
+      } else if (finished.status === "failed") {
+        setTrainError(finished.error ?? "Training failed");
+      }
     } catch (e) {
       setTrainError(e.message);
     } finally {
       setIsTraining(false);
+      setTrainJob(null);
     }
   };
 
-  const parsedMinPred = Number.parseFloat(minPred);
-  const parsedMinDelta = Number.parseFloat(minDelta);
-  const minPredValue = Number.isNaN(parsedMinPred) ? 0 : parsedMinPred;
-  const minDeltaValue = Number.isNaN(parsedMinDelta) ? 0 : parsedMinDelta;
-  const filteredResults = modelOutputs.filter((row) => {
-    if (positionFilter !== "All" && row.position !== positionFilter) {
-      return false;
+  const handleCancelTraining = async () => {
+    if (!trainJob) {
+      return;
     }
-    if (row.pred_next4 < minPredValue) {
-      return false;
+    try {
+      setTrainJob(await cancelTrainJob(trainJob.job_id));
+    } catch (e) {
+      setTrainError(e.message);
     }
-    if (row.delta < minDeltaValue) {
-      return false;
+  };
+
+  const pageQuery = {
+    positions: positionFilter !== "All" ? [positionFilter] : undefined,
+    minPred: rangeFilterValue(minPred, DEFAULT_MIN_PRED),
+    minDelta: rangeFilterValue(minDelta, DEFAULT_MIN_DELTA),
+    sort: sortConfig.key ?? undefined,
+    direction: sortConfig.key ? sortConfig.direction : undefined,
+    limit: PREDICTIONS_PAGE_SIZE,
+  };
+  const pageQueryKey = JSON.stringify(pageQuery);
+
+  // Filtering, sorting and paging run server-side; only the first page is fetched when they change.
+  useEffect(() => {
+    if (!selectedBatchId) {
+      return undefined;
     }
-    return true;
-  });
-  const sortedResults = sortConfig.key
-    ? [...filteredResults].sort((a, b) => {
-        const aValue = Number(a[sortConfig.key] ?? 0);
-        const bValue = Number(b[sortConfig.key] ?? 0);
-        if (aValue === bValue) return 0;
-        const dir = sortConfig.direction === "asc" ? 1 : -1;
-        return aValue > bValue ? dir : -dir;
-      })
-    : filteredResults;
-
-  const hasOutputs = modelOutputs.length > 0;
-  const hasFilteredResults = filteredResults.length > 0;
+    const requestId = ++pageRequestId.current;
+    const timer = window.setTimeout(async () => {
+      setIsLoadingPage(true);
+      setPageError("");
+      try {
+        const page = await getBatchPredictions(selectedBatchId, JSON.parse(pageQueryKey));
+        if (requestId === pageRequestId.current) {
+          setModelOutputs(page.rows);
+          setNextCursor(page.nextCursor);
+        }
+      } catch (e) {
+        if (requestId === pageRequestId.current) {
+          setModelOutputs([]);
+          setNextCursor(null);
+          setPageError(e.message);
+        }
+      } finally {
+        if (requestId === pageRequestId.current) {
+          setIsLoadingPage(false);
+        }
+      }
+    }, 250);
+    return () => window.clearTimeout(timer);
+  }, [selectedBatchId, pageQueryKey]);
+
+  const handleLoadMore = async () => {
+    if (!nextCursor || isLoadingPage) {
+      return;
+    }
+    const requestId = pageRequestId.current;
+    setIsLoadingPage(true);
+    setPageError("");
+    try {
+      const page = await getBatchPredictions(selectedBatchId, { ...pageQuery, cursor: nextCursor });
+      if (requestId === pageRequestId.current) {
+        setModelOutputs((prev) => [...prev, ...page.rows]);
+        setNextCursor(page.nextCursor);
+      }
+    } catch (e) {
+      if (requestId === pageRequestId.current) {
+        setPageError(e.message);
+      }
+    } finally {
+      if (requestId === pageRequestId.current) {
+        setIsLoadingPage(false);
+      }
+    }
+  };
+
+  const hasOutputs = selectedBatchId !== null;
+  const hasFilteredResults = modelOutputs.length > 0;
   const isInitialEmptyState = !hasOutputs;
   const valSeasonOptions =
     availableValSeasons.length > 0
       ? availableValSeasons.map((season) => ({ value: season, label: season }))
       : [{ value: "", label: "No seasons available" }];
 
-  const handleLoadLatestBatch = async () => {
+  const handleLoadLatestBatch = () => {
     if (listBatchPredictions.length === 0) {
       return;
     }
     const latestBatch = listBatchPredictions[0];
-    await handleHistoryListItemClick(latestBatch.batch_uuid);
+    handleHistoryListItemClick(latestBatch.batch_uuid);
   };
 
+  const pageErrorNotice = pageError ? <div className="history-time">{pageError}</div> : null;
+
+  const loadMoreButton = nextCursor ? (
+    <div className="empty-actions load-more">
+      <button
+        className="empty-button secondary"
+        type="button"
+        onClick={handleLoadMore}
+        disabled={isLoadingPage}
+      >
+        {isLoadingPage ? "Loading..." : "Load more"}
+      </button>
+    </div>
+  ) : null;
+
   const handleResetFilters = () => {
     setPositionFilter("All");
-    setMinPred("0");
-    setMinDelta("0");
+    setMinPred(DEFAULT_MIN_PRED);
+    setMinDelta(DEFAULT_MIN_DELTA);
   };
   const handleSortSelection = (_, value) => {
     if (value === "none") {
@@ -403,9 +488,19 @@ export default function App() {
               <span className="orbit-dot" />
             </div>
             <div className="loading-title">Training your model</div>
-            <div className="loading-subtitle">
-              Optimizing features and scoring outputs.
-            </div>
+            <div className="loading-subtitle">{describeTrainJob(trainJob)}</div>
+            {trainJob ? (
+              <div className="empty-actions">
+                <button
+                  className="empty-button secondary"
+                  type="button"
+                  onClick={handleCancelTraining}
+                  disabled={trainJob.cancel_requested}
+                >
+                  {trainJob.cancel_requested ? "Cancelling..." : "Cancel"}
+                </button>
+              </div>
+            ) : null}
           </div>
         ) : (
           <>
@@ -427,6 +522,9 @@ export default function App() {
                 options={[
                   { value: "none", label: "None" },
                   { value: "pred_next4", label: "Prediction" },
+                  { value: "pred_next1", label: "Next week" },
+                  { value: "pred_next2", label: "Next 2 weeks" },
+                  { value: "pred_ros", label: "Rest of season" },
                   { value: "delta", label: "Delta" },
                   { value: "fantasy_prev_5wk_avg", label: "Previous" }
                 ]}
@@ -494,18 +592,22 @@ export default function App() {
                 ) : null}
                 <div className="results-table-output-container scroll-container">
                   {hasFilteredResults ? (
-                    sortedResults.map((row, index) => (
-                      <div key={getRowKey(row, index)} className="results-row">
-                        <div className="player-cell">{row.full_name}</div>
-                        <div>{row.team}</div>
-                        <div>{row.position}</div>
-                        <div>{formatOneDecimal(row.pred_next4)}</div>
-                        <div className={row.delta >= 0 ? "delta up" : "delta down"}>
-                          {formatOneDecimal(row.delta)}
+                    <>
+                      {modelOutputs.map((row, index) => (
+                        <div key={getRowKey(row, index)} className="results-row">
+                          <div className="player-cell">{row.full_name}</div>
+                          <div>{row.team}</div>
+                          <div>{row.position}</div>
+                          <div>{formatOneDecimal(row.pred_next4)}</div>
+                          <div className={row.delta >= 0 ? "delta up" : "delta down"}>
+                            {formatOneDecimal(row.delta)}
+                          </div>
+                          <div>{formatOneDecimal(row.fantasy_prev_5wk_avg)}</div>
                         </div>
-                        <div>{formatOneDecimal(row.fantasy_prev_5wk_avg)}</div>
-                      </div>
-                    ))
+                      ))}
+                      {pageErrorNotice}
+                      {loadMoreButton}
+                    </>
                   ) : (
                     <div className="results-empty-state">
                       {isInitialEmptyState ? (
@@ -533,6 +635,11 @@ export default function App() {
                             </button>
                           </div>
                         </>
+                      ) : pageError ? (
+                        <>
+                          <div className="empty-title">Could not load predictions</div>
+                          <div className="empty-body">{pageError}</div>
+                        </>
                       ) : (
                         <>
                           <div className="empty-title">
@@ -559,42 +666,46 @@ export default function App() {
             ) : (
               <div className="results-table-output-container scroll-container">
                 {hasFilteredResults ? (
-                  <div className="results-grid">
-                    {sortedResults.map((row, index) => (
-                      <div key={getRowKey(row, index)} className="result-card">
-                        <div className="card-header">
-                          <div className="card-name">{row.full_name}</div>
-                          <div className="card-meta">
-                            {row.team} - {row.position}
-                          </div>
-                        </div>
-                        <div className="card-stats">
-                          <div>
-                            <div className="stat-label">pred</div>
-                            <div className="stat-value">
-                              {formatOneDecimal(row.pred_next4)}
+                  <>
+                    <div className="results-grid">
+                      {modelOutputs.map((row, index) => (
+                        <div key={getRowKey(row, index)} className="result-card">
+                          <div className="card-header">
+                            <div className="card-name">{row.full_name}</div>
+                            <div className="card-meta">
+                              {row.team} - {row.position}
                             </div>
                           </div>
-                          <div>
-                            <div className="stat-label">delta</div>
-                            <div
-                              className={`stat-value ${
-                                row.delta >= 0 ? "up" : "down"
-                              }`}
-                            >
-                              {formatOneDecimal(row.delta)}
+                          <div className="card-stats">
+                            <div>
+                              <div className="stat-label">pred</div>
+                              <div className="stat-value">
+                                {formatOneDecimal(row.pred_next4)}
+                              </div>
                             </div>
-                          </div>
-                          <div>
-                            <div className="stat-label">prev</div>
-                            <div className="stat-value">
-                              {formatOneDecimal(row.fantasy_prev_5wk_avg)}
+                            <div>
+                              <div className="stat-label">delta</div>
+                              <div
+                                className={`stat-value ${
+                                  row.delta >= 0 ? "up" : "down"
+                                }`}
+                              >
+                                {formatOneDecimal(row.delta)}
+                              </div>
+                            </div>
+                            <div>
+                              <div className="stat-label">prev</div>
+                              <div className="stat-value">
+                                {formatOneDecimal(row.fantasy_prev_5wk_avg)}
+                              </div>
                             </div>
                           </div>
                         </div>
-                      </div>
-                    ))}
-                  </div>
+                      ))}
+                    </div>
+                    {pageErrorNotice}
+                    {loadMoreButton}
+                  </>
                 ) : (
                   <div className="results-empty-state">
                     {isInitialEmptyState ? (
@@ -622,6 +733,11 @@ export default function App() {
                           </button>
                         </div>
                       </>
+                    ) : pageError ? (
+                      <>
+                        <div className="empty-title">Could not load predictions</div>
+                        <div className="empty-body">{pageError}</div>
+                      </>
                     ) : (
                       <>
                         <div className="empty-title">
@@ -1,9 +1,63 @@
-export async function fetchApi(routeUrl, options = {}) {
-    const res = await fetch(routeUrl, options);
-    const body = await res.json();
+import { RESPONSE_CACHE_MAX_ENTRIES } from "../constants.js";
+
+// Responses that came with an ETag, keyed by URL and Accept header (the server varies result pages on Accept, and
+// the browser already handles Accept-Encoding). Immutable ones (finished batches and runs) are served straight
+// from here; the rest are revalidated with If-None-Match, and a 304 reuses the cached body.
+const responseCache = new Map();
+
+function cacheKey(routeUrl, headers) {
+    return `${headers.get("Accept") ?? ""} ${routeUrl}`;
+}
+
+function rememberResponse(key, entry) {
+    responseCache.delete(key);
+    responseCache.set(key, entry);
+    if (responseCache.size > RESPONSE_CACHE_MAX_ENTRIES) {
+        responseCache.delete(responseCache.keys().next().value);
+    }
+}
+
+async function fetchCached(routeUrl, options) {
+    const cacheable = (options.method ?? "GET").toUpperCase() === "GET";
+    const headers = new Headers(options.headers);
+    const key = cacheKey(routeUrl, headers);
+    const cached = cacheable ? responseCache.get(key) : undefined;
+    if (cached?.immutable) {
+        rememberResponse(key, cached);
+        return cached;
+    }
 
+    if (cached) {
+        headers.set("If-None-Match", cached.etag);
+    }
+    const res = await fetch(routeUrl, { ...options, headers });
+    if (res.status === 304 && cached) {
+        rememberResponse(key, cached);
+        return cached;
+    }
+
+    const body = await res.json();
     if (!res.ok) {
         throw new Error(`HTTP ${res.status} : ${body.detail}`);
     }
+    const entry = {
+        body,
+        nextCursor: res.headers.get("X-Next-Cursor"),
+        etag: res.headers.get("ETag"),
+        immutable: (res.headers.get("Cache-Control") ?? "").includes("immutable"),
+    };
+    if (cacheable && entry.etag) {
+        rememberResponse(key, entry);
+    }
+    return entry;
+}
+
+export async function fetchApi(routeUrl, options = {}) {
+    const { body } = await fetchCached(routeUrl, options);
     return body;
 }
+
+export async function fetchApiPage(routeUrl, options = {}) {
+    const { body, nextCursor } = await fetchCached(routeUrl, options);
+    return { rows: body, nextCursor };
+}
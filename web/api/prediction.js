@@ -1,4 +1,4 @@
-import { fetchApi } from './fetchApi.js'
+import { fetchApi, fetchApiPage } from './fetchApi.js'
 const apiBase = import.meta.env.VITE_API_BASE ?? "http://localhost:8000";
 
 // GET /predictions/top?position=_&season=_&week=_&limit=_
@@ -18,9 +18,59 @@ export const listRuns = (limit = 15) => {
   return fetchApi(`${apiBase}/predictions/runs/list?limit=${limit}`);
 };
 
-// GET /predictions/runs/{run_uuid}
-export const getRunPredictions = (run_uuid) => {
-  return fetchApi(`${apiBase}/predictions/runs/${run_uuid}`);
+// Prediction pages are requested as one array per column (smaller and faster to encode than one object per
+// row) and turned back into row objects here.
+const COLUMNS_MEDIA_TYPE = "application/vnd.ffgm.columns+json";
+
+const columnsToRows = (columns) => {
+  const names = Object.keys(columns);
+  const length = names.length > 0 ? columns[names[0]].length : 0;
+  const rows = new Array(length);
+  for (let i = 0; i < length; i += 1) {
+    const row = {};
+    for (const name of names) {
+      row[name] = columns[name][i];
+    }
+    rows[i] = row;
+  }
+  return rows;
+};
+
+const fetchPredictionPage = async (routeUrl) => {
+  const page = await fetchApiPage(routeUrl, { headers: { Accept: COLUMNS_MEDIA_TYPE } });
+  return { rows: columnsToRows(page.rows), nextCursor: page.nextCursor };
+};
+
+const predictionPageParams = ({ positions, minPred, maxPred, minDelta, maxDelta, sort, direction, limit, cursor } = {}) => {
+  const params = new URLSearchParams();
+  if (Array.isArray(positions) && positions.length > 0) params.set("positions", positions.join(","));
+  if (minPred != null) params.set("min_pred", String(minPred));
+  if (maxPred != null) params.set("max_pred", String(maxPred));
+  if (minDelta != null) params.set("min_delta", String(minDelta));
+  if (maxDelta != null) params.set("max_delta", String(maxDelta));
+  if (sort) params.set("sort", sort);
+  if (direction) params.set("direction", direction);
+  if (limit != null) params.set("limit", String(limit));
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString();
+  return query ? `?${query}` : "";
+};
+
+// GET /predictions/runs/{run_uuid}?positions=_&min_pred=_&sort=_&direction=_&limit=_&cursor=_
+// Resolves to { rows, nextCursor }; pass nextCursor back to fetch the following page.
+export const getRunPredictions = (run_uuid, query) => {
+  return fetchPredictionPage(`${apiBase}/predictions/runs/${run_uuid}${predictionPageParams(query)}`);
+};
+
+// GET /models/leaderboard?position=_&metric=_&limit=_&best_per_position=_
+// Trained runs ranked by a validation metric (mae, rmse, r2 or spearman), best first.
+export const modelLeaderboard = ({ position, metric, limit, bestPerPosition } = {}) => {
+  const params = new URLSearchParams();
+  if (position) params.set("position", position);
+  if (metric) params.set("metric", metric);
+  if (limit != null) params.set("limit", String(limit));
+  if (bestPerPosition != null) params.set("best_per_position", String(bestPerPosition));
+  return fetchApi(`${apiBase}/models/leaderboard?${params.toString()}`);
 };
 
 // GET /predictions/batch/past
@@ -28,14 +78,52 @@ export const listBatches = (limit) => {
   return fetchApi(`${apiBase}/predictions/batch/past?limit=${limit}`);
 }
 
-// GET /predictions/batch/{batch_uuid}
-export const getBatchPredictions = (batch_uuid) => {
-  return fetchApi(`${apiBase}/predictions/batch/${batch_uuid}`);
+// GET /predictions/batch/{batch_uuid}?positions=_&min_pred=_&sort=_&direction=_&limit=_&cursor=_
+// Resolves to { rows, nextCursor }; pass nextCursor back to fetch the following page.
+export const getBatchPredictions = (batch_uuid, query) => {
+  return fetchPredictionPage(`${apiBase}/predictions/batch/${batch_uuid}${predictionPageParams(query)}`);
+};
+
+// GET /predictions/batch/diff?a=_&b=_&metric=_&threshold=_&positions=_&limit=_
+// Players whose pred_next4 (or delta) moved by more than threshold from batch a to batch b, largest move first.
+export const diffBatches = async (a, b, { metric, threshold, positions, limit } = {}) => {
+  const params = new URLSearchParams({ a, b });
+  if (metric) params.set("metric", metric);
+  if (threshold != null) params.set("threshold", String(threshold));
+  if (Array.isArray(positions) && positions.length > 0) params.set("positions", positions.join(","));
+  if (limit != null) params.set("limit", String(limit));
+  const { rows } = await fetchPredictionPage(`${apiBase}/predictions/batch/diff?${params.toString()}`);
+  return rows;
 };
 
 // GET /predictions/latest/{position}
-export const latestPredictions = (position) => {
-  return fetchApi(`${apiBase}/predictions/latest/${position}`);
+export const latestPredictions = async (position) => {
+  const { rows } = await fetchPredictionPage(`${apiBase}/predictions/latest/${position}`);
+  return rows;
+};
+
+// GET /players/search?q=_&positions=_&limit=_
+// Players whose name contains q, each with their latest prediction (null fields if none is stored).
+export const searchPlayers = async (q, { positions, limit } = {}) => {
+  const params = new URLSearchParams({ q });
+  if (Array.isArray(positions) && positions.length > 0) params.set("positions", positions.join(","));
+  if (limit != null) params.set("limit", String(limit));
+  const { rows } = await fetchPredictionPage(`${apiBase}/players/search?${params.toString()}`);
+  return rows;
+};
+
+// GET /players/{gsis_id}/history?season=_&include_backfill=_&max_points=_
+// One player's predictions across runs, oldest first; maxPoints thins long histories for charts.
+export const playerHistory = async (gsis_id, { season, includeBackfill, maxPoints } = {}) => {
+  const params = new URLSearchParams();
+  if (season != null) params.set("season", String(season));
+  if (includeBackfill != null) params.set("include_backfill", String(includeBackfill));
+  if (maxPoints != null) params.set("max_points", String(maxPoints));
+  const query = params.toString();
+  const { rows } = await fetchPredictionPage(
+    `${apiBase}/players/${encodeURIComponent(gsis_id)}/history${query ? `?${query}` : ""}`
+  );
+  return rows;
 };
 
 // GET /train/options/seasons?positions=QB,RB
@@ -49,7 +137,7 @@ export const listValidValSeasons = (positions) => {
   return fetchApi(`${apiBase}/train/options/seasons${suffix}`);
 };
 
-// POST /train
+// POST /train -> training job ({ job_id, status, progress, ... }); training runs in the background.
 export const trainModel = (payload) => {
   return fetchApi(`${apiBase}/train`, {
     method: "POST",
@@ -57,3 +145,27 @@ export const trainModel = (payload) => {
     body: JSON.stringify(payload),
   });
 };
+
+// GET /train/jobs/{job_id}
+export const getTrainJob = (job_id) => {
+  return fetchApi(`${apiBase}/train/jobs/${job_id}`);
+};
+
+// POST /train/jobs/{job_id}/cancel
+export const cancelTrainJob = (job_id) => {
+  return fetchApi(`${apiBase}/train/jobs/${job_id}/cancel`, { method: "POST" });
+};
+
+const ACTIVE_JOB_STATUSES = ["queued", "running"];
+
+// Polls a training job until it leaves queued/running, reporting every update; resolves to the final job.
+export const waitForTrainJob = async (job_id, onUpdate, intervalMs = 1000) => {
+  for (;;) {
+    const job = await getTrainJob(job_id);
+    onUpdate?.(job);
+    if (!ACTIVE_JOB_STATUSES.includes(job.status)) {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
@@ -9,3 +9,8 @@ export const MODEL_FILTERS = [
 ];
 
 export const TRAINABLE_POSITIONS = ["QB", "RB", "WR", "TE"];
+
+export const PREDICTIONS_PAGE_SIZE = 200;
+
+// Finished batch and run pages cached in the browser by fetchApi.js.
+export const RESPONSE_CACHE_MAX_ENTRIES = 100;
@@ -9,3 +9,33 @@ export function getRowKey(row, index) {
   }
   return `${row.full_name ?? "player"}-${row.team ?? "team"}-${index}`;
 }
+
+function describePositionProgress(position, progress) {
+  if (progress.stage === "done") {
+    return `${position} done`;
+  }
+  if (progress.stage === "scoring") {
+    return `${position} scoring`;
+  }
+  if (progress.iteration == null) {
+    return `${position} loading features`;
+  }
+  const value = Number(progress.value);
+  const metric = Number.isFinite(value) ? ` (${progress.metric} ${value.toFixed(3)})` : "";
+  return `${position} iteration ${progress.iteration}${metric}`;
+}
+
+export function describeTrainJob(job) {
+  const progress = job?.progress;
+  if (job?.status === "queued") {
+    return "Waiting for a free training worker.";
+  }
+  // Positions train concurrently, so progress is reported per position.
+  const positions = Object.entries(progress?.positions ?? {});
+  if (positions.length === 0) {
+    return "Optimizing features and scoring outputs.";
+  }
+  const done = positions.filter(([, p]) => p.stage === "done").length;
+  const steps = positions.map(([position, p]) => describePositionProgress(position, p));
+  return `${done}/${progress.positions_total} positions done: ${steps.join(", ")}`;
+}